@@ -0,0 +1,171 @@
+"""
+Offline client benchmarks against the local stand-in server in `mock_server.py`.
+
+Reports throughput, latency percentiles and peak traced allocation per call for
+- extract_article (parsing only, no network)
+- _paginate_raw over the notes pages
+- user_from_url with every public article page
+- list_conversations
+- new_article
+
+    python benchmarks/bench_client.py --iterations 20 --latency-ms 5 --pages 20
+    python benchmarks/bench_client.py --only paginate --json results.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockJustpaste, Fixtures
+from justpaste import RetryPolicy
+from justpaste.consts import ROOT, APIEndpoints
+from justpaste.utils import extract_article, extract_article_previews
+
+def measure(name:str, fn:Callable[[], int], iterations:int, warmup:int=1) -> dict:
+    """
+    `fn` runs the operation once and returns the no. of items it produced.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    items = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        items += fn()
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(samples)
+    percentiles = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+    return {
+        "name" : name,
+        "iterations" : iterations,
+        "calls_per_s" : iterations / total,
+        "items_per_s" : items / total,
+        "p50_ms" : percentiles[49] * 1000,
+        "p90_ms" : percentiles[89] * 1000,
+        "p99_ms" : percentiles[98] * 1000,
+        "peak_alloc_kib" : peak / 1024,
+    }
+
+def print_results(results:list[dict]):
+    header = f"{'benchmark':<32} {'calls/s':>9} {'items/s':>10} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'peak KiB':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['name']:<32} {r['calls_per_s']:9.1f} {r['items_per_s']:10.1f} {r['p50_ms']:9.2f} {r['p90_ms']:9.2f} {r['p99_ms']:9.2f} {r['peak_alloc_kib']:10.1f}")
+
+def bench_extract_article(args, server:MockJustpaste) -> list[dict]:
+    page = Fixtures().article_page(1, owner=False)
+    url = f"{ROOT}/bench1"
+    return [measure("extract_article", lambda: bool(extract_article(url, page)), args.iterations * 10)]
+
+def bench_paginate(args, server:MockJustpaste) -> list[dict]:
+    jp = server.client()
+    url = APIEndpoints.NOTES.value
+    results = []
+    for workers in args.workers:
+        results.append(measure(
+            f"_paginate_raw (workers={workers})",
+            lambda: sum(1 for _ in jp._paginate_raw(url, extract_article_previews, 1, None, None, workers)),
+            args.iterations))
+    return results
+
+def bench_user_from_url(args, server:MockJustpaste) -> list[dict]:
+    jp = server.client()
+    url = f"{ROOT}/u/bench"
+    return [
+        measure("user_from_url", lambda: len(jp.user_from_url(url).public_articles.page(1)), args.iterations),
+        measure("user_from_url (len)", lambda: len(jp.user_from_url(url).public_articles), args.iterations),
+        measure("user_from_url (all pages)", lambda: sum(1 for _ in jp.user_from_url(url).public_articles), args.iterations),
+    ]
+
+def bench_list_conversations(args, server:MockJustpaste) -> list[dict]:
+    jp = server.client()
+
+    def hydrated() -> int:
+        jp.user_cache.clear()
+        return len(jp.list_conversations())
+
+    return [
+        measure("list_conversations", hydrated, max(1, args.iterations // 4)),
+        measure("list_conversations (cached)", lambda: len(jp.list_conversations()), args.iterations),
+        measure("list_conversations (short)", lambda: len(jp.list_conversations(hydrate_users=False)), args.iterations),
+    ]
+
+def bench_new_article(args, server:MockJustpaste) -> list[dict]:
+    jp = server.client()
+    specs = [{"title" : f"Bench {i}", "body" : "<p>Bench body</p>", "privacy" : "hidden"} for i in range(10)]
+    results = [measure("new_article", lambda: bool(jp.new_article(**specs[0])), args.iterations)]
+    for workers in args.workers:
+        results.append(measure(
+            f"new_articles x10 (workers={workers})",
+            lambda: sum(r.ok for r in jp.new_articles(specs, max_workers=workers)),
+            max(1, args.iterations // 4)))
+    return results
+
+BENCHMARKS = {
+    "extract_article" : bench_extract_article,
+    "paginate" : bench_paginate,
+    "user_from_url" : bench_user_from_url,
+    "list_conversations" : bench_list_conversations,
+    "new_article" : bench_new_article,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every mock response")
+    parser.add_argument("--pages", type=int, default=10, help="No. of profile and notes pages")
+    parser.add_argument("--per-page", type=int, default=20, help="No. of previews on each page")
+    parser.add_argument("--conversations", type=int, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of GET requests the mock fails with a 503")
+    parser.add_argument("--retries", type=int, default=None, help="Give clients a RetryPolicy with this many retries")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="max_workers values for _paginate_raw and new_articles")
+    parser.add_argument("--only", choices=BENCHMARKS, nargs="+", default=list(BENCHMARKS))
+    parser.add_argument("--json", metavar="PATH", help="Also write the results to a JSON file")
+    args = parser.parse_args()
+
+    # the paginator sends with verify=False, which is irrelevant against a local http server
+    warnings.filterwarnings("ignore", module="urllib3")
+    os.environ.setdefault("TQDM_DISABLE", "1")
+
+    retry = RetryPolicy(total=args.retries, backoff=0.01) if args.retries is not None else None
+    client_options = {"retry" : retry} if retry is not None else {}
+
+    results = []
+    with MockJustpaste(latency=args.latency_ms / 1000,
+                       error_rate=args.error_rate,
+                       client_options=client_options,
+                       profile_pages=args.pages,
+                       notes_pages=args.pages,
+                       per_page=args.per_page,
+                       conversations=args.conversations,
+                       ) as server:
+        for name in args.only:
+            results.extend(BENCHMARKS[name](args, server))
+
+    print_results(results)
+    if retry is not None:
+        print(f"\nretries: {retry.stats()}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Throughput of one client shared by many threads at different connection pool sizes,
+against the local stand-in server in `mock_server.py`.
+
+Every thread sends `article-dynamic` requests through the same `Justpaste`. With fewer kept
+connections than threads, urllib3 opens extra connections and throws them away after one
+request, which against the real site means a new TCP + TLS handshake each time.
+"connections" is the no. of connections the server accepted during the run.
+
+    python benchmarks/bench_pool.py --threads 16 --requests 800 --latency-ms 5
+    python benchmarks/bench_pool.py --pool-sizes 1 4 16 --block
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockJustpaste
+from justpaste import ConnectionOptions
+
+def run(server:MockJustpaste, options:ConnectionOptions|None, threads:int, requests:int) -> dict:
+    jp = server.client(connections=options)
+    jp._load_content_dynamic(0)
+
+    before = server.server.connections
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        for _ in executor.map(jp._load_content_dynamic, range(requests)):
+            pass
+    elapsed = time.perf_counter() - start
+
+    return {
+        "pool" : "requests default" if options is None else str(options.max_connections),
+        "requests_per_s" : requests / elapsed,
+        "mean_ms" : elapsed / requests * threads * 1000,
+        "connections" : server.server.connections - before,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=800)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Delay added to every mock response")
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 4, 10, 16, 32])
+    parser.add_argument("--block", action="store_true", help="Wait for a kept connection instead of opening extra ones")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", module="urllib3")
+    # "Connection pool is full, discarding connection" is the point of the small pool sizes
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+
+    with MockJustpaste(latency=args.latency_ms / 1000) as server:
+        results = [run(server, None, args.threads, args.requests)]
+        for size in args.pool_sizes:
+            options = ConnectionOptions(max_connections=size, block=args.block)
+            results.append(run(server, options, args.threads, args.requests))
+
+    print(f"{args.threads} threads, {args.requests} requests, {args.latency_ms:g} ms latency{', blocking pools' if args.block else ''}\n")
+    header = f"{'max_connections':<18} {'req/s':>9} {'mean ms':>9} {'connections':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['pool']:<18} {r['requests_per_s']:9.1f} {r['mean_ms']:9.2f} {r['connections']:12d}")
+
+if __name__ == "__main__":
+    main()
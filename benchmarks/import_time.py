@@ -0,0 +1,66 @@
+"""
+Import-time benchmark for `from justpaste import Justpaste`.
+
+Every run imports the package in a fresh interpreter, so nothing is cached
+between samples. Pass `--max-ms` to turn it into a regression check.
+
+    python benchmarks/import_time.py --runs 10 --max-ms 400
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+STATEMENT = "from justpaste import Justpaste"
+
+TIMER = f"""
+import time
+t = time.perf_counter()
+{STATEMENT}
+print(time.perf_counter() - t)
+"""
+
+def run_once() -> float:
+    env = {**os.environ, "PYTHONPATH": SRC}
+    out = subprocess.run([sys.executable, "-c", TIMER], env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip()) * 1000
+
+def slowest_modules(top:int) -> list[tuple[int, str]]:
+    env = {**os.environ, "PYTHONPATH": SRC}
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", STATEMENT], env=env, capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative.strip()), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="No. of slowest modules to list")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if the median import time exceeds this")
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+    median = statistics.median(samples)
+
+    print(f"{STATEMENT!r} over {args.runs} runs")
+    print(f"  median {median:8.1f} ms")
+    print(f"  min    {min(samples):8.1f} ms")
+    print(f"  max    {max(samples):8.1f} ms")
+    print(f"\nSlowest imports (cumulative):")
+    for cumulative, name in slowest_modules(args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"\nMedian import time {median:.1f} ms exceeds {args.max_ms:.1f} ms", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
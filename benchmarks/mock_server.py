@@ -0,0 +1,529 @@
+"""
+Local stand-in for justpaste.it, serving the pages and API payloads in `fixtures/`
+from the same URL paths as `APIEndpoints`.
+
+The client keeps using the real URLs. `LocalRedirectAdapter` rewrites
+https://justpaste.it/... and https://msg.justpaste.it/... to the local server before sending,
+so requests still go over real sockets.
+
+    with MockJustpaste(profile_pages=20) as server:
+        jp = server.client()
+        jp.user_from_url("https://justpaste.it/u/bench")
+"""
+
+import collections
+import copy
+import datetime
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from justpaste import Justpaste
+from justpaste.consts import ROOT, MESSAGE_API_ROOT
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+MESSAGE_PREFIX = "/msg"
+
+def fixture_text(name:str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+def fixture_json(name:str):
+    return json.loads(fixture_text(name))
+
+class Fixtures:
+
+    """
+    Renders fixture pages for a given page number / id.
+    """
+
+    def __init__(self, profile_pages:int=10, notes_pages:int=10, per_page:int=20, conversations:int=10, messages:int=20):
+        self.profile_pages = profile_pages
+        self.notes_pages = notes_pages
+        self.per_page = per_page
+        self.conversations = conversations
+        self.messages = messages
+
+        self.article_html = Template(fixture_text("article.html"))
+        self.profile_html = Template(fixture_text("profile.html"))
+        self.manage_html = Template(fixture_text("manage.html"))
+        self.stats_html = Template(fixture_text("stats.html"))
+        self.settings_html = Template(fixture_text("settings.html"))
+
+        self.article = fixture_json("article.json")
+        self.bar_options = fixture_json("bar_options.json")
+        self.user = fixture_json("user.json")
+        self.show_premium_user = fixture_json("show_premium_user.json")
+        self.public_article_preview = fixture_json("public_article_preview.json")
+        self.article_preview = fixture_json("article_preview.json")
+        self.stats = fixture_json("stats.json")
+        self.settings = {
+            "premiumUserData" : fixture_json("settings_profile.json"),
+            "notesSettingsPageSettings" : fixture_json("settings_notes.json"),
+            "notificationSettingsPageSettings" : fixture_json("settings_notification.json"),
+            "privacySettingsPageSettings" : fixture_json("settings_privacy.json"),
+        }
+        self.conversation = fixture_json("conversation.json")
+        self.message = fixture_json("message.json")
+        self.existing_article = fixture_json("existing_article.json")
+        # (title, content) of articles changed with `edit_article`
+        self.edits : dict[int, tuple[str, str]] = {}
+        # messages every conversation got after the fixture's, see `receive_messages`
+        self.received = 0
+
+    def edit_article(self, article_id:int, title:str, content:str):
+        self.edits[article_id] = (title, content)
+
+    def receive_messages(self, count:int):
+        self.received += count
+
+    def article_page(self, article_id:int, owner:bool) -> str:
+        article = {
+            **self.article,
+            "id" : article_id,
+            "url" : f"{ROOT}/{'own' if owner else 'bench'}{article_id}",
+            "shortUrl" : f"https://jpst.it/{article_id}",
+            "pdfUrl" : f"{ROOT}/pdf/{article_id}",
+            "secureCode" : f"secure{article_id}",
+            "editUrl" : f"/edit/{article_id}/secure{article_id}",
+            "isArticleOwner" : owner,
+        }
+        title, content = self.edits.get(article_id, (f"Bench note {article_id}", "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40))
+        return self.article_html.substitute(
+            article=json.dumps(article),
+            bar_options=json.dumps(self.bar_options),
+            title=title,
+            content=content)
+
+    def profile_page(self, permalink:str, page:int) -> str:
+        user = {**self.user, "permalink" : permalink, "url" : f"{ROOT}/u/{permalink}", "articlesCount" : self.profile_pages * self.per_page}
+        previews = []
+        for i in range(self.per_page):
+            article_id = page * 1000 + i
+            previews.append({**self.public_article_preview, "id" : article_id, "url" : f"{ROOT}/bench{article_id}"})
+        return self.profile_html.substitute(
+            page_premium_user=json.dumps(user),
+            show_premium_user=json.dumps(self.show_premium_user),
+            public_articles_data=json.dumps(previews),
+            pagination=json.dumps({"currentPage" : page, "totalPages" : self.profile_pages}))
+
+    def manage_page(self, page:int) -> str:
+        previews = []
+        for i in range(self.per_page):
+            article_id = page * 1000 + i
+            previews.append({**self.article_preview, "id" : article_id, "secureCode" : f"secure{article_id}", "url" : f"{ROOT}/own{article_id}"})
+            if article_id in self.edits:
+                previews[-1]["title"] = self.edits[article_id][0]
+        return self.manage_html.substitute(
+            articles_data=json.dumps(previews),
+            pagination=json.dumps({"currentPage" : page, "totalPages" : self.notes_pages}))
+
+    def stats_page(self) -> str:
+        return self.stats_html.substitute(articles_stats_data=json.dumps(self.stats))
+
+    def settings_page(self, variable:str) -> str:
+        return self.settings_html.substitute(variable=variable, data=json.dumps(self.settings[variable]))
+
+    def conversation_list(self) -> dict:
+        conversations = []
+        for i in range(self.conversations):
+            c = copy.deepcopy(self.conversation)
+            c["id"] = i
+            c["interlocutor"]["permalink"] = f"friend{i}"
+            c["interlocutor"]["url"] = f"{ROOT}/u/friend{i}"
+            c["totalMessages"] = self.messages + self.received
+            if self.received:
+                c["lastMessageDate"] = self.message_date(self.messages + self.received - 1)
+                c["lastMessageUnread"] = True
+            conversations.append(c)
+        return {"conversations" : conversations}
+
+    def message_date(self, i:int) -> str:
+        # the fixture's message is the last of the first `messages`, all of them are a minute apart
+        last = datetime.datetime.fromisoformat(self.message["creationDate"])
+        return (last + datetime.timedelta(minutes=i - (self.messages - 1))).isoformat()
+
+    def message_list(self, after:str|None=None) -> dict:
+        messages = [
+            {**self.message, "id" : i, "creationDate" : self.message_date(i), "lastUpdateDate" : self.message_date(i)}
+            for i in range(self.messages + self.received)
+        ]
+        if after:
+            after = after.removesuffix('Z')
+            messages = [m for m in messages if m["creationDate"] > after]
+        return {"messages" : messages}
+
+SETTINGS_PAGES = {
+    "public-profile" : "premiumUserData",
+    "notes" : "notesSettingsPageSettings",
+    "notification" : "notificationSettingsPageSettings",
+    "privacy" : "privacySettingsPageSettings",
+}
+
+ROUTES : list[tuple[str, re.Pattern, str]] = [
+    ("POST", re.compile(r"/api/v1/login"), "login"),
+    ("GET", re.compile(r"/login"), "login_page"),
+    ("POST", re.compile(r"/api/v1/logout"), "ok"),
+    ("POST", re.compile(r"/api/v1/new-article"), "new_article"),
+    ("POST", re.compile(r"/api/v1/save-article"), "save_article"),
+    ("POST", re.compile(r"/api/v1/existing-article"), "existing_article"),
+    ("POST", re.compile(r"/api/v1/article-dynamic"), "article_dynamic"),
+    ("POST", re.compile(r"/account/(manage|trash)/(delete|restore)/\d+/\w+"), "status_success"),
+    ("POST", re.compile(r"/account/settings/[\w-]+/save"), "success"),
+    ("GET", re.compile(r"/account/settings/([\w-]+)"), "settings"),
+    ("GET", re.compile(r"/account/(?:manage|trash)(?:/(\d+))?"), "manage"),
+    ("GET", re.compile(r"/account/articles-stats"), "stats"),
+    ("GET", re.compile(r"/u/([\w-]+)(?:/(\d+))?"), "profile"),
+    ("GET", re.compile(r"/(own|bench)(\d+)"), "article"),
+    ("POST", re.compile(MESSAGE_PREFIX + r"/api/v1/conversation/list"), "conversation_list"),
+    ("POST", re.compile(MESSAGE_PREFIX + r"/api/v1/conversation/new"), "conversation_new"),
+    ("POST", re.compile(MESSAGE_PREFIX + r"/api/v1/conversation/(\d+)/message"), "messages"),
+    ("POST", re.compile(MESSAGE_PREFIX + r"/api/v1/conversation/(\d+)/(mute|star)"), "ok"),
+    ("POST", re.compile(MESSAGE_PREFIX + r"/api/v1/message/send"), "success"),
+]
+
+class MockJustpasteHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes, Nagle + delayed ACK would add ~40ms to each response
+    disable_nagle_algorithm = True
+    server : "MockJustpasteServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.count_connection()
+
+    def _dispatch(self, method:str):
+        path = self.path.split("?", 1)[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        for route_method, pattern, name in ROUTES:
+            if route_method == method and (match := pattern.fullmatch(path)):
+                break
+        else:
+            name, match = None, None
+        self.server.count_request(name)
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if (status := self.server.injected_failure(name)) or (method == "GET" and self.server.should_fail()):
+            self.send_response(status or 503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if not self.server.is_logged_in(path, self.headers.get("Cookie")):
+            # what justpaste.it does with an expired session: the API answers 401, pages redirect to the login page
+            if path.startswith("/api/"):
+                self.send_response(401)
+            else:
+                self.send_response(302)
+                self.send_header("Location", "/login")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.extra_headers : dict[str, str] = {}
+
+        if match is not None:
+            status, content_type, payload = getattr(self, "route_" + name)(*match.groups(), body=body)
+        else:
+            status, content_type, payload = 404, "application/json", json.dumps({"error" : "notFound"})
+
+        data = payload.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in self.extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _json(self, data, status:int=200):
+        return status, "application/json", json.dumps(data)
+
+    def _html(self, text:str):
+        return 200, "text/html; charset=utf-8", text
+
+    def route_login(self, body:bytes):
+        self.extra_headers["Set-Cookie"] = f"session={self.server.new_session()}; Path=/"
+        return self._json({"success" : True})
+
+    def route_login_page(self, body:bytes):
+        return self._html("<html><body><form id=\"login\"></form></body></html>")
+
+    def route_ok(self, *groups, body:bytes):
+        return self._json({})
+
+    def route_success(self, *groups, body:bytes):
+        return self._json({"success" : True})
+
+    def route_status_success(self, *groups, body:bytes):
+        return self._json({"status" : "success"})
+
+    def route_new_article(self, body:bytes):
+        article_id = self.server.next_article_id()
+        return self._json({"article" : {"id" : article_id, "secureCode" : f"secure{article_id}"}})
+
+    def route_save_article(self, body:bytes):
+        article_id = json.loads(body)["articleId"]
+        return self._json({"action" : "redirect", "url" : f"/own{article_id}"})
+
+    def route_existing_article(self, body:bytes):
+        article_id = json.loads(body)["articleId"]
+        existing = copy.deepcopy(self.server.fixtures.existing_article)
+        existing["article"]["id"] = article_id
+        existing["article"]["secureCode"] = f"secure{article_id}"
+        return self._json(existing)
+
+    def route_article_dynamic(self, body:bytes):
+        return self._json({"action" : "display", "articleContent" : "<p>Dynamic bench body</p>"})
+
+    def route_settings(self, name:str, body:bytes):
+        return self._html(self.server.fixtures.settings_page(SETTINGS_PAGES[name]))
+
+    def route_manage(self, page:str|None, body:bytes):
+        return self._html(self.server.fixtures.manage_page(int(page or 1)))
+
+    def route_stats(self, body:bytes):
+        return self._html(self.server.fixtures.stats_page())
+
+    def route_profile(self, permalink:str, page:str|None, body:bytes):
+        return self._html(self.server.fixtures.profile_page(permalink, int(page or 1)))
+
+    def route_article(self, kind:str, article_id:str, body:bytes):
+        return self._html(self.server.fixtures.article_page(int(article_id), kind == "own"))
+
+    def route_conversation_list(self, body:bytes):
+        return self._json(self.server.fixtures.conversation_list())
+
+    def route_conversation_new(self, body:bytes):
+        permalink = json.loads(body)["receiverPermalink"]
+        conversation = copy.deepcopy(self.server.fixtures.conversation)
+        conversation["interlocutor"]["permalink"] = permalink
+        conversation["interlocutor"]["url"] = f"{ROOT}/u/{permalink}"
+        return self._json({"conversation" : conversation})
+
+    def route_messages(self, conversation_id:str, body:bytes):
+        return self._json(self.server.fixtures.message_list(json.loads(body or b'{}').get("afterDateTime")))
+
+class MockJustpasteServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, fixtures:Fixtures, latency:float=0.0, error_rate:float=0.0):
+        super().__init__(("127.0.0.1", 0), MockJustpasteHandler)
+        self.fixtures = fixtures
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(0)
+        self.connections = 0
+        # requests received per route name, None for unknown paths
+        self.requests : collections.Counter[str|None] = collections.Counter()
+        # route name -> statuses the next requests to it get, see `fail_next`
+        self.failures : dict[str, list[int]] = {}
+        self._article_id = 100_000
+        self._article_lock = threading.Lock()
+        self.logins = 0
+        # None until `expire_sessions()`, after that only requests with a session from a later login get through
+        self.sessions : set[str] | None = None
+
+    def count_connection(self):
+        with self._article_lock:
+            self.connections += 1
+
+    def count_request(self, route:str|None):
+        with self._article_lock:
+            self.requests[route] += 1
+
+    def fail_next(self, route:str, count:int=1, status:int=503):
+        with self._article_lock:
+            self.failures.setdefault(route, []).extend([status] * count)
+
+    def injected_failure(self, route:str|None) -> int | None:
+        with self._article_lock:
+            statuses = self.failures.get(route)
+            return statuses.pop(0) if statuses else None
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._article_lock:
+            return self._random.random() < self.error_rate
+
+    def new_session(self) -> str:
+        with self._article_lock:
+            self.logins += 1
+            session = f"s{self.logins}"
+            if self.sessions is not None:
+                self.sessions.add(session)
+            return session
+
+    def is_logged_in(self, path:str, cookie:str|None) -> bool:
+        # the message API has cookies of its own, it isn't checked
+        if path in ("/api/v1/login", "/login") or path.startswith(MESSAGE_PREFIX):
+            return True
+        with self._article_lock:
+            if self.sessions is None:
+                return True
+            cookies = dict(c.strip().split("=", 1) for c in (cookie or "").split(";") if "=" in c)
+            return cookies.get("session") in self.sessions
+
+    def expire_sessions(self):
+        with self._article_lock:
+            self.sessions = set()
+
+    def next_article_id(self) -> int:
+        with self._article_lock:
+            self._article_id += 1
+            return self._article_id
+
+class LocalRedirectAdapter(HTTPAdapter):
+
+    """
+    Sends requests for justpaste.it and msg.justpaste.it to the local server instead.
+    """
+
+    def __init__(self, base_url:str, **kwargs):
+        self.rewrites = [
+            (MESSAGE_API_ROOT, base_url + MESSAGE_PREFIX + "/api/v1"),
+            (ROOT, base_url),
+        ]
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        for prefix, replacement in self.rewrites:
+            if request.url.startswith(prefix):
+                url = request.url
+                request.url = replacement + url[len(prefix):]
+                try:
+                    resp = super().send(request, **kwargs)
+                finally:
+                    # cookies are stored and redirects followed against the real url
+                    request.url = url
+                resp.url = url
+                return resp
+        return super().send(request, **kwargs)
+
+def local_redirect_transport(base_url:str, **transport_options):
+    """
+    httpx counterpart of `LocalRedirectAdapter`, for `AsyncJustpaste`.
+    """
+    import httpx
+
+    rewrites = [
+        (MESSAGE_API_ROOT, base_url + MESSAGE_PREFIX + "/api/v1"),
+        (ROOT, base_url),
+    ]
+
+    class LocalRedirectTransport(httpx.AsyncHTTPTransport):
+
+        async def handle_async_request(self, request):
+            url = request.url
+            for prefix, replacement in rewrites:
+                if str(url).startswith(prefix):
+                    request.url = httpx.URL(replacement + str(url)[len(prefix):])
+                    try:
+                        return await super().handle_async_request(request)
+                    finally:
+                        # cookies are stored and redirects followed against the real url
+                        request.url = url
+            return await super().handle_async_request(request)
+
+    return LocalRedirectTransport(**transport_options)
+
+class MockJustpaste:
+
+    """
+    Runs a `MockJustpasteServer` in a background thread for the duration of a `with` block.
+    `latency` adds a fixed delay in seconds to every response to imitate network round trips.
+    `error_rate` is the share of GET requests answered with a transient 503.
+    `client_options` are passed to every `Justpaste` made by `client()`, and every `AsyncJustpaste` made by `async_client()`.
+    """
+
+    def __init__(self, latency:float=0.0, error_rate:float=0.0, client_options:dict|None=None, **fixture_options):
+        self.server = MockJustpasteServer(Fixtures(**fixture_options), latency, error_rate)
+        self.client_options = client_options or {}
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def session(self, **adapter_options) -> requests.Session:
+        session = requests.Session()
+        adapter = LocalRedirectAdapter(self.base_url, **adapter_options)
+        session.mount("https://justpaste.it", adapter)
+        session.mount("https://msg.justpaste.it", adapter)
+        return session
+
+    def client(self, load_settings="lazy", **kwargs) -> Justpaste:
+        return Justpaste("bench@example.com", "benchmark", load_settings=load_settings, session=self.session(), **{**self.client_options, **kwargs})
+
+    def async_client(self, load_settings="lazy", **kwargs):
+        """
+        An `AsyncJustpaste` sending its requests here, `start()` it before use.
+        """
+        from justpaste.aio import AsyncJustpaste
+        options = {**self.client_options, **kwargs}
+        # the transport is ours, so the pool options of `connections` go on it here
+        connections = options.get("connections")
+        transport = local_redirect_transport(self.base_url, **(connections.httpx_transport_options() if connections else {}))
+        return AsyncJustpaste("bench@example.com", "benchmark", load_settings=load_settings, transport=transport, **options)
+
+    def edit_article(self, article_id:int, title:str, content:str):
+        """
+        Changes the title and body the article page and the notes listing show for `article_id`.
+        """
+        self.server.fixtures.edit_article(article_id, title, content)
+
+    def fail_next(self, route:str, count:int=1, status:int=503):
+        """
+        Answers the next `count` requests to `route` (a name in `ROUTES`) with `status` and `Retry-After: 0`.
+        """
+        self.server.fail_next(route, count, status)
+
+    def receive_messages(self, count:int=1):
+        """
+        Adds `count` newer messages to every conversation.
+        """
+        self.server.fixtures.receive_messages(count)
+
+    def expire_sessions(self):
+        """
+        Logs every client out, as if their cookies had expired.
+        """
+        self.server.expire_sessions()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
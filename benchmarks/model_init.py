@@ -0,0 +1,108 @@
+"""
+Micro-benchmark for `ModelInitializer` on preview dicts.
+
+Builds N public and own article previews (100k by default) and times
+- key renaming with the uncached per-key regex the field maps replaced (no value conversion)
+- key renaming plus value conversion through the field maps
+- full model construction through `ModelInitializer`
+- construction throughput and retained memory per preview for each `models` mode of the client
+  (validated models, trusted models, lite `__slots__` previews)
+
+    python benchmarks/model_init.py -n 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from justpaste.consts import CAMEL_TO_SNAKE_REGEX
+from justpaste.utils import ModelInitializer, MODEL_INITIALIZERS, translate_keys
+
+def public_preview(i:int) -> dict:
+    return {
+        "id" : i,
+        "noteHeader" : f"Note {i}",
+        "url" : f"https://justpaste.it/n{i}",
+        "shortContent" : "Lorem ipsum dolor sit amet",
+        "tags" : ["a", "b"],
+        "createdDate" : "Jun 7, 2022",
+        "visits" : "1,234",
+        "favouriteCount" : None,
+        "positive" : 3,
+        "negative" : 0,
+        "pinned" : False,
+    }
+
+def own_preview(i:int) -> dict:
+    return {
+        "id" : i,
+        "secureCode" : "abcdef",
+        "url" : f"https://justpaste.it/n{i}",
+        "title" : f"Note {i}",
+        "isPasswordProtected" : False,
+        "isPublic" : True,
+        "visibilityLevel" : "public",
+        "uniqueViews" : "1,234",
+        "online" : "2",
+        "created" : "Jun 7, 2022",
+        "favouriteCount" : "0",
+        "positive" : 3,
+        "negative" : 0,
+        "tags" : [],
+    }
+
+def regex_keys(raw:dict) -> dict:
+    # what every key went through before the translations were cached
+    return {'_'.join(m.lower() for m in CAMEL_TO_SNAKE_REGEX.findall(k)) : v for k, v in raw.items()}
+
+def bench(label:str, fn, items:list[dict]):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<38} {elapsed*1000:9.1f} ms  {len(items)/elapsed:12,.0f} obj/s")
+
+def bench_modes(label:str, method:str, items:list[dict]):
+    print(f"\n{len(items):,} {label} by client `models` mode")
+    for mode, initializer in MODEL_INITIALIZERS.items():
+        build = getattr(initializer, method)
+        start = time.perf_counter()
+        for item in items:
+            build(item)
+        elapsed = time.perf_counter() - start
+
+        # what a list of them keeps alive, without the input dicts
+        tracemalloc.start()
+        kept = [build(item) for item in items]
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del kept
+        print(f"  {mode:<38} {elapsed*1000:9.1f} ms  {len(items)/elapsed:12,.0f} obj/s  {retained/len(items):8.0f} B/obj")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=100_000)
+    args = parser.parse_args()
+
+    public = [public_preview(i) for i in range(args.n)]
+    own = [own_preview(i) for i in range(args.n)]
+
+    print(f"{args.n:,} public article previews")
+    bench("keys only, per-key regex", regex_keys, public)
+    bench("keys + conversions, field map", lambda r: translate_keys(r, ModelInitializer.PUBLIC_ARTICLE_PREVIEW_FIELDS), public)
+    bench("ModelInitializer.public_article_preview", ModelInitializer.public_article_preview, public)
+
+    print(f"\n{args.n:,} own article previews")
+    bench("keys only, per-key regex", regex_keys, own)
+    bench("keys + conversions, field map", lambda r: translate_keys(r, ModelInitializer.ARTICLE_PREVIEW_FIELDS), own)
+    bench("ModelInitializer.article_preview", ModelInitializer.article_preview, own)
+
+    bench_modes("public article previews", "public_article_preview", public)
+    bench_modes("own article previews", "article_preview", own)
+
+if __name__ == "__main__":
+    main()
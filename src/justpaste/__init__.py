@@ -1,13 +1,36 @@
 import requests
 
-from typing import Any
+from typing import Any, Literal
 from urllib.parse import urlparse
 from requests.auth import HTTPProxyAuth
 
 from .base import JustpasteBase
+from .objects import User
+from .sessions import SessionStore, FileSessionStore
+from .cache import PageCache
+from .ratelimit import RequestScheduler, RateLimit, Priority, request_priority
+from .retry import RetryPolicy, retry_safe
+from .connections import ConnectionOptions
+from .pool import ClientPool
+from .sync import MessageSync, MessageStore, MemoryMessageStore, JsonlMessageStore
+from .listener import MessageListener
 from .settings import SettingsMixin
 from .messages import MessagesMixin
 
+def __getattr__(name:str):
+    # the async client pulls in httpx, only import it when it is asked for
+    if name == "AsyncJustpaste":
+        from .aio import AsyncJustpaste
+        return AsyncJustpaste
+    # sqlite3 is only needed by the mirror
+    if name == "ArticleMirror":
+        from .mirror import ArticleMirror
+        return ArticleMirror
+    if name in ("ArticleExport", "ExportCheckpoint"):
+        from . import export
+        return getattr(export, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 class Justpaste(
     JustpasteBase,
     SettingsMixin,
@@ -19,7 +42,7 @@ class Justpaste(
 
     """
 
-    def __init__(self, email: str | None = None, password: str | None = None, proxy: str | None = None):
+    def __init__(self, email: str | None = None, password: str | None = None, proxy: str | None = None, load_settings: Literal['eager', 'lazy'] = 'eager', session_store: SessionStore | None = None, cache: PageCache | None = None, session: requests.Session | None = None, scheduler: RequestScheduler | None = None, retry: RetryPolicy | None = None, connections: ConnectionOptions | None = None, models: Literal['validated', 'trusted', 'lite'] = 'validated', qr_codes: Literal['lazy', 'drop'] = 'lazy'):
 
 
         """
@@ -28,6 +51,29 @@ class Justpaste(
             - email (str | None): Email of account. Default: None
             - password (str | None): Password of account. Default: None
             - proxy (str | None): Proxy URL ("http://user:password@ip:port") Default: None
+            - load_settings ("eager", "lazy"): "eager" fetches all account settings while constructing, \
+            "lazy" fetches a settings category only when `change_settings` first touches it, \
+            so read-only clients never fetch them. Default: "eager"
+            - session_store (SessionStore | None): Keeps the cookies, user agent and settings between restarts. \
+            A stored session is reused without logging in, and the client logs in again only when \
+            a request comes back unauthenticated. e.g. `FileSessionStore()`. Default: None
+            - cache (PageCache | None): Caches fetched articles and users by URL. Entries are dropped \
+            when this client edits, deletes, shreds or restores the article. e.g. `PageCache(ttl=600)`. Default: None
+            - session (requests.Session | None): Session to send requests with, e.g. one with custom adapters mounted. Default: None
+            - scheduler (RequestScheduler | None): Rate limits requests to justpaste.it and msg.justpaste.it with a token bucket each. \
+            Direct calls go ahead of message syncing, which goes ahead of pagination and bulk loading. \
+            `jp.scheduler.stats()` shows queue depth and wait times. e.g. `RequestScheduler(site=RateLimit(5, burst=10))`. Default: None
+            - retry (RetryPolicy | None): Retries requests that are safe to send twice after 429/5xx responses and \
+            dropped connections, with exponential backoff and jitter, honoring Retry-After. \
+            `jp.retry.stats()` shows retry counts and time spent. e.g. `RetryPolicy(total=5)`. Default: None
+            - connections (ConnectionOptions | None): Pool sizes, keep-alive and default timeouts, with separate pools \
+            for justpaste.it and msg.justpaste.it. Size `max_connections` to the no. of threads sharing the client. \
+            e.g. `ConnectionOptions(max_connections=32, timeout=(5, 30))`. Default: None (requests' defaults)
+            - models ("validated", "trusted", "lite"): How parsed pages are turned into objects. "validated" runs full pydantic validation, \
+            "trusted" builds the same models without validating them again (url fields hold plain `str`), \
+            "lite" also builds previews as `__slots__` objects with `to_model()`, for crawls that keep many previews. Default: "validated"
+            - qr_codes ("lazy", "drop"): Articles and users keep their QR code image encoded as it came and decode it \
+            the first time `qr_code_data` is read. "drop" discards it while parsing, `qr_code_data` is then None. Default: "lazy"
 
         #### Important: 
         *JustPaste.it API will trigger captchas only for making \
@@ -37,7 +83,8 @@ class Justpaste(
         """
 
         if proxy:
-            session = requests.Session()
+            if session is None:
+                session = requests.Session()
             parsed_proxy = urlparse(proxy)
             proxies = {
                 "http" : proxy,
@@ -49,8 +96,19 @@ class Justpaste(
                     parsed_proxy.password if parsed_proxy.password else '')
                 
             session.proxies = proxies
-        else:
-            session = None
 
-        super().__init__(email, password, session)
-        self.load_all_settings()
\ No newline at end of file
+        super().__init__(email, password, session, session_store, cache, scheduler, retry, connections, models, qr_codes)
+        self.user_cache : dict[str, tuple[User, bool]] = {}
+        self._init_settings(self.session_state)
+
+        if load_settings == 'eager' and len(self.loaded_settings) < len(self.settings):
+            self.load_all_settings()
+
+        self.save_session()
+
+    def _session_state(self) -> dict[str, Any]:
+        return {
+            **super()._session_state(),
+            "settings" : self.settings,
+            "loaded_settings" : sorted(self.loaded_settings),
+        }
\ No newline at end of file
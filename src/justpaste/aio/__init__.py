@@ -0,0 +1,100 @@
+import httpx
+
+from typing import Any, Literal
+
+from ..objects import User
+from ..sessions import SessionStore
+from ..cache import PageCache
+from ..ratelimit import RequestScheduler
+from ..retry import RetryPolicy, async_retry_transport
+from ..connections import ConnectionOptions
+from .base import AsyncJustpasteBase
+from .settings import AsyncSettingsMixin
+from .messages import AsyncMessagesMixin
+from .sync import AsyncMessageSync
+from .listener import AsyncMessageListener
+
+class AsyncJustpaste(
+    AsyncJustpasteBase,
+    AsyncSettingsMixin,
+    AsyncMessagesMixin
+    ):
+
+    """
+    ## AsyncJustpaste Class
+
+    asyncio counterpart of `Justpaste`, built on `httpx.AsyncClient`.
+    Every request method is a coroutine and the preview paginators are async iterators.
+
+    ```python
+    async with AsyncJustpaste("<your email>", "<your password>") as jp:
+        article = await jp.article_from_url("...")
+        async for preview in jp.get_own_article_previews():
+            ...
+    ```
+
+    """
+
+    def __init__(self, email: str | None = None, password: str | None = None, proxy: str | None = None, load_settings: Literal['eager', 'lazy'] = 'eager', session_store: SessionStore | None = None, cache: PageCache | None = None, transport: httpx.AsyncBaseTransport | None = None, scheduler: RequestScheduler | None = None, retry: RetryPolicy | None = None, connections: ConnectionOptions | None = None, models: Literal['validated', 'trusted', 'lite'] = 'validated', qr_codes: Literal['lazy', 'drop'] = 'lazy'):
+
+        """
+        Initialize an AsyncJustpaste instance. Nothing is sent until `start()` is awaited
+        (or the instance is entered with `async with`).
+        ### Args:
+            - email (str | None): Email of account. Default: None
+            - password (str | None): Password of account. Default: None
+            - proxy (str | None): Proxy URL ("http://user:password@ip:port") Default: None
+            - load_settings ("eager", "lazy"): Same as `Justpaste`. Default: "eager"
+            - session_store (SessionStore | None): Same as `Justpaste`, a stored session is restored when the \
+            instance is created and `start()` does not log in. Default: None
+            - cache (PageCache | None): Same as `Justpaste`. Default: None
+            - transport (httpx.AsyncBaseTransport | None): Transport to send requests with, e.g. one that routes them elsewhere. \
+            `proxy` and the pool options of `connections` are then up to it. Default: None
+            - scheduler (RequestScheduler | None): Same as `Justpaste`. Default: None
+            - retry (RetryPolicy | None): Same as `Justpaste`. Default: None
+            - connections (ConnectionOptions | None): Same as `Justpaste`. httpx keeps a single pool, \
+            sized for both hosts. Default: None (httpx's defaults)
+            - models ("validated", "trusted", "lite"): Same as `Justpaste`. Default: "validated"
+            - qr_codes ("lazy", "drop"): Same as `Justpaste`. Default: "lazy"
+
+        """
+
+        if transport is None and (retry is not None or connections is not None):
+            # the proxy goes on the transport, a client level proxy would bypass it
+            transport = httpx.AsyncHTTPTransport(
+                proxy=proxy, **(connections.httpx_transport_options() if connections else {}))
+        if transport is not None:
+            if retry is not None:
+                transport = async_retry_transport(transport, retry, scheduler)
+            session = httpx.AsyncClient(
+                transport=transport, follow_redirects=True, **(connections.httpx_client_options() if connections else {}))
+        else:
+            session = httpx.AsyncClient(proxy=proxy, follow_redirects=True)
+        super().__init__(email, password, session, session_store, cache, scheduler, retry, models, qr_codes)
+        self.user_cache : dict[str, tuple[User, bool]] = {}
+        self._init_settings(self.session_state)
+        self.load_settings = load_settings
+
+    async def start(self):
+        """
+        Logs in and loads the account settings.
+        """
+        if self.session_state is None:
+            await self._login()
+        if self.logged_in and self.load_settings == 'eager' and len(self.loaded_settings) < len(self.settings):
+            await self.load_all_settings()
+        self.save_session()
+        return self
+
+    def _session_state(self) -> dict[str, Any]:
+        return {
+            **super()._session_state(),
+            "settings" : self.settings,
+            "loaded_settings" : sorted(self.loaded_settings),
+        }
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,625 @@
+import asyncio
+import datetime
+import itertools
+import warnings
+from collections import deque
+
+import httpx
+
+from ..consts import *
+from ..exceptions import *
+from ..objects import *
+from ..utils import *
+from typing import Awaitable
+from ..base import check_login_response, is_unauthenticated
+from ..sessions import SessionStore, dump_cookies, load_cookies
+from ..cache import PageCache
+from ..ratelimit import RequestScheduler, Priority, request_priority
+from ..retry import RetryPolicy, retry_safe
+
+class ReloginAuth(httpx.Auth):
+
+    """
+    Logs in again when a request comes back unauthenticated and sends it once more with the new cookies.
+    A request sent before another one already logged in again only gets the new cookies.
+    """
+
+    def __init__(self, client:"AsyncJustpasteBase"):
+        self.client = client
+
+    async def async_auth_flow(self, request:httpx.Request):
+        client = self.client
+        generation = client._login_generation
+        response = yield request
+        if str(request.url) == APIEndpoints.LOGIN.value or not is_unauthenticated(response):
+            return
+
+        async with client._login_lock:
+            if generation == client._login_generation:
+                client.session.cookies.clear()
+                login_response = yield client.session.build_request('POST', APIEndpoints.LOGIN.value, json=client._login_payload())
+                await login_response.aread()
+                check_login_response(login_response)
+                client._login_generation += 1
+                client.save_session()
+
+        request.headers.pop('Cookie', None)
+        client.session.cookies.set_cookie_header(request)
+        yield request
+
+class AsyncJustpasteBase:
+
+    def __init__(self, email:str|None=None, password:str|None=None, session:httpx.AsyncClient|None=None, session_store:SessionStore|None=None, cache:PageCache|None=None, scheduler:RequestScheduler|None=None, retry:RetryPolicy|None=None, models:Literal['validated', 'trusted', 'lite']='validated', qr_codes:Literal['lazy', 'drop']='lazy'):
+        if models not in MODEL_INITIALIZERS:
+            raise ValueError(f"Unknown models {models!r}")
+        self.email = email
+        self.password = password
+        self.models = MODEL_INITIALIZERS[models]
+        if qr_codes == 'drop':
+            self.models = self.models.without_qr_codes()
+        self.logged_in = False
+        self.cache = cache
+        self.scheduler = scheduler
+        self.retry = retry
+
+        if session is None:
+            session = httpx.AsyncClient(follow_redirects=True)
+        if scheduler is not None:
+            scheduler.install_async(session)
+        self.session = session
+
+        self.session_store = session_store
+        self.session_state = session_store.load(email) if session_store is not None and email else None
+        if self.session_state is not None:
+            self.user_agent : str = self.session_state["user_agent"]
+            # trust the stored cookies until a request says otherwise
+            load_cookies(self.session.cookies.jar, self.session_state["cookies"])
+            self.logged_in = True
+        else:
+            self.user_agent = get_user_agent()
+        self.session.headers["User-Agent"] = self.user_agent
+        self.session.headers['accept'] = "application/json, text/plain, */*"
+
+        if session_store is not None and self.email and self.password:
+            self._login_lock = asyncio.Lock()
+            self._login_generation = 0
+            self.session.auth = ReloginAuth(self)
+
+    def _login_payload(self) -> dict[str, Any]:
+        return {
+            "email":self.email,
+            "password":self.password,
+            "rememberMe":True
+            }
+
+    async def _login(self) -> None:
+
+        if self.email and self.password:
+
+            resp = await self.session.post(APIEndpoints.LOGIN.value, json=self._login_payload())
+            check_login_response(resp)
+            self.logged_in = True
+
+        else:
+            self.logged_in = False
+
+    def _session_state(self) -> dict[str, Any]:
+        return {
+            "cookies" : dump_cookies(self.session.cookies.jar),
+            "user_agent" : self.user_agent,
+        }
+
+    def save_session(self):
+        """
+        Same as `Justpaste.save_session`.
+        """
+        if self.session_store is not None and self.email and self.logged_in:
+            self.session_store.save(self.email, self._session_state())
+
+    async def _get_cached(self, url:str, model_key:str, exc:type[APIError], message:str, build:Callable[[str], Awaitable[T]]) -> T:
+        # same as `JustpasteBase._get_cached`, with a coroutine building the model
+        if self.cache is None:
+            resp = await self.session.get(url)
+            check_response(resp, exc, message)
+            return await build(resp.text)
+
+        entry, fresh = self.cache.lookup(url)
+        if not fresh:
+            resp = await self.session.get(url, headers=entry.conditional_headers() if entry is not None else None)
+            if entry is not None and resp.status_code == 304:
+                self.cache.refresh(entry)
+            else:
+                check_response(resp, exc, message)
+                entry = self.cache.put(url, resp)
+
+        if model_key not in entry.models:
+            entry.models[model_key] = await build(entry.text)
+
+        return entry.models[model_key].model_copy(deep=True)
+
+    def _invalidate_article(self, article:Article|OwnArticle):
+        if self.cache is not None:
+            self.cache.invalidate(str(article.url), article.id)
+
+    async def aclose(self):
+        await self.session.aclose()
+
+    def _public_previews_parser(self, *page_sources:str|ParsedPage) -> Generator[PublicArticlePreview, None, None]:
+        return extract_public_article_previews(*page_sources, initializer=self.models)
+
+    def _previews_parser(self, *page_sources:str|ParsedPage) -> Generator[ArticlePreview, None, None]:
+        return extract_article_previews(*page_sources, initializer=self.models)
+
+    async def _load_content_dynamic(self, article_id:int) -> str:
+        resp = await self.session.post(APIEndpoints.ARTICLE_DYNAMIC.value, json={'articleId':article_id})
+        check_response(resp, APIError, "Error while getting dynamic content", (response_ok, lambda r: r.json().get('action', None) == 'display'))
+
+        return resp.json()['articleContent']
+
+    async def _get_page(self, url:str) -> httpx.Response:
+        with request_priority(Priority.BULK):
+            return await self.session.get(url)
+
+    async def _paginate_raw(self,
+                            start_url:str,
+                            parser:Callable[[Unpack[tuple[str|ParsedPage, ...]]], Generator[T, None, None]],
+                            page_buffer:int=1,
+                            first_page_source:str|ParsedPage|None=None,
+                            total_pages:int|None=None,
+                            max_workers:int=1):
+
+        from tqdm import tqdm
+
+        if first_page_source is not None:
+            first_page = first_page_source
+        else:
+            resp = await self.session.get(start_url)
+            check_response(resp, APIError, "Error while getting start URL")
+            first_page = resp.text
+
+        if total_pages is not None:
+            total = total_pages
+        else:
+            total = extract_pagination(first_page)['totalPages']
+
+        if total > 1:
+            page_urls = iter([f"{start_url}/{i}" for i in range(2, total+1)])
+            in_flight : deque[asyncio.Task[httpx.Response]] = deque(
+                asyncio.create_task(self._get_page(url)) for url in itertools.islice(page_urls, max(max_workers, 1))
+                )
+            buf_counter = 1
+            buffer_pages = [first_page]
+            try:
+                with tqdm(total=total-1, desc="Getting pages", unit='page', leave=False) as pbar:
+                    while in_flight:
+
+                        if buf_counter % page_buffer == 0:
+                            for item in parser(*buffer_pages):
+                                yield item
+                            buffer_pages.clear()
+
+                        resp = await in_flight.popleft()
+                        for url in itertools.islice(page_urls, 1):
+                            in_flight.append(asyncio.create_task(self._get_page(url)))
+                        check_response(resp, APIError, f"Error while fetching page number {buf_counter+1}")
+                        buffer_pages.append(resp.text)
+                        buf_counter += 1
+                        pbar.update()
+            finally:
+                for task in in_flight:
+                    task.cancel()
+
+            if len(buffer_pages) > 0:
+                for item in parser(*buffer_pages):
+                    yield item
+
+        elif total == 1:
+            for item in parser(first_page):
+                yield item
+
+    async def _allocate_article(self) -> tuple[int, str]:
+        new_article_resp = await self.session.post(APIEndpoints.NEW_ARTICLE.value, json={})
+        check_response(new_article_resp, ArticleError, "Error while getting new article editor page")
+        new_article = new_article_resp.json()
+        return new_article["article"]['id'], new_article['article']['secureCode']
+
+    async def _save_new_article(self, article_id:int, secure_code:str, **kwargs) -> dict[str, Any]:
+        kwargs['logged_in'] = self.logged_in
+
+        if kwargs.get('privacy', None) is None:
+            if self.logged_in:
+                kwargs['privacy'] = 'hidden'
+            else:
+                kwargs['privacy'] = 'public'
+
+        payload = construct_save_json(article_id, secure_code, **kwargs).model_dump()
+
+        resp = await self.session.post(APIEndpoints.SAVE_ARTICLE.value, json=payload)
+        ret_data = resp.json()
+
+        check_response(resp, CaptchaRequired, "Captcha verification while creating article", (response_ok, lambda r: r.json().get('action', None) != 'captcha'))
+        check_response(resp, ArticleError, "Error while creating article", (response_ok, lambda r: r.json().get('action', None) == 'redirect'))
+
+        ret_data['visibilityLevel'] = kwargs['privacy']
+        return ret_data
+
+    async def _new_article(self, **kwargs) -> OwnArticle:
+        article_id, secure_code = await self._allocate_article()
+        ret_data = await self._save_new_article(article_id, secure_code, **kwargs)
+        return await self.article_from_url(ROOT+ret_data['url']) #type: ignore
+
+    async def _delete_article(self, article:OwnArticle):
+
+        if not article.is_owner:
+            raise ArticleError("Can't delete someone else's article")
+
+        resp = await self.session.post(APIEndpoints.DELETE_ARTICLE.value.format(article.id, article.secure_code))
+        self._invalidate_article(article)
+        check_response(resp, ArticleError, "Error while deleting article", (response_ok, lambda r: r.json()['status'] == "success"))
+
+    async def _edit_article(self, article:OwnArticle, /, refetch:bool=True, **kwargs):
+
+        if not article.is_owner:
+            raise ArticleError("Can't edit someone else's article")
+
+        article_properties = {
+            "articleId" : article.id,
+            "secureCode" : article.secure_code,
+        }
+
+        kwargs['logged_in'] = self.logged_in
+
+        resp = await self.session.post(APIEndpoints.EXISTING_ARTICLE.value, json=article_properties)
+        check_response(resp, APIError, "Requesting edit info failed")
+
+        saved = copy_save_json(resp.json(), kwargs)
+
+        # overwrites the same article, so a retry can't save it twice
+        with retry_safe():
+            resp = await self.session.post(APIEndpoints.SAVE_ARTICLE.value, json=saved.model_dump())
+        self._invalidate_article(article)
+        check_response(resp, CaptchaRequired, "Captcha verification while editing article", (response_ok, lambda r: r.json().get('action', None) != 'captcha'))
+        check_response(resp, ArticleError, "Error while editing article", (response_ok, lambda r: r.json().get('action', None) == 'redirect'))
+
+        url = ROOT+resp.json()['url']
+        if refetch:
+            return await self.article_from_url(url)
+        return patch_article(article, saved, url)
+
+    async def article_from_url(self, url:str) -> Article | OwnArticle:
+        """
+        Get Article data from URL.
+
+        Args:
+            url: URL of article
+
+        Returns:
+            Article object. Article or OwnArticle depending on whoever created the article.
+
+        Raises:
+            ArticleError: Failed to get the article.
+        """
+        async def build(page_source:str) -> Article | OwnArticle:
+            page = ParsedPage(page_source)
+            try:
+                return extract_article(url, page, initializer=self.models)
+            except RequireDynamicLoading as e:
+                return extract_article(url, page, await self._load_content_dynamic(e.article_id), self.models)
+
+        return await self._get_cached(url, "article", ArticleError, f"Error while getting article", build)
+
+    async def get_public_article_previews(self, user:User, pages:int|None=None, page_buffer:int=1, first_page_source:str|ParsedPage|None=None, max_workers:int=1):
+        """
+        Get Public Profile Article Previews
+
+        Args:
+            user: Target user to get article previews of
+            pages: No. of pages to scrape. Default: None (All pages)
+            page_buffer: No. of pages to buffer before yielding. Default: 1
+            first_page_source: Raw HTML or ParsedPage of user profile. Default: None
+            max_workers: Max. no. of pages fetched concurrently. Default: 1 (sequential)
+
+        Yields:
+            PublicArticlePreview
+
+        Raises:
+            APIError: Failed to get all pages
+
+        """
+        user_profile_url = str(user.url)
+        if first_page_source is not None:
+            first_page = first_page_source
+        else:
+            resp = await self.session.get(user_profile_url)
+            check_response(resp, APIError, "Error while getting user profile URL: "+ user_profile_url)
+            first_page = resp.text
+
+        total_pages : int = extract_pagination(first_page)['totalPages']
+        if pages is None or pages > total_pages:
+            pages = total_pages
+
+        async for preview in self._paginate_raw(user_profile_url, self._public_previews_parser, page_buffer, first_page, pages, max_workers):
+            yield preview
+
+    async def get_own_article_previews(self, trash=False, pages:int|None=None, page_buffer:int=1, first_page_source:str|ParsedPage|None=None, max_workers:int=1):
+
+        """
+        Get Own Article previews
+
+        Args:
+            trash: Get the trashed notes instead of active ones. Default: False
+            pages: No. of pages to scrape. Default: None (All pages)
+            page_buffer: No. of pages to buffer before yielding. Default: 1
+            first_page_source: Raw HTML or ParsedPage of user profile. Default: None
+            max_workers: Max. no. of pages fetched concurrently. Default: 1 (sequential)
+
+        Yields:
+            ArticlePreview
+
+        Raises:
+            APIError: Failed to get all pages
+
+        """
+
+        if trash:
+            url = APIEndpoints.TRASH.value
+        else:
+            url = APIEndpoints.NOTES.value
+
+        if first_page_source is not None:
+            first_page = first_page_source
+        else:
+            resp = await self.session.get(url)
+            check_response(resp, APIError, "Error while getting notes: "+ url)
+            first_page = resp.text
+
+        total_pages = extract_pagination(first_page)['totalPages']
+        if pages is None or pages > total_pages:
+            pages = total_pages
+
+        async for preview in self._paginate_raw(url, self._previews_parser, page_buffer, first_page, pages, max_workers):
+            yield preview
+
+    async def load_article_from_preview(self, preview:PublicArticlePreview | ArticlePreview) -> Article | OwnArticle:
+
+        """
+        Load article from its preview
+
+        Args:
+            preview: Any article preview
+
+        Returns:
+            Full article
+        """
+
+        return await self.article_from_url(str(preview.url))
+
+    async def load_articles_from_previews(self, previews:Iterable[PublicArticlePreview | ArticlePreview], max_workers:int=4):
+
+        """
+        Load many articles from their previews concurrently.
+
+        Args:
+            previews: Any article previews
+            max_workers: Max. no. of articles fetched at the same time. Default: 4
+
+        Yields:
+            (preview, article) pairs in completion order. If loading an article failed, \
+            the exception takes the place of the article and the rest of the batch carries on.
+        """
+
+        async def load(preview:PublicArticlePreview | ArticlePreview) -> Article | OwnArticle:
+            with request_priority(Priority.BULK):
+                return await self.load_article_from_preview(preview)
+
+        remaining = iter(previews)
+        pending : dict[asyncio.Task[Article | OwnArticle], PublicArticlePreview | ArticlePreview] = {
+            asyncio.create_task(load(preview)) : preview
+            for preview in itertools.islice(remaining, max_workers)
+        }
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    preview = pending.pop(task)
+                    for next_preview in itertools.islice(remaining, 1):
+                        pending[asyncio.create_task(load(next_preview))] = next_preview
+
+                    exc = task.exception()
+                    yield preview, (task.result() if exc is None else exc)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def user_from_url(self, user_profile_url:str, load_article_previews=True) -> User:
+
+        """
+        Load user from URL.
+
+        Args:
+            user_profile_url: URL of user profile
+            load_article_previews: Load article previews into the object. Default=True
+
+        Returns:
+            User object
+
+        """
+
+        async def build(profile_page:str) -> User:
+            user = extract_user(profile_page, [], self.models)
+            if load_article_previews:
+                user.public_articles = [preview async for preview in self.get_public_article_previews(user, None, 3, profile_page)]
+            return user
+
+        return await self._get_cached(user_profile_url,
+                                      "user+previews" if load_article_previews else "user",
+                                      APIError,
+                                      "Error while getting user profile URL: "+ user_profile_url,
+                                      build)
+
+    async def shred_article(self, article:OwnArticle):
+
+        resp = await self.session.post(APIEndpoints.SHRED_ARTICLE.value.format(article.id, article.secure_code))
+        self._invalidate_article(article)
+        check_response(resp,
+                       ArticleError,
+                       "Error while trying to shred article",
+                       (response_ok, lambda r: r.json()['status'] == 'success'))
+
+    async def restore_article(self, article:OwnArticle):
+
+        resp = await self.session.post(APIEndpoints.RESTORE_ARTICLE.value.format(article.id, article.secure_code))
+        self._invalidate_article(article)
+        check_response(resp,
+                       ArticleError,
+                       "Error while trying to restore article",
+                       (response_ok, lambda r: r.json()['status'] == 'success'))
+
+    async def subscribe_to_user(self, user:User):
+        """
+        Subscribes to user
+        ### Parameters:
+        - user (User): User object
+        """
+        data = {"premiumUserId":user.id}
+        resp = await self.session.post(APIEndpoints.SUBSCRIBE_USER.value, json=data)
+        check_response(resp, APIError, "Error while subscribing to user")
+
+    async def unsubscribe_from_user(self, user:User):
+        """
+        Unsubscribes from user
+        ### Parameters:
+        - user (User): User object
+        """
+        resp = await self.session.post(APIEndpoints.UNSUBSCRIBE_USER.value.format(user.id))
+        check_response(resp, APIError, "Error while unsubscribing from user")
+
+    async def favorite_article(self, article:Article|OwnArticle):
+        """
+        Adds article to favorites
+        ### Parameters:
+        - article (Article|OwnArticle): Article
+        """
+        payl = {"articleId":article.id}
+        resp = await self.session.post(APIEndpoints.FAVORITE_ARTICLE.value, json=payl)
+        check_response(resp, ArticleError, "Error while trying to favorite article")
+
+    async def unfavorite_article(self, article:Article|OwnArticle):
+        """
+        Removes article from favorites
+        ### Parameters:
+        - article (Article|OwnArticle): Article
+        """
+        resp = await self.session.post(APIEndpoints.UNFAVORITE_ARTICLE.value.format(article.id))
+        check_response(resp, ArticleError, "Error while trying to unfavorite article")
+
+    async def get_subscribed_articles(self) -> list[PublicArticlePreview]:
+        """
+        Returns articles from subscribed users.
+        """
+
+        resp = await self.session.get(APIEndpoints.SUBSCRIBED.value)
+        check_response(resp, APIError, "Error while getting subscribed accounts")
+
+        return [*extract_public_article_previews(resp.text, initializer=self.models)]
+
+    async def get_total_stats(self):
+        """
+        Returns total stats for profile.
+        """
+        resp = await self.session.get(APIEndpoints.STATS.value)
+        check_response(resp, APIError, "Error while getting stats page")
+
+        return extract_total_stats(resp.text, self.models)
+
+    async def new_article(self, **kwargs):
+
+        """Creates a new JustPaste.it page (article).
+        Takes the same parameters as `Justpaste.new_article`.
+        ### Returns:
+            OwnArticle
+        """
+
+        if isinstance(kwargs.get('expiry_date', None), datetime.datetime):
+            kwargs['expiry_date'] = kwargs['expiry_date'].isoformat()+'Z'
+
+        return await self._new_article(**kwargs)
+
+    async def new_articles(self, specs:Iterable[dict[str, Any]], max_workers:int=4, max_allocations:int|None=None, refetch:bool=False):
+
+        """
+        Publishes many articles. Takes the same parameters as `Justpaste.new_articles`.
+
+        Yields:
+            PublishResult for every spec in completion order
+        """
+
+        max_allocations = max_allocations or max_workers
+        allocating = asyncio.Semaphore(max_allocations)
+        saving = asyncio.Semaphore(max_workers)
+
+        async def publish(result:PublishResult) -> PublishResult:
+            with request_priority(Priority.BULK):
+                try:
+                    async with allocating:
+                        result.article_id, result.secure_code = await self._allocate_article()
+                    async with saving:
+                        ret_data = await self._save_new_article(result.article_id, result.secure_code, **result.spec)
+                        if refetch:
+                            result.article = await self.article_from_url(ROOT+ret_data['url']) #type: ignore
+                        else:
+                            result.article = PublishedArticle(
+                                id=result.article_id,
+                                secure_code=result.secure_code,
+                                url=ROOT+ret_data['url'],
+                                title=result.spec.get('title', ''),
+                                visibility_level=ret_data['visibilityLevel'])
+                except Exception as e:
+                    result.error = e
+            return result
+
+        def submit(index:int, spec:dict[str, Any]):
+            spec = dict(spec)
+            if isinstance(spec.get('expiry_date', None), datetime.datetime):
+                spec['expiry_date'] = spec['expiry_date'].isoformat()+'Z'
+            pending.add(asyncio.create_task(publish(PublishResult(index, spec))))
+
+        remaining = enumerate(specs)
+        pending : set[asyncio.Task[PublishResult]] = set()
+        try:
+            for index, spec in itertools.islice(remaining, max_workers + max_allocations):
+                submit(index, spec)
+
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.remove(task)
+                    for index, spec in itertools.islice(remaining, 1):
+                        submit(index, spec)
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def edit_article(self, article:OwnArticle, /, refetch:bool=True, **kwargs):
+
+        """Edits an existing JustPaste.it page (article).
+        Takes the same parameters as `Justpaste.edit_article`. With `refetch=False`, fields the server computes
+        such as `modified_at` keep their values from before the edit."""
+
+        return await self._edit_article(article, refetch, **kwargs)
+
+    async def delete_article(self, article:OwnArticle):
+        """Deletes an existing JustPaste.it page (article).
+        ### Parameters:
+            - article (OwnArticle): Article to delete"""
+
+        if article.is_in_trash:
+           warnings.warn(f"Article {article.url} is already in trash. Did you mean to restore or shred it?", UserWarning)
+
+        return await self._delete_article(article)
+
+    async def logout(self):
+
+        resp = await self.session.post(APIEndpoints.LOGOUT.value)
+        check_response(resp, APIError, "Could not logout")
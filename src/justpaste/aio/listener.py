@@ -0,0 +1,96 @@
+import asyncio
+import inspect
+
+from typing import TYPE_CHECKING, AsyncIterator, Callable
+
+from ..objects import Conversation, Message
+from ..sync import MessageStore
+from ..listener import MessageBatch, MessageListenerBase
+from ..ratelimit import Priority, request_priority
+from .sync import AsyncMessageSync
+
+if TYPE_CHECKING:
+    from . import AsyncJustpaste
+
+class AsyncMessageListener(MessageListenerBase):
+
+    """
+    asyncio counterpart of `MessageListener`.
+    Use it with `async for`, or `start()` it with a callback to run as a task.
+    """
+
+    def __init__(self, client:"AsyncJustpaste", store:MessageStore|None=None, since_start:bool=True, max_workers:int=4, **options):
+        super().__init__(**options)
+        self.sync = AsyncMessageSync(client, store)
+        self.client = client
+        self.since_start = since_start
+        self.max_workers = max_workers
+        self._stop = asyncio.Event()
+        self._task : asyncio.Task | None = None
+
+    async def _wait(self, seconds:float) -> bool:
+        # True if stop() was called while waiting
+        try:
+            await asyncio.wait_for(self._stop.wait(), seconds)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def poll(self) -> list[MessageBatch]:
+        """
+        Same as `MessageListener.poll`.
+        """
+        with request_priority(Priority.NORMAL):
+            conversations = await self.client.list_conversations(hydrate_users=False)
+        self.stats.record_poll()
+        if not self._seeded:
+            if self.since_start:
+                self.sync.seed(conversations)
+            self._seeded = True
+
+        synced = await self.sync.sync(self.max_workers, conversations)
+        # own messages count as activity even though they are not delivered
+        self._active = bool(synced)
+        if synced and self.coalesce > 0 and not await self._wait(self.coalesce):
+            synced = self.merge(synced, await self.sync.sync(self.max_workers))
+        else:
+            synced = self.merge(synced)
+
+        for _, messages in synced:
+            self.stats.record_delivery(messages)
+        return synced
+
+    async def __aiter__(self) -> AsyncIterator[MessageBatch]:
+        while not self._stop.is_set():
+            try:
+                synced = await self.poll()
+            except Exception:
+                self.stats.record_error()
+                self._active = False
+                synced = None
+            for batch in synced or ():
+                yield batch
+            await self._wait(self.next_interval(self._active))
+
+    def start(self, callback:Callable[[Conversation, list[Message]], object]) -> "AsyncMessageListener":
+        """
+        Calls `callback(conversation, messages)` for every batch from a task until `stop()`.
+        `callback` may be a coroutine function. Must be called with a running event loop.
+        """
+        async def run():
+            async for conversation, messages in self:
+                try:
+                    result = callback(conversation, messages)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    self.stats.record_error()
+
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(run())
+        return self
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None and self._task is not asyncio.current_task():
+            await self._task
@@ -0,0 +1,161 @@
+import asyncio
+
+from ..consts import *
+from ..objects import *
+from ..exceptions import *
+from ..utils import *
+from ..sync import MessageStore
+from .listener import AsyncMessageListener
+
+class AsyncMessagesMixin(AsyncJustpasteSessionProto):
+
+    async def get_messages(self, user_or_conversation:User|Conversation, before:datetime.datetime|None=None, after:datetime.datetime|None=None) -> list[Message]:
+        if isinstance(user_or_conversation, User):
+            conversation = await self.get_conversation_info(user_or_conversation)
+        elif isinstance(user_or_conversation, Conversation):
+            conversation = user_or_conversation
+
+        data = {
+            "beforeDateTime" : before.isoformat()+'Z' if before else before,
+            "afterDateTime" : after.isoformat()+'Z' if after else after
+        }
+
+        resp = await self.session.post(APIEndpoints.CONVERSATION_CHECK_MESSAGES.value.format(conversation.id), json=data)
+        check_response(resp, APIError, "Error while getting messages", (response_ok, lambda r: 'messages' in r.json()))
+
+        return [self.models.message(m) for m in resp.json()['messages']]
+
+    async def get_conversation(self, user:User, before:datetime.datetime|None=None, after:datetime.datetime|None=None):
+
+        conv = await self.get_conversation_info(user)
+        conv.messages = await self.get_messages(conv, before, after)
+        return conv
+
+    async def get_conversation_info(self, user:User) -> Conversation:
+        username = user.permalink
+        data = {"receiverPermalink":username}
+        resp = await self.session.post(APIEndpoints.CONVERSATION_NEW.value, json=data)
+        check_response(resp, APIError, "Error while getting conversation info", (response_ok, lambda r: 'conversation' in r.json()))
+        return self.models.conversation(resp.json()['conversation'], user)
+
+    async def _hydrate_users(self, profiles:list[tuple[str, str]], load_article_previews:bool=True, max_workers:int=4) -> list[User]:
+        # `profiles` are (permalink, url) pairs, only users missing from the cache are fetched
+        missing = {
+            permalink : url
+            for permalink, url in profiles
+            if not self._user_cached(permalink, load_article_previews)
+        }
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch(url:str) -> User:
+            async with semaphore:
+                return await self.user_from_url(url, load_article_previews)
+
+        users = await asyncio.gather(*(fetch(url) for url in missing.values()))
+        for permalink, user in zip(missing, users):
+            self.user_cache[permalink] = (user, load_article_previews)
+
+        return [self.user_cache[permalink][0] for permalink, _ in profiles]
+
+    def _user_cached(self, permalink:str, load_article_previews:bool) -> bool:
+        cached = self.user_cache.get(permalink)
+        return cached is not None and (cached[1] or not load_article_previews)
+
+    async def hydrate_user(self, user:User|UserShort, load_article_previews=True) -> User:
+        """
+        Turns the short user of a conversation into a full `User`. Same as `Justpaste.hydrate_user`.
+        """
+        if isinstance(user, UserShort):
+            url = str(user.user_link)
+        else:
+            url = str(user.url)
+        return (await self._hydrate_users([(user.permalink, url)], load_article_previews))[0]
+
+    async def list_conversations(self, preload=False, hydrate_users=True, load_article_previews=True, max_workers:int=4) -> list[Conversation]:
+        """
+        Lists conversations. Takes the same parameters as `Justpaste.list_conversations`.
+        """
+
+        resp = await self.session.post(APIEndpoints.CONVERSATIONS_LIST.value, json={})
+        check_response(resp,
+                       APIError,
+                       "Error while getting conversations list",
+                       (response_ok, lambda r: 'conversations' in r.json()))
+
+        conversations = resp.json()['conversations']
+
+        if hydrate_users:
+            users = await self._hydrate_users(
+                [(c['interlocutor']['permalink'], c['interlocutor']['url']) for c in conversations],
+                load_article_previews,
+                max_workers)
+        else:
+            users = [self.models.interlocutor(c['interlocutor']) for c in conversations]
+
+        return [self.models.conversation(c, user) for c, user in zip(conversations, users)]
+
+    def listen(self, callback=None, store:MessageStore|None=None, since_start=True, min_interval:float=2.0, max_interval:float=30.0, coalesce:float=0.5, include_own=False) -> AsyncMessageListener:
+        """
+        Listens for new messages. Takes the same parameters as `Justpaste.listen`.
+        Use the listener with `async for`, or pass a callback (plain or coroutine function) to run it as a task.
+        """
+        listener = AsyncMessageListener(
+            self, store, since_start,
+            min_interval=min_interval, max_interval=max_interval, coalesce=coalesce, include_own=include_own)
+        if callback is not None:
+            listener.start(callback)
+        return listener
+
+    async def send_message(self, user:User, message:str):
+
+        data = {"receiverPermalink":user.permalink, "message":message}
+
+        resp = await self.session.post(APIEndpoints.SEND_MESSAGE.value, json=data)
+        check_response(resp,
+                        APIError,
+                        f"Error while trying to send \"{message}\" to @{user.permalink}",
+                        (response_ok, lambda r: 'success' in r.json() and r.json()['success']))
+
+    async def mute_conversation(self, conversation:Conversation):
+        data = {'muted': True}
+
+        resp = await self.session.post(APIEndpoints.CONVERSATION_MUTE.value.format(conversation.id), json=data)
+        check_response(resp, APIError, f"Error while trying to mute the conversation with @{conversation.user.permalink}")
+
+    async def unmute_conversation(self, conversation:Conversation):
+        data = {'muted': False}
+
+        resp = await self.session.post(APIEndpoints.CONVERSATION_MUTE.value.format(conversation.id), json=data)
+        check_response(resp, APIError, f"Error while trying to unmute the conversation with @{conversation.user.permalink}")
+
+    async def star_conversation(self, conversation:Conversation):
+        data = {'star': True}
+
+        resp = await self.session.post(APIEndpoints.CONVERSATION_STAR.value.format(conversation.id), json=data)
+        check_response(resp, APIError, f"Error while trying to star the conversation with @{conversation.user.permalink}")
+
+    async def unstar_conversation(self, conversation:Conversation):
+        data = {'star': False}
+
+        resp = await self.session.post(APIEndpoints.CONVERSATION_STAR.value.format(conversation.id), json=data)
+        check_response(resp, APIError, f"Error while trying to unstar the conversation with @{conversation.user.permalink}")
+
+    async def add_to_contacts(self, user:User):
+        """
+        Adds user to contacts
+        ### Parameters:
+        - user: User object
+        """
+        payl = {"premiumUserId":user.id}
+        resp = await self.session.post(APIEndpoints.ADD_TO_CONTACTS.value, json=payl)
+        check_response(resp, APIError, f"Error while trying to add @{user.permalink} to contacts")
+
+    async def remove_from_contacts(self, user:User):
+        """
+        Removes user from contacts
+        ### Parameters:
+        - user: User object
+        """
+        resp = await self.session.post(APIEndpoints.DELETE_FROM_CONTACTS.value.format(user.id))
+        check_response(resp, APIError, f"Error while trying to remove @{user.permalink} from contacts")
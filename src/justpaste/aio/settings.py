@@ -0,0 +1,80 @@
+import asyncio
+
+from ..consts import *
+from ..utils import *
+from ..exceptions import *
+from ..settings import SettingsStore, SETTINGS_PAGES, SETTINGS_SAVE_ENDPOINTS
+
+class AsyncSettingsMixin(SettingsStore, AsyncJustpasteSessionProto):
+
+    async def change_password(self, new_password:str):
+        form = {
+            "oldPassword":self.password,
+            "newPassword":new_password,
+            "newPasswordRepeat":new_password
+        }
+
+        resp = await self.session.post(APIEndpoints.CHANGE_PASSWORD.value, json=form)
+        check_response(resp, APIError, "Could not change password")
+
+        self.password = new_password
+        await self._login()
+
+    async def _change_setting(self, category:Literal['profile', 'notes', 'notification', 'privacy'], pairs:dict[str, Any]):
+
+        if category == "profile":
+            files, form = self._profile_form(pairs)
+
+            resp = await self.session.post(APIEndpoints.PROFILE_SETTINGS_SAVE.value, files=files)
+            check_response(resp, APIError, "Error while updating profile settings", (response_ok, lambda r: r.json()['success']), include_request=False)
+
+            self.settings['profile'] = without_key(form, 'removeBackground')
+
+        else:
+            if category not in SETTINGS_SAVE_ENDPOINTS:
+                raise ValueError(category + ' is not a valid settings category')
+
+            self.settings[category].update(pairs)
+            url = SETTINGS_SAVE_ENDPOINTS[category].value
+
+            resp = await self.session.post(url, json=self.settings[category])
+            check_response(resp, APIError, f"Error while updating {category} settings", (response_ok, lambda r: r.json()['success']))
+
+    async def get_settings(self, mode:Literal['profile', 'notes', 'notification', 'privacy']):
+        if mode not in SETTINGS_PAGES:
+            raise ValueError(f"{mode} is not a valid settings category")
+
+        endpoint, pattern = SETTINGS_PAGES[mode]
+        resp = await self.session.get(endpoint.value)
+        check_response(resp, APIError, "Failed to fetch settings")
+        return load_window_assignment(resp.text, pattern)
+
+    async def load_all_settings(self):
+        """
+        Fetches every settings category. The pages are requested concurrently.
+        """
+        await self._ensure_settings_loaded([*self.settings])
+
+    async def _ensure_settings_loaded(self, categories:Iterable[str]):
+        missing = [c for c in categories if c not in self.loaded_settings]
+        if not missing:
+            return
+        for setting, defaults in zip(missing, await asyncio.gather(*(self.get_settings(c) for c in missing))):
+            self._store_settings(setting, defaults)
+
+        self._build_category_map()
+
+    async def change_settings(self, pairs:dict[str, Any], /):
+        """
+        Changes the dict keys with dict values inside the given list.
+        Takes the same keys as `Justpaste.change_settings`.
+        """
+        if "password" in pairs:
+            await self.change_password(pairs["password"])
+            pairs = without_key(pairs, "password")
+
+        settings_to_update = self._group_settings(pairs)
+        await self._ensure_settings_loaded(settings_to_update)
+
+        for category, mapping in settings_to_update.items():
+            await self._change_setting(category, mapping)
@@ -0,0 +1,44 @@
+import asyncio
+
+from typing import TYPE_CHECKING
+
+from ..objects import Conversation, Message
+from ..sync import MessageStore, MessageSyncBase, Watermark
+from ..ratelimit import Priority, request_priority
+
+if TYPE_CHECKING:
+    from . import AsyncJustpaste
+
+class AsyncMessageSync(MessageSyncBase):
+
+    """
+    asyncio counterpart of `MessageSync`.
+    """
+
+    def __init__(self, client:"AsyncJustpaste", store:MessageStore|None=None):
+        super().__init__(store)
+        self.client = client
+
+    async def sync(self, max_workers:int=4, conversations:list[Conversation]|None=None) -> list[tuple[Conversation, list[Message]]]:
+        """
+        Syncs every changed conversation. Same as `MessageSync.sync`.
+        """
+        if conversations is None:
+            with request_priority(Priority.NORMAL):
+                conversations = await self.client.list_conversations(hydrate_users=False)
+        changed = self.changed(conversations)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch(conversation:Conversation, watermark:Watermark|None) -> list[Message]:
+            with request_priority(Priority.NORMAL):
+                async with semaphore:
+                    return await self.client.get_messages(conversation, after=watermark.message_date if watermark else None)
+
+        fetched = await asyncio.gather(*(fetch(c, w) for c, w in changed))
+
+        synced = []
+        for (conversation, watermark), messages in zip(changed, fetched):
+            new = self.apply(conversation, watermark, messages)
+            if new:
+                synced.append((conversation, new))
+        return synced
@@ -1,25 +1,137 @@
 import requests
 import re
 import json
-from bs4 import BeautifulSoup
-from tqdm import tqdm
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 import warnings
+from typing import TYPE_CHECKING
 
 from .consts import *
 from .exceptions import *
 from .objects import *
 from .utils import *
+from .sessions import SessionStore, LoginGenerationAdapter, dump_cookies, load_cookies
+from .cache import PageCache
+from .ratelimit import RequestScheduler, Priority, request_priority
+from .retry import RetryPolicy, retry_safe
+from .connections import ConnectionOptions
+
+if TYPE_CHECKING:
+    from .export import ArticleExport
+
+def check_login_response(resp) -> None:
+    data = resp.json()
+
+    if "success" in data:
+        if data["success"]:
+            return
+    if "password" in data:
+        if data["email"] == "userNotFound":
+            raise UserNotFound("User not found.", response=resp)
+        if data["password"] == "invalidPassword":
+            raise InvalidPassword("Invalid password.", response=resp)
+        elif data["password"] == "wrongLengthMin":
+            raise PasswordTooShort("Password is too short.", response=resp)
+
+    raise APIError("Unknown Error", response=resp)
+
+def is_unauthenticated(resp:requests.Response) -> bool:
+    # an expired session either gets a 401 from the API or is redirected to the login page.
+    # response hooks run on every hop before `history` is set, so the redirect itself has to be recognised
+    if resp.status_code == 401:
+        return True
+    if resp.is_redirect:
+        return urlparse(resp.headers['Location']).path.startswith("/login")
+    return bool(resp.history) and urlparse(str(resp.url)).path.startswith("/login")
 
 class JustpasteBase:
 
-    def __init__(self, email:str|None=None, password:str|None=None, session:requests.Session|None=None):
+    def __init__(self, email:str|None=None, password:str|None=None, session:requests.Session|None=None, session_store:SessionStore|None=None, cache:PageCache|None=None, scheduler:RequestScheduler|None=None, retry:RetryPolicy|None=None, connections:ConnectionOptions|None=None, models:Literal['validated', 'trusted', 'lite']='validated', qr_codes:Literal['lazy', 'drop']='lazy'):
+        if models not in MODEL_INITIALIZERS:
+            raise ValueError(f"Unknown models {models!r}")
         self.email = email
         self.password = password
-        self.session = self._login(session)
+        self.models = MODEL_INITIALIZERS[models]
+        if qr_codes == 'drop':
+            self.models = self.models.without_qr_codes()
+        self.cache = cache
+        self.scheduler = scheduler
+        self.retry = retry
+
+        # installed before logging in, so the login request is limited and retried too
+        if scheduler is not None or retry is not None or connections is not None:
+            session = session if session else requests.Session()
+        if connections is not None:
+            connections.install(session)
+        if scheduler is not None:
+            scheduler.install(session)
+        if retry is not None:
+            # outside the rate limiter, so every attempt waits for a token
+            retry.install(session)
+
+        self.session_store = session_store
+        self.session_state = session_store.load(email) if session_store is not None and email else None
+
+        if self.session_state is not None:
+            self.user_agent : str = self.session_state["user_agent"]
+            self.session = self._restore_session(session, self.session_state)
+        else:
+            self.user_agent = get_user_agent()
+            self.session = self._login(session)
+
         self.session.headers['accept'] = "application/json, text/plain, */*"
 
+        if session_store is not None and self.email and self.password:
+            self._login_lock = threading.RLock()
+            self._login_generation = 0
+            for prefix in (ROOT, MESSAGE_API_ROOT):
+                self.session.mount(prefix, LoginGenerationAdapter(self.session.get_adapter(prefix), self))
+            self.session.hooks['response'].append(self._relogin_if_unauthenticated)
+
+    def _restore_session(self, session:requests.Session|None, state:dict[str, Any]) -> requests.Session:
+        # trust the stored cookies until a request says otherwise
+        sess = session if session else requests.Session()
+        sess.headers["User-Agent"] = self.user_agent
+        load_cookies(sess.cookies, state["cookies"])
+        self.logged_in = True
+        return sess
+
+    def _relogin_if_unauthenticated(self, resp:requests.Response, *args, **kwargs) -> requests.Response | None:
+        if resp.request.url == APIEndpoints.LOGIN.value or not is_unauthenticated(resp):
+            return None
+
+        with self._login_lock:
+            # another thread may have logged in again since this request was sent, its cookies are just stale then
+            if getattr(resp.request, 'login_generation', self._login_generation) == self._login_generation:
+                self.session.cookies.clear()
+                self._login(self.session)
+                self._login_generation += 1
+                self.save_session()
+
+        retry = resp.request.copy()
+        retry.headers.pop('Cookie', None)
+        retry.prepare_cookies(self.session.cookies)
+        retry.hooks['response'] = []
+        return self.session.send(retry, **kwargs)
+
+    def _session_state(self) -> dict[str, Any]:
+        return {
+            "cookies" : dump_cookies(self.session.cookies),
+            "user_agent" : self.user_agent,
+        }
+
+    def save_session(self):
+        """
+        Writes the cookies, user agent and settings of this client to its session store.
+        Does nothing if the client has no store.
+        """
+        if self.session_store is not None and self.email and self.logged_in:
+            self.session_store.save(self.email, self._session_state())
+
     def _login(self, session:requests.Session|None=None) -> requests.Session:
-        headers = {"User-Agent": USER_AGENT}
+        headers = {"User-Agent": self.user_agent}
         if not session:
             sess = requests.Session()
         else:
@@ -34,39 +146,87 @@ class JustpasteBase:
                 "rememberMe":True
                 }
             resp = sess.post(APIEndpoints.LOGIN.value, json=payload)
-            data = resp.json()
-
-            if "success" in data:
-                if data["success"]:
-                    self.logged_in = True
-                    return sess
-            if "password" in data:
-                if data["email"] == "userNotFound":
-                    raise UserNotFound("User not found.", response=resp)
-                if data["password"] == "invalidPassword":
-                    raise InvalidPassword("Invalid password.", response=resp)
-                elif data["password"] == "wrongLengthMin":
-                    raise PasswordTooShort("Password is too short.", response=resp)
-
-            raise APIError("Unknown Error", response=resp)
+            check_login_response(resp)
+            self.logged_in = True
+            return sess
         
         else:
             self.logged_in = False
             
             return sess
 
+    def _get_cached(self, url:str, model_key:str, exc:type[APIError], message:str, build:Callable[[str], T]) -> T:
+        # fetches `url` and builds a model from its source, going through the page cache if there is one
+        if self.cache is None:
+            resp = self.session.get(url)
+            check_response(resp, exc, message)
+            return build(resp.text)
+
+        entry, fresh = self.cache.lookup(url)
+        if not fresh:
+            resp = self.session.get(url, headers=entry.conditional_headers() if entry is not None else None)
+            if entry is not None and resp.status_code == 304:
+                self.cache.refresh(entry)
+            else:
+                check_response(resp, exc, message)
+                entry = self.cache.put(url, resp)
+
+        if model_key not in entry.models:
+            entry.models[model_key] = build(entry.text)
+
+        # callers get their own copy so they can't change what is cached
+        return entry.models[model_key].model_copy(deep=True)
+
+    def _public_previews_parser(self, *page_sources:str|ParsedPage) -> Generator[PublicArticlePreview, None, None]:
+        return extract_public_article_previews(*page_sources, initializer=self.models)
+
+    def _previews_parser(self, *page_sources:str|ParsedPage) -> Generator[ArticlePreview, None, None]:
+        return extract_article_previews(*page_sources, initializer=self.models)
+
+    def _invalidate_article(self, article:Article|OwnArticle):
+        if self.cache is not None:
+            self.cache.invalidate(str(article.url), article.id)
+
     def _load_content_dynamic(self, article_id:int) -> str:
         resp = self.session.post(APIEndpoints.ARTICLE_DYNAMIC.value, json={'articleId':article_id})
         check_response(resp, APIError, "Error while getting dynamic content", (lambda r: r.ok, lambda r: r.json().get('action', None) == 'display'))
 
         return resp.json()['articleContent']
 
+    def _send_page(self, prep:requests.PreparedRequest) -> requests.Response:
+        with request_priority(Priority.BULK):
+            return self.session.send(prep, verify=False)
+
+    def _send_pages(self, prepared_requests:list[requests.PreparedRequest], max_workers:int=1) -> Generator[requests.Response, None, None]:
+        # yields responses in the order of the given requests, keeping at most `max_workers` of them in flight
+        if max_workers <= 1:
+            for prep in prepared_requests:
+                yield self._send_page(prep)
+            return
+
+        executor = ThreadPoolExecutor(max_workers, thread_name_prefix="justpaste-page")
+        remaining = iter(prepared_requests)
+        in_flight : deque[Future[requests.Response]] = deque(
+            executor.submit(self._send_page, prep) for prep in itertools.islice(remaining, max_workers)
+            )
+        try:
+            while in_flight:
+                resp = in_flight.popleft().result()
+                for prep in itertools.islice(remaining, 1):
+                    in_flight.append(executor.submit(self._send_page, prep))
+                yield resp
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def _paginate_raw(self, 
                       start_url:str, 
-                      parser:Callable[[Unpack[tuple[str, ...]]], Generator[T, None, None]], 
+                      parser:Callable[[Unpack[tuple[str|ParsedPage, ...]]], Generator[T, None, None]], 
                       page_buffer:int=1, 
-                      first_page_source:str|None=None, 
-                      total_pages:int|None=None):
+                      first_page_source:str|ParsedPage|None=None, 
+                      total_pages:int|None=None,
+                      max_workers:int=1):
+
+        from tqdm import tqdm
         
         if first_page_source is not None:
             first_page = first_page_source
@@ -78,22 +238,26 @@ class JustpasteBase:
         if total_pages is not None:
             total = total_pages
         else:
-            total = json.loads(scrape_from_script_tags(RegexPatterns.PAGINATION.value, first_page).group(1))['totalPages']
+            total = extract_pagination(first_page)['totalPages']
 
         if total > 1:
             prepared_requests = [self.session.prepare_request(requests.Request('GET', f"{start_url}/{i}")) for i in range(2, total+1)]
             buf_counter = 1
             buffer_pages = [first_page]
-            for prep in (pbar := tqdm(prepared_requests, desc="Getting pages", unit='page', leave=False)):
+            responses = self._send_pages(prepared_requests, max_workers)
+            try:
+                for prep in (pbar := tqdm(prepared_requests, desc="Getting pages", unit='page', leave=False)):
 
-                if buf_counter % page_buffer == 0:
-                    yield from parser(*buffer_pages)
-                    buffer_pages.clear()
+                    if buf_counter % page_buffer == 0:
+                        yield from parser(*buffer_pages)
+                        buffer_pages.clear()
 
-                resp = self.session.send(prep, verify=False)
-                check_response(resp, APIError, f"Error while fetching page number {buf_counter+1}")
-                buffer_pages.append(resp.text)
-                buf_counter += 1
+                    resp = next(responses)
+                    check_response(resp, APIError, f"Error while fetching page number {buf_counter+1}")
+                    buffer_pages.append(resp.text)
+                    buf_counter += 1
+            finally:
+                responses.close()
 
             if len(buffer_pages) > 0:
                 yield from parser(*buffer_pages)
@@ -101,12 +265,13 @@ class JustpasteBase:
         elif total == 1:
             yield from parser(first_page)
 
-    def _new_article(self, **kwargs) -> OwnArticle:
+    def _allocate_article(self) -> tuple[int, str]:
         new_article_resp = self.session.post(APIEndpoints.NEW_ARTICLE.value, json={})
         check_response(new_article_resp, ArticleError, "Error while getting new article editor page")
         new_article = new_article_resp.json()
-        article_id = new_article["article"]['id']
-        secure_code = new_article['article']['secureCode']
+        return new_article["article"]['id'], new_article['article']['secureCode']
+
+    def _save_new_article(self, article_id:int, secure_code:str, **kwargs) -> dict[str, Any]:
         kwargs['logged_in'] = self.logged_in
 
         if kwargs.get('privacy', None) is None:
@@ -122,18 +287,47 @@ class JustpasteBase:
 
         check_response(resp, CaptchaRequired, "Captcha verification while creating article", (lambda r: r.ok, lambda r: r.json().get('action', None) != 'captcha'))
         check_response(resp, ArticleError, "Error while creating article", (lambda r: r.ok, lambda r: r.json().get('action', None) == 'redirect'))
-        
+
+        ret_data['visibilityLevel'] = kwargs['privacy']
+        return ret_data
+
+    def _new_article(self, **kwargs) -> OwnArticle:
+        article_id, secure_code = self._allocate_article()
+        ret_data = self._save_new_article(article_id, secure_code, **kwargs)
         return self.article_from_url(ROOT+ret_data['url']) #type: ignore
 
+    def _publish(self, result:PublishResult, allocation:"Future[tuple[int, str]]", refetch:bool) -> PublishResult:
+        with request_priority(Priority.BULK):
+            try:
+                result.article_id, result.secure_code = allocation.result()
+                ret_data = self._save_new_article(result.article_id, result.secure_code, **result.spec)
+                if refetch:
+                    result.article = self.article_from_url(ROOT+ret_data['url']) #type: ignore
+                else:
+                    result.article = PublishedArticle(
+                        id=result.article_id,
+                        secure_code=result.secure_code,
+                        url=ROOT+ret_data['url'],
+                        title=result.spec.get('title', ''),
+                        visibility_level=ret_data['visibilityLevel'])
+            except Exception as e:
+                result.error = e
+        return result
+
+    def _allocate_bulk(self) -> tuple[int, str]:
+        with request_priority(Priority.BULK):
+            return self._allocate_article()
+
     def _delete_article(self, article:OwnArticle):
 
         if not article.is_owner:
             raise ArticleError("Can't delete someone else's article")
 
         resp = self.session.post(APIEndpoints.DELETE_ARTICLE.value.format(article.id, article.secure_code))
+        self._invalidate_article(article)
         check_response(resp, ArticleError, "Error while deleting article", (lambda r: resp.ok, lambda r: r.json()['status'] == "success"))
 
-    def _edit_article(self, article:OwnArticle, /, **kwargs):
+    def _edit_article(self, article:OwnArticle, /, refetch:bool=True, **kwargs):
 
         if not article.is_owner:
             raise ArticleError("Can't edit someone else's article")
@@ -148,13 +342,19 @@ class JustpasteBase:
         resp = self.session.post(APIEndpoints.EXISTING_ARTICLE.value, json=article_properties)
         check_response(resp, APIError, "Requesting edit info failed")
 
-        new_body = copy_save_json(resp.json(), kwargs).model_dump()
+        saved = copy_save_json(resp.json(), kwargs)
 
-        resp = self.session.post(APIEndpoints.SAVE_ARTICLE.value, json=new_body)
+        # overwrites the same article, so a retry can't save it twice
+        with retry_safe():
+            resp = self.session.post(APIEndpoints.SAVE_ARTICLE.value, json=saved.model_dump())
+        self._invalidate_article(article)
         check_response(resp, CaptchaRequired, "Captcha verification while editing article", (lambda r: r.ok, lambda r: r.json().get('action', None) != 'captcha'))
         check_response(resp, ArticleError, "Error while editing article", (lambda r: r.ok, lambda r: r.json().get('action', None) == 'redirect'))
 
-        return self.article_from_url(ROOT+resp.json()['url'])
+        url = ROOT+resp.json()['url']
+        if refetch:
+            return self.article_from_url(url)
+        return patch_article(article, saved, url, lambda: self.article_from_url(url)) #type: ignore
 
     def article_from_url(self, url:str) -> Article | OwnArticle:
         """
@@ -169,14 +369,16 @@ class JustpasteBase:
         Raises:
             ArticleError: Failed to get the article.
         """
-        resp = self.session.get(url)
-        check_response(resp, ArticleError, f"Error while getting article")
-        try:
-            return extract_article(url, resp.text)
-        except RequireDynamicLoading as e:
-            return extract_article(url, resp.text, self._load_content_dynamic(e.article_id))
+        def build(page_source:str) -> Article | OwnArticle:
+            page = ParsedPage(page_source)
+            try:
+                return extract_article(url, page, initializer=self.models)
+            except RequireDynamicLoading as e:
+                return extract_article(url, page, self._load_content_dynamic(e.article_id), self.models)
+
+        return self._get_cached(url, "article", ArticleError, f"Error while getting article", build)
 
-    def get_public_article_previews(self, user:User, pages:int|None=None, page_buffer:int=1, first_page_source:str|None=None):
+    def get_public_article_previews(self, user:User, pages:int|None=None, page_buffer:int=1, first_page_source:str|ParsedPage|None=None, max_workers:int=1):
         """
         Get Public Profile Article Previews
 
@@ -184,7 +386,8 @@ class JustpasteBase:
             user: Target user to get article previews of
             pages: No. of pages to scrape. Default: None (All pages)
             page_buffer: No. of pages to buffer before yielding. Default: 1
-            first_page_source: Raw HTML of user profile. Default: None
+            first_page_source: Raw HTML or ParsedPage of user profile. Default: None
+            max_workers: Max. no. of pages fetched concurrently. Default: 1 (sequential)
         
         Yields:
             PublicArticlePreview
@@ -201,14 +404,14 @@ class JustpasteBase:
             check_response(resp, APIError, "Error while getting user profile URL: "+ user_profile_url)
             first_page = resp.text
 
-        total_pages : int = json.loads(scrape_from_script_tags(RegexPatterns.PAGINATION.value, first_page, 1).group(1))['totalPages']
+        total_pages : int = extract_pagination(first_page)['totalPages']
         if pages is None or pages > total_pages:
             pages = total_pages
             
 
-        return self._paginate_raw(user_profile_url, extract_public_article_previews, page_buffer, first_page, pages)
+        return self._paginate_raw(user_profile_url, self._public_previews_parser, page_buffer, first_page, pages, max_workers)
 
-    def get_own_article_previews(self, trash=False, pages:int|None=None, page_buffer:int=1, first_page_source:str|None=None):
+    def get_own_article_previews(self, trash=False, pages:int|None=None, page_buffer:int=1, first_page_source:str|ParsedPage|None=None, max_workers:int=1):
 
         """
         Get Own Article previews
@@ -217,7 +420,8 @@ class JustpasteBase:
             trash: Get the trashed notes instead of active ones. Default: False
             pages: No. of pages to scrape. Default: None (All pages)
             page_buffer: No. of pages to buffer before yielding. Default: 1
-            first_page_source: Raw HTML of user profile. Default: None
+            first_page_source: Raw HTML or ParsedPage of user profile. Default: None
+            max_workers: Max. no. of pages fetched concurrently. Default: 1 (sequential)
         
         Yields:
             PublicArticlePreview
@@ -235,15 +439,22 @@ class JustpasteBase:
         if first_page_source is not None:
             first_page = first_page_source
         else:
-            resp = self.session.get(url)
-            check_response(resp, APIError, "Error while getting notes: "+ url)
-            first_page = resp.text
+            first_page = self._own_previews_page(trash)
 
-        total_pages = json.loads(scrape_from_script_tags(RegexPatterns.PAGINATION.value, first_page, 5).group(1))['totalPages']
+        total_pages = extract_pagination(first_page)['totalPages']
         if pages is None or pages > total_pages:
             pages = total_pages
 
-        return self._paginate_raw(url, extract_article_previews, page_buffer, first_page, pages)
+        return self._paginate_raw(url, self._previews_parser, page_buffer, first_page, pages, max_workers)
+
+    def _own_previews_page(self, trash:bool=False, number:int=1) -> str:
+        # source of page `number` of the notes or the trash, e.g. for `get_own_article_previews(first_page_source=...)`
+        url = APIEndpoints.TRASH.value if trash else APIEndpoints.NOTES.value
+        if number > 1:
+            url = f"{url}/{number}"
+        resp = self.session.get(url)
+        check_response(resp, APIError, "Error while getting notes: "+ url)
+        return resp.text
 
     def load_article_from_preview(self, preview:PublicArticlePreview | ArticlePreview) -> Article | OwnArticle:
 
@@ -259,6 +470,87 @@ class JustpasteBase:
 
         return self.article_from_url(str(preview.url))
 
+    def load_articles_from_previews(self, previews:Iterable[PublicArticlePreview | ArticlePreview], max_workers:int=4) -> Generator[tuple[PublicArticlePreview | ArticlePreview, Article | OwnArticle | Exception], None, None]:
+
+        """
+        Load many articles from their previews concurrently.
+
+        Args:
+            previews: Any article previews
+            max_workers: Max. no. of articles fetched at the same time. Default: 4
+
+        Yields:
+            (preview, article) pairs in completion order. If loading an article failed, \
+            the exception takes the place of the article and the rest of the batch carries on.
+        """
+
+        def load(preview:PublicArticlePreview | ArticlePreview) -> Article | OwnArticle:
+            with request_priority(Priority.BULK):
+                return self.load_article_from_preview(preview)
+
+        executor = ThreadPoolExecutor(max_workers, thread_name_prefix="justpaste-article")
+        remaining = iter(previews)
+        pending : dict[Future[Article | OwnArticle], PublicArticlePreview | ArticlePreview] = {}
+        try:
+            for preview in itertools.islice(remaining, max_workers):
+                pending[executor.submit(load, preview)] = preview
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    preview = pending.pop(future)
+                    for next_preview in itertools.islice(remaining, 1):
+                        pending[executor.submit(load, next_preview)] = next_preview
+
+                    try:
+                        yield preview, future.result()
+                    except Exception as e:
+                        yield preview, e
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def export_articles(self, path:str, max_workers:int=4, trash:bool=True, checkpoint_path:str|None=None) -> "ArticleExport":
+
+        """
+        Export every own article to a JSONL file, resuming from the checkpoint of an earlier run.
+
+        Args:
+            path: JSONL file to write, one article per line
+            max_workers: Max. no. of articles fetched at the same time. Default: 4
+            trash: Export the trashed notes as well. Default: True
+            checkpoint_path: Where progress is saved. Default: None (`path` + ".checkpoint.json")
+
+        Returns:
+            ArticleExport, iterate over it or call `run()` to start the export
+        """
+
+        from .export import ArticleExport
+        return ArticleExport(self, path, checkpoint_path, max_workers, trash)
+
+    def _public_articles(self, user:User, first_page:str|ParsedPage) -> PagedSequence[PublicArticlePreview]:
+        user_profile_url = str(user.url)
+
+        def load_page(number:int) -> list[PublicArticlePreview]:
+            resp = self.session.get(f"{user_profile_url}/{number}")
+            check_response(resp, APIError, f"Error while fetching page number {number}")
+            return [*extract_public_article_previews(resp.text, initializer=self.models)]
+
+        def load_pages(numbers:list[int], max_workers:int) -> Generator[tuple[int, list[PublicArticlePreview]], None, None]:
+            prepared_requests = [self.session.prepare_request(requests.Request('GET', f"{user_profile_url}/{n}")) for n in numbers]
+            responses = self._send_pages(prepared_requests, max_workers)
+            try:
+                for number, resp in zip(numbers, responses):
+                    check_response(resp, APIError, f"Error while fetching page number {number}")
+                    yield number, [*extract_public_article_previews(resp.text, initializer=self.models)]
+            finally:
+                responses.close()
+
+        return PagedSequence(
+            [*extract_public_article_previews(first_page, initializer=self.models)],
+            extract_pagination(first_page)['totalPages'],
+            load_page,
+            load_pages)
+
     def user_from_url(self, user_profile_url:str, load_article_previews=True) -> User:
 
         """
@@ -269,24 +561,29 @@ class JustpasteBase:
             load_article_previews: Load article previews into the object. Default=True
         
         Returns:
-            User object
+            User object. `public_articles` holds the previews on the profile page, later pages are downloaded \
+            as they are iterated over or indexed. Call `user.public_articles.load_all(max_workers)` to load them all at once.
 
         """
 
-        resp = self.session.get(user_profile_url)
-        check_response(resp, APIError, "Error while getting user profile URL: "+ user_profile_url)
-        profile_page = resp.text
-        user = extract_user(profile_page, [])
-        
-        if load_article_previews:
-            public_articles = [*self.get_public_article_previews(user, None, 3, profile_page)]
-            user.public_articles = public_articles
-        
-        return user
+        def build(profile_page:str) -> User:
+            user = extract_user(profile_page, [], self.models)
+            
+            if load_article_previews:
+                user.public_articles = self._public_articles(user, profile_page)
+            
+            return user
+
+        return self._get_cached(user_profile_url, 
+                                "user+previews" if load_article_previews else "user", 
+                                APIError, 
+                                "Error while getting user profile URL: "+ user_profile_url, 
+                                build)
         
     def shred_article(self, article:OwnArticle):
         
         resp = self.session.post(APIEndpoints.SHRED_ARTICLE.value.format(article.id, article.secure_code))
+        self._invalidate_article(article)
         check_response(resp, 
                        ArticleError, 
                        "Error while trying to shred article", 
@@ -295,6 +592,7 @@ class JustpasteBase:
     def restore_article(self, article:OwnArticle):
         
         resp = self.session.post(APIEndpoints.RESTORE_ARTICLE.value.format(article.id, article.secure_code))
+        self._invalidate_article(article)
         check_response(resp, 
                        ArticleError, 
                        "Error while trying to restore article", 
@@ -332,11 +630,11 @@ class JustpasteBase:
 
     def unfavorite_article(self, article:Article|OwnArticle):
         """
-        Adds article to favorites
+        Removes article from favorites
         ### Parameters:
         - article (Article|OwnArticle): Article
         """
-        resp = self.session.post(APIEndpoints.FAVORITE_ARTICLE.value.format(article.id))
+        resp = self.session.post(APIEndpoints.UNFAVORITE_ARTICLE.value.format(article.id))
         check_response(resp, ArticleError, "Error while trying to unfavorite article")
 
     def get_subscribed_articles(self) -> list[PublicArticlePreview]:
@@ -347,7 +645,7 @@ class JustpasteBase:
         resp = self.session.get(APIEndpoints.SUBSCRIBED.value)
         check_response(resp, APIError, "Error while getting subscribed accounts")
 
-        return [*extract_public_article_previews(resp.text)]
+        return [*extract_public_article_previews(resp.text, initializer=self.models)]
     
     def get_total_stats(self):
         """
@@ -356,7 +654,7 @@ class JustpasteBase:
         resp = self.session.get(APIEndpoints.STATS.value)
         check_response(resp, APIError, "Error while getting stats page")
 
-        return extract_total_stats(resp.text)
+        return extract_total_stats(resp.text, self.models)
 
 
     def new_article(self, **kwargs):
@@ -384,11 +682,61 @@ class JustpasteBase:
 
         return self._new_article(**kwargs)
 
-    def edit_article(self, article:OwnArticle, /, **kwargs):
+    def new_articles(self, specs:Iterable[dict[str, Any]], max_workers:int=4, max_allocations:int|None=None, refetch:bool=False) -> Generator[PublishResult, None, None]:
+
+        """
+        Publishes many articles. Ids are allocated ahead on their own threads while earlier articles are being saved.
+
+        Args:
+            specs: `new_article` keyword arguments for each article
+            max_workers: Max. no. of articles saved at the same time. Default: 4
+            max_allocations: Max. no. of ids allocated at the same time. Default: None (same as max_workers)
+            refetch: Load every published article as an `OwnArticle`. If False, a `PublishedArticle` \
+            is built from the save response and no extra request is made. Default: False
+
+        Yields:
+            PublishResult for every spec in completion order, `index` is its position in `specs`. \
+            A failed item carries the exception and the rest of the batch carries on. \
+            If saving failed after an id was allocated, the result has its `article_id` and `secure_code`.
+        """
+
+        max_allocations = max_allocations or max_workers
+        allocator = ThreadPoolExecutor(max_allocations, thread_name_prefix="justpaste-allocate")
+        saver = ThreadPoolExecutor(max_workers, thread_name_prefix="justpaste-publish")
+        # allocate at most one window ahead of the saves, so an interrupted batch leaves few empty articles
+        window = max_workers + max_allocations
+        remaining = enumerate(specs)
+        pending : set[Future[PublishResult]] = set()
+
+        def submit(index:int, spec:dict[str, Any]):
+            spec = dict(spec)
+            if isinstance(spec.get('expiry_date', None), datetime.datetime):
+                spec['expiry_date'] = spec['expiry_date'].isoformat()+'Z'
+            allocation = allocator.submit(self._allocate_bulk)
+            pending.add(saver.submit(self._publish, PublishResult(index, spec), allocation, refetch))
+
+        try:
+            for index, spec in itertools.islice(remaining, window):
+                submit(index, spec)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    for index, spec in itertools.islice(remaining, 1):
+                        submit(index, spec)
+                    yield future.result()
+        finally:
+            allocator.shutdown(wait=False, cancel_futures=True)
+            saver.shutdown(wait=False, cancel_futures=True)
+
+    def edit_article(self, article:OwnArticle, /, refetch:bool=True, **kwargs):
 
         """Edits an existing JustPaste.it page (article).
         ### Parameters:
             - article (OwnArticle): Article to delete
+            - refetch (bool): Load the edited article again. If False, an `EditedArticle` patched with the submitted fields is returned, \
+            saving a request. Fields the server computes such as `modified_at` are loaded the first time they are read. Default=True
             - title (str): Title of the article.
             - body (str): Content of the article in HTML.
             - description (str): Description of the article. (deprecated in the website but still accessible by the API) Default=""
@@ -402,7 +750,7 @@ class JustpasteBase:
             - shared_users (list): If set, only the accounts that are specified will be able to see the article. Default=[] 
             - expiry_date (yyyy-mm-ddTHH-MM-SSZ format e.g: "2023-03-02T00:00:00Z"): If set, the article will be expired after given date. Default=None"""
 
-        return self._edit_article(article, **kwargs)
+        return self._edit_article(article, refetch, **kwargs)
 
     def delete_article(self, article:OwnArticle):
         """Deletes an existing JustPaste.it page (article).
@@ -419,4 +767,7 @@ class JustpasteBase:
         resp = self.session.post(APIEndpoints.LOGOUT.value)
         check_response(resp, APIError, "Could not logout")
 
+        if self.session_store is not None and self.email:
+            self.session_store.delete(self.email)
+
 
@@ -0,0 +1,121 @@
+import time
+import threading
+from collections import OrderedDict
+
+from typing import Any
+
+from requests import Response
+
+class CacheEntry:
+
+    """
+    A cached page: its source, the validators the server sent with it
+    and the models already built from it.
+    """
+
+    __slots__ = ("text", "etag", "last_modified", "stored_at", "models")
+
+    def __init__(self, text:str, etag:str|None=None, last_modified:str|None=None):
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.monotonic()
+        self.models : dict[str, Any] = {}
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class PageCache:
+
+    """
+    In-memory LRU cache of pages and the models parsed from them, keyed by URL.
+
+    Entries younger than `ttl` seconds are served without a request. Older entries are
+    revalidated with a conditional request when the server sent an ETag or Last-Modified
+    header, and downloaded again otherwise.
+    """
+
+    def __init__(self, ttl:float=300, max_entries:int=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._entries : OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url:str) -> str:
+        return str(url).rstrip('/')
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, url:str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(self.key(url))
+            if entry is not None:
+                self._entries.move_to_end(self.key(url))
+            return entry
+
+    def is_fresh(self, entry:CacheEntry) -> bool:
+        return time.monotonic() - entry.stored_at < self.ttl
+
+    def lookup(self, url:str) -> tuple[CacheEntry | None, bool]:
+        """
+        The entry for `url` and whether it can be served without a request, counted as a hit if so.
+        """
+        entry = self.get(url)
+        fresh = entry is not None and self.is_fresh(entry)
+        if fresh:
+            with self._lock:
+                self.hits += 1
+        return entry, fresh
+
+    def put(self, url:str, resp:Response) -> CacheEntry:
+        # the page was downloaded in full, so it counts as a miss
+        entry = CacheEntry(resp.text, resp.headers.get('ETag'), resp.headers.get('Last-Modified'))
+        with self._lock:
+            self.misses += 1
+            self._entries[self.key(url)] = entry
+            self._entries.move_to_end(self.key(url))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def refresh(self, entry:CacheEntry):
+        # the server answered 304 Not Modified
+        with self._lock:
+            self.revalidated += 1
+            entry.stored_at = time.monotonic()
+
+    def invalidate(self, url:str|None=None, article_id:int|None=None, model_key:str='article'):
+        """
+        Drops the entry for `url` and every entry whose `model_key` model is the article with `article_id`.
+        Only that key is looked at, since users and articles share ids.
+        """
+        with self._lock:
+            if url is not None:
+                self._entries.pop(self.key(url), None)
+            if article_id is not None:
+                for key, entry in [*self._entries.items()]:
+                    if getattr(entry.models.get(model_key), 'id', None) == article_id:
+                        del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries" : len(self._entries),
+                "hits" : self.hits,
+                "revalidated" : self.revalidated,
+                "misses" : self.misses,
+            }
@@ -0,0 +1,140 @@
+import socket
+
+from typing import Any
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from .consts import ROOT, MESSAGE_API_ROOT
+
+Timeout = float | tuple[float, float] | None
+
+class ConnectionOptions:
+
+    """
+    Connection pooling, keep-alive and timeouts for a client. justpaste.it and the message API
+    on msg.justpaste.it get an adapter, and so a connection pool, of their own.
+
+    Args:
+        pool_size: No. of per-host connection pools each adapter keeps. Default: 10
+        max_connections: Max. no. of connections kept open to a host. Size it to the no. of threads \
+        sharing the client, extra connections are opened when every kept one is busy and are closed after use. Default: 10
+        block: Wait for a kept connection to free up instead of opening extra ones. Default: False
+        keep_alive: Reuse connections between requests and enable TCP keep-alive on them, \
+        so idle connections survive NATs and proxies. False closes every connection after its response. Default: True
+        keep_alive_expiry: Seconds an idle connection is kept by the async client. Default: 30
+        timeout: Seconds to wait for the server, or a (connect, read) pair, for requests that \
+        don't set their own. None waits forever. Default: None
+    """
+
+    def __init__(self, pool_size:int=10, max_connections:int=10, block:bool=False, keep_alive:bool=True, keep_alive_expiry:float=30.0, timeout:Timeout=None):
+        self.pool_size = pool_size
+        self.max_connections = max_connections
+        self.block = block
+        self.keep_alive = keep_alive
+        self.keep_alive_expiry = keep_alive_expiry
+        self.timeout = timeout
+
+    def socket_options(self) -> list[tuple[int, int, int]]:
+        options = [*HTTPConnection.default_socket_options]
+        if self.keep_alive:
+            options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        return options
+
+    def configure(self, adapter:HTTPAdapter):
+        """
+        Rebuilds the pools of an existing `HTTPAdapter` (e.g. a custom subclass) with these options.
+        """
+        adapter._pool_connections = self.pool_size
+        adapter._pool_maxsize = self.max_connections
+        adapter._pool_block = self.block
+        adapter.poolmanager.clear()
+        adapter.init_poolmanager(self.pool_size, self.max_connections, block=self.block, socket_options=self.socket_options())
+        for manager in adapter.proxy_manager.values():
+            manager.clear()
+        adapter.proxy_manager = {}
+
+    def install(self, session:requests.Session):
+        """
+        Mounts a `PooledAdapter` for each host on `session`. Custom adapters already
+        mounted for a host are kept and have their pools rebuilt instead.
+        """
+        default = session.adapters.get("https://")
+        for prefix in (ROOT, MESSAGE_API_ROOT):
+            current = session.get_adapter(prefix)
+            if current is default and type(current) is HTTPAdapter:
+                session.mount(prefix, PooledAdapter(self))
+                continue
+            if isinstance(current, HTTPAdapter):
+                self.configure(current)
+            if self.timeout is not None:
+                session.mount(prefix, DefaultTimeoutAdapter(current, self.timeout))
+
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+
+    def httpx_transport_options(self) -> dict[str, Any]:
+        import httpx
+        return {
+            "limits" : httpx.Limits(
+                # the sync client keeps a pool per host, httpx keeps one for the whole client
+                max_connections=self.max_connections * 2,
+                max_keepalive_connections=self.max_connections * 2 if self.keep_alive else 0,
+                keepalive_expiry=self.keep_alive_expiry),
+            "socket_options" : self.socket_options(),
+        }
+
+    def httpx_client_options(self) -> dict[str, Any]:
+        import httpx
+        options : dict[str, Any] = {}
+        if self.timeout is not None:
+            if isinstance(self.timeout, tuple):
+                options["timeout"] = httpx.Timeout(self.timeout[1], connect=self.timeout[0])
+            else:
+                options["timeout"] = httpx.Timeout(self.timeout)
+        if not self.keep_alive:
+            options["headers"] = {"Connection" : "close"}
+        return options
+
+class PooledAdapter(HTTPAdapter):
+
+    """
+    `HTTPAdapter` sized by `ConnectionOptions`, with TCP keep-alive and a default timeout.
+    """
+
+    def __init__(self, options:ConnectionOptions):
+        self.options = options
+        super().__init__(options.pool_size, options.max_connections, pool_block=options.block)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault("socket_options", self.options.socket_options())
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs.setdefault("socket_options", self.options.socket_options())
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    def send(self, request:requests.PreparedRequest, **kwargs) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.options.timeout
+        return super().send(request, **kwargs)
+
+class DefaultTimeoutAdapter(BaseAdapter):
+
+    """
+    Applies `timeout` to requests sent through the wrapped adapter that don't set one.
+    """
+
+    def __init__(self, adapter:BaseAdapter, timeout:Timeout):
+        super().__init__()
+        self.adapter = adapter
+        self.timeout = timeout
+
+    def send(self, request:requests.PreparedRequest, **kwargs) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return self.adapter.send(request, **kwargs)
+
+    def close(self):
+        self.adapter.close()
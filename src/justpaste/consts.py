@@ -1,8 +1,7 @@
 from enum import Enum
+from functools import cache
 import re
 
-from random_user_agent.user_agent import UserAgent
-
 FILE_MAGIC_BYTES = {
     "png":"89504E470D0A1A0A",
     "jpg":"FFD8FF",
@@ -11,7 +10,16 @@ FILE_MAGIC_BYTES = {
 
 #USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36 OPR/94.0.0.0"
 
-USER_AGENT = UserAgent().get_random_user_agent()
+@cache
+def get_user_agent() -> str:
+    # building the UserAgent database takes seconds, so only pay for it once a session is actually made
+    from random_user_agent.user_agent import UserAgent
+    return UserAgent().get_random_user_agent()
+
+def __getattr__(name:str):
+    if name == "USER_AGENT":
+        return get_user_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 CAMEL_TO_SNAKE_REGEX = re.compile(r"([a-z]+|[A-Z][a-z]+|[A-Z]+(?=[A-Z][a-z]))+?")
 
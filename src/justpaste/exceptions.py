@@ -1,5 +1,4 @@
 from requests import Request, PreparedRequest, Response
-from colorama import Fore
 import pprint
 from typing import Callable
 
@@ -14,7 +13,8 @@ class APIError(Exception):
         self.response = response
         msg = message
         if response is not None:
-            msg += f"\nResponse Info:\nHTTP {response.status_code} ({response.reason})"
+            reason = getattr(response, 'reason', None) or getattr(response, 'reason_phrase', '')
+            msg += f"\nResponse Info:\nHTTP {response.status_code} ({reason})"
             msg += f"\nResponse Body:\n"
             try:
                 msg += pprint.pformat(response.json())
@@ -24,7 +24,7 @@ class APIError(Exception):
 
         if request is not None:
             msg += f"\nRequest Info: \nRequest URL: {request.url}"
-            msg += f"\nRequest Body:\n{request.body}" #type: ignore
+            msg += f"\nRequest Body:\n{getattr(request, 'body', None) or getattr(request, 'content', None)}"
             msg += f"\nRequest Headers:\n{pprint.pformat(request.headers)}"
 
         super().__init__(msg)
@@ -38,6 +38,8 @@ class PasswordTooShort(APIError):
 
 class CaptchaRequired(APIError):
     def __init__(self, message:str, /, request: Request | None = None, response: Response | None = None) -> None:
+        from colorama import Fore
+
         print(Fore.YELLOW + 
               "\nCaptcha required. This happens to accounts with no premium purchase history. " +
               "Once purchased, JustPaste will not ask for captcha again even after the premium expires.\n" + 
@@ -47,8 +49,18 @@ class CaptchaRequired(APIError):
 class ArticleError(APIError):
     pass
 
+class NoClientAvailable(APIError):
+    pass
+
+def response_ok(resp) -> bool:
+    # requests.Response has `ok`, httpx.Response (async client) has `is_success`
+    ok = getattr(resp, 'ok', None)
+    if ok is None:
+        return resp.is_success
+    return ok
+
 resp_conditions = (
-    lambda r: r.ok,
+    response_ok,
 )
 
 def check_response(resp:Response, exc:type[APIError], message:str, conditions:tuple[Callable[[Response], bool], ...] = resp_conditions, *, include_request=True) -> None:
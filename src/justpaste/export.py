@@ -0,0 +1,268 @@
+import os
+import json
+import logging
+import tempfile
+import argparse
+from collections import OrderedDict
+
+from typing import TYPE_CHECKING, Callable, Generator, Literal
+
+from pydantic import BaseModel
+
+from .exceptions import CaptchaRequired, NoClientAvailable
+from .objects import ArticlePreview, Article, OwnArticle
+from .ratelimit import Priority, request_priority
+from .utils import extract_pagination
+
+if TYPE_CHECKING:
+    from . import Justpaste
+
+logger = logging.getLogger(__name__)
+
+Listing = Literal['notes', 'trash']
+
+# errors that would fail every article after them as well, so the export stops on them
+FATAL_ERRORS : tuple[type[Exception], ...] = (CaptchaRequired, NoClientAvailable)
+
+class ExportCheckpoint(BaseModel):
+
+    """
+    How far an export got. `page` is the last page of `listing` whose articles are all written,
+    `done` holds the ids written from that page and the ones after it. `offset` is the size of the
+    JSONL file at that point, anything written after it is cut off when the export resumes.
+    """
+
+    listing : Listing = 'notes'
+    page : int = 0
+    done : list[int] = []
+    failed : list[int] = []
+    offset : int = 0
+    last_article_id : int | None = None
+    exported : int = 0
+    finished : bool = False
+
+class ArticleExport:
+
+    """
+    Streams every own article of an account to a JSONL file, one `OwnArticle` per line
+    (without `qr_code_data`), loading up to `max_workers` of them at the same time.
+
+    Previews are listed a page at a time and articles are written as soon as they arrive, so memory
+    stays flat however many notes there are. After every article a checkpoint is written next to the
+    file, and running the export again continues from it. A captcha stops the export, and articles that
+    failed for other reasons are tried again on the next run.
+
+    Notes created or deleted between runs shift later notes across pages. The last completed page is
+    listed again on resume to catch notes that moved up by a page.
+
+    Running a finished export again lists everything once more and appends only the articles that
+    aren't in the file yet, e.g. notes written since.
+
+    ```python
+    export = ArticleExport(jp, "backup.jsonl")
+    for preview, article in export:
+        ...
+    export.checkpoint.exported
+    ```
+    """
+
+    def __init__(self, client:"Justpaste", path:str|os.PathLike, checkpoint_path:str|os.PathLike|None=None, max_workers:int=4, trash:bool=True):
+        self.client = client
+        self.path = os.fspath(path)
+        self.checkpoint_path = os.fspath(checkpoint_path) if checkpoint_path is not None else self.path + ".checkpoint.json"
+        self.max_workers = max_workers
+        self.listings : tuple[Listing, ...] = ('notes', 'trash') if trash else ('notes',)
+        self.checkpoint = self._load_checkpoint()
+
+        # (every id, ids still loading) per listed page in listing order, and the page every loading id is on
+        self._open_pages : OrderedDict[tuple[Listing, int], tuple[set[int], set[int]]] = OrderedDict()
+        self._page_of : dict[int, tuple[Listing, int]] = {}
+        # ids on the last completed page, kept in `done` since that page is listed again on resume
+        self._closed_ids : set[int] = set()
+        self._file = None
+
+    def _load_checkpoint(self) -> ExportCheckpoint:
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return ExportCheckpoint.model_validate_json(f.read())
+        except FileNotFoundError:
+            return ExportCheckpoint()
+
+    def _save_checkpoint(self):
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.export-checkpoint-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.checkpoint.model_dump_json())
+            os.replace(tmp, self.checkpoint_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _get_page(self, listing:Listing, number:int) -> tuple[list[ArticlePreview], int]:
+        # one page at a time through the client's own listing, the checkpoint needs to know which page an article is on
+        trash = listing == 'trash'
+        with request_priority(Priority.BULK):
+            source = self.client._own_previews_page(trash, number)
+        previews = self.client.get_own_article_previews(trash, pages=1, first_page_source=source)
+        return [*previews], extract_pagination(source)['totalPages']
+
+    def _exported_ids(self) -> list[int]:
+        try:
+            with open(self.path, 'rb') as f:
+                return [json.loads(line)['id'] for line in f.read(self.checkpoint.offset).splitlines() if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _start_over(self):
+        # everything was exported, list it all again and only write the articles that aren't in the file yet
+        previous = self.checkpoint
+        logger.info("%s is already a finished export, listing every article again to add the ones written since", self.path)
+        self.checkpoint = ExportCheckpoint(
+            listing=self.listings[0],
+            done=self._exported_ids(),
+            offset=previous.offset,
+            last_article_id=previous.last_article_id,
+            exported=previous.exported)
+
+    def _previews(self) -> Generator[ArticlePreview, None, None]:
+        checkpoint = self.checkpoint
+        # an article moved to the trash during the export is listed twice, it is only exported once
+        seen = set(checkpoint.done)
+        for listing in self.listings[self.listings.index(checkpoint.listing):]:
+            # the completed page is listed again, in case notes were deleted since and moved up to it
+            number = max(checkpoint.page, 1) if listing == checkpoint.listing else 1
+            total = number
+            while number <= total:
+                previews, total = self._get_page(listing, number)
+                if number > total:
+                    # notes were deleted since and the listing got shorter than the checkpoint
+                    break
+                waiting = {p.id for p in previews if p.id not in seen}
+                seen.update(waiting)
+                self._open_pages[(listing, number)] = ({p.id for p in previews}, waiting)
+                for preview in previews:
+                    if preview.id in waiting:
+                        self._page_of[preview.id] = (listing, number)
+                        yield preview
+                self._close_pages()
+                number += 1
+
+    def _close_pages(self):
+        # moves the checkpoint past every leading page that has nothing left loading
+        checkpoint = self.checkpoint
+        while self._open_pages:
+            (listing, number), (page_ids, waiting) = next(iter(self._open_pages.items()))
+            if waiting:
+                return
+            self._open_pages.popitem(last=False)
+            checkpoint.listing, checkpoint.page = listing, number
+            checkpoint.done = [i for i in checkpoint.done if i not in self._closed_ids or i in page_ids]
+            self._closed_ids = page_ids
+            for i in page_ids:
+                self._page_of.pop(i, None)
+
+    def _record(self, preview:ArticlePreview, line:bytes|None):
+        # `line` is None if the article failed, it stays waiting so its page isn't completed
+        checkpoint = self.checkpoint
+        if line is None:
+            if preview.id not in checkpoint.failed:
+                checkpoint.failed.append(preview.id)
+            return
+
+        self._file.write(line)
+        self._file.flush()
+        checkpoint.offset = self._file.tell()
+        checkpoint.exported += 1
+        checkpoint.last_article_id = preview.id
+        checkpoint.done.append(preview.id)
+        if preview.id in checkpoint.failed:
+            checkpoint.failed.remove(preview.id)
+        self._open_pages[self._page_of[preview.id]][1].discard(preview.id)
+        self._close_pages()
+
+    def __iter__(self) -> Generator[tuple[ArticlePreview, Article | OwnArticle | Exception], None, None]:
+        """
+        Runs the export, yielding `(preview, article)` pairs as they are written, or `(preview, exception)` for failures.
+        Raises the first `CaptchaRequired` after saving the checkpoint.
+        """
+        if self.checkpoint.finished:
+            self._start_over()
+        checkpoint = self.checkpoint
+
+        mode = 'r+b' if os.path.exists(self.path) else 'wb'
+        with open(self.path, mode) as f:
+            # whatever was written after the last checkpoint is written again
+            f.truncate(checkpoint.offset)
+            f.seek(checkpoint.offset)
+            self._file = f
+            checkpoint.failed.clear()
+
+            results = self.client.load_articles_from_previews(self._previews(), self.max_workers)
+            try:
+                for preview, article in results:
+                    if isinstance(article, FATAL_ERRORS):
+                        self._save_checkpoint()
+                        raise article
+                    if isinstance(article, Exception):
+                        self._record(preview, None)
+                    else:
+                        line = article.model_dump_json(exclude={'qr_code_data'}, warnings=False) + '\n'
+                        self._record(preview, line.encode('utf-8'))
+                    self._save_checkpoint()
+                    yield preview, article
+            finally:
+                results.close()
+
+            checkpoint.finished = not checkpoint.failed and not self._open_pages
+            self._save_checkpoint()
+
+    def run(self, callback:Callable[[ArticlePreview, Article | OwnArticle | Exception], object]|None=None) -> ExportCheckpoint:
+        """
+        Runs the export to the end and returns the final checkpoint.
+        """
+        for preview, article in self:
+            if callback is not None:
+                callback(preview, article)
+        return self.checkpoint
+
+def main(argv:list[str]|None=None):
+    from getpass import getpass
+    from tqdm import tqdm
+    from . import Justpaste, FileSessionStore
+
+    parser = argparse.ArgumentParser(prog="python -m justpaste.export", description="Export every article of an account to a JSONL file. Run it again to resume.")
+    parser.add_argument("path", help="JSONL file to write")
+    parser.add_argument("--email", default=os.environ.get("JUSTPASTE_EMAIL"), help="Default: $JUSTPASTE_EMAIL")
+    parser.add_argument("--password", default=os.environ.get("JUSTPASTE_PASSWORD"), help="Default: $JUSTPASTE_PASSWORD, asked for if not set")
+    parser.add_argument("--proxy", default=None)
+    parser.add_argument("--workers", type=int, default=4, help="Articles loaded at the same time")
+    parser.add_argument("--checkpoint", default=None, help="Default: <path>.checkpoint.json")
+    parser.add_argument("--no-trash", action="store_true", help="Skip trashed articles")
+    args = parser.parse_args(argv)
+
+    if not args.email:
+        parser.error("an account is needed, pass --email or set JUSTPASTE_EMAIL")
+    password = args.password or getpass(f"Password for {args.email}: ")
+
+    jp = Justpaste(args.email, password, proxy=args.proxy, load_settings='lazy', session_store=FileSessionStore(), qr_codes='drop')
+    export = ArticleExport(jp, args.path, args.checkpoint, args.workers, trash=not args.no_trash)
+    if export.checkpoint.finished:
+        print(f"{args.path} is already a finished export, looking for articles written since.")
+    failed = 0
+    try:
+        with tqdm(desc="Exporting", unit="article", initial=export.checkpoint.exported) as pbar:
+            for preview, article in export:
+                if isinstance(article, Exception):
+                    failed += 1
+                    pbar.write(f"Could not load {preview.url}: {article}")
+                else:
+                    pbar.update()
+    except CaptchaRequired as e:
+        raise SystemExit(f"Stopped by a captcha ({e}), run the same command again later to resume.")
+
+    checkpoint = export.checkpoint
+    print(f"{checkpoint.exported} articles in {args.path}" + (f", {failed} failed, run again to retry them" if failed else ""))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import datetime
+import threading
+import statistics
+from collections import deque
+
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from .objects import Conversation, Message
+from .sync import MessageStore, MessageSync
+from .ratelimit import Priority, request_priority
+
+if TYPE_CHECKING:
+    from . import Justpaste
+
+MessageBatch = tuple[Conversation, list[Message]]
+
+class ListenerStats:
+
+    """
+    Counters of a running listener. Latency is the time from a message's `creation_date`
+    (sent by the server in UTC) to the moment it was handed to the caller.
+    Counters are only changed through the `record_*` methods, which hold the lock.
+    """
+
+    def __init__(self, window:int=1024):
+        self.polls = 0
+        self.changes = 0
+        self.delivered = 0
+        self.errors = 0
+        self.interval = 0.0
+        self._latencies : deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_poll(self):
+        with self._lock:
+            self.polls += 1
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def record_interval(self, interval:float):
+        with self._lock:
+            self.interval = interval
+
+    def record_delivery(self, messages:list[Message]):
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        with self._lock:
+            self.changes += 1
+            self.delivered += len(messages)
+            self._latencies.extend((now - m.creation_date).total_seconds() for m in messages)
+
+    def latency(self) -> dict[str, float]:
+        """
+        Latency percentiles in seconds over the last `window` delivered messages.
+        """
+        with self._lock:
+            if not self._latencies:
+                return {}
+            last = self._latencies[-1]
+            latencies = sorted(self._latencies)
+        return {
+            "last" : last,
+            "mean" : statistics.fmean(latencies),
+            "p50" : latencies[len(latencies) // 2],
+            "p95" : latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            "max" : latencies[-1],
+        }
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            counters = {
+                "polls" : self.polls,
+                "changes" : self.changes,
+                "delivered" : self.delivered,
+                "errors" : self.errors,
+                "interval" : self.interval,
+            }
+        return {**counters, "latency" : self.latency()}
+
+class MessageListenerBase:
+
+    """
+    Polling schedule and burst coalescing, shared by `MessageListener` and `AsyncMessageListener`.
+
+    The list is polled every `min_interval` seconds while messages keep arriving. Every quiet poll
+    stretches the interval by `backoff` up to `max_interval`, and failed polls back off the same way.
+    Once a change is seen, the listener waits `coalesce` seconds and syncs again before delivering,
+    so a burst of messages is handed over as one batch per conversation.
+
+    A conversation counts as changed when the list shows a newer `last_message_date` or a different
+    `total_messages` (see `MessageSyncBase.changed`). `last_message_unread` is left out, since it also
+    flips when messages are read elsewhere, which would fetch a conversation without anything new in it.
+    """
+
+    def __init__(self, min_interval:float=2.0, max_interval:float=30.0, backoff:float=1.5, coalesce:float=0.5, include_own:bool=False):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.coalesce = coalesce
+        self.include_own = include_own
+        self.stats = ListenerStats()
+        self.stats.interval = min_interval
+        self._seeded = False
+        self._active = False
+
+    def next_interval(self, active:bool) -> float:
+        if active:
+            interval = self.min_interval
+        else:
+            interval = min(self.max_interval, self.stats.interval * self.backoff)
+        self.stats.record_interval(interval)
+        return interval
+
+    def merge(self, *rounds:list[MessageBatch]) -> list[MessageBatch]:
+        merged : dict[int, MessageBatch] = {}
+        for synced in rounds:
+            for conversation, messages in synced:
+                if conversation.id in merged:
+                    merged[conversation.id] = (conversation, merged[conversation.id][1] + messages)
+                else:
+                    merged[conversation.id] = (conversation, messages)
+
+        batches = []
+        for conversation, messages in merged.values():
+            if not self.include_own:
+                messages = [m for m in messages if not m.is_sender]
+            if messages:
+                batches.append((conversation, messages))
+        return batches
+
+class MessageListener(MessageListenerBase):
+
+    """
+    Polls the conversation list and yields new messages as `(conversation, messages)` batches.
+
+    Iterate over it to consume batches in the current thread, or `start()` it
+    with a callback to run in a background thread. See `MessagesMixin.listen`.
+    """
+
+    def __init__(self, client:"Justpaste", store:MessageStore|None=None, since_start:bool=True, max_workers:int=4, **options):
+        super().__init__(**options)
+        self.sync = MessageSync(client, store)
+        self.client = client
+        self.since_start = since_start
+        self.max_workers = max_workers
+        self._stop = threading.Event()
+        self._thread : threading.Thread | None = None
+
+    def poll(self) -> list[MessageBatch]:
+        """
+        Runs a single poll, and a second one after `coalesce` seconds if the first one found anything.
+        """
+        with request_priority(Priority.NORMAL):
+            conversations = self.client.list_conversations(hydrate_users=False)
+        self.stats.record_poll()
+        if not self._seeded:
+            if self.since_start:
+                self.sync.seed(conversations)
+            self._seeded = True
+
+        synced = self.sync.sync(self.max_workers, conversations)
+        # own messages count as activity even though they are not delivered
+        self._active = bool(synced)
+        if synced and self.coalesce > 0 and not self._stop.wait(self.coalesce):
+            synced = self.merge(synced, self.sync.sync(self.max_workers))
+        else:
+            synced = self.merge(synced)
+
+        for _, messages in synced:
+            self.stats.record_delivery(messages)
+        return synced
+
+    def __iter__(self) -> Iterator[MessageBatch]:
+        while not self._stop.is_set():
+            try:
+                synced = self.poll()
+            except Exception:
+                self.stats.record_error()
+                self._active = False
+                synced = None
+            yield from synced or ()
+            self._stop.wait(self.next_interval(self._active))
+
+    def start(self, callback:Callable[[Conversation, list[Message]], object]) -> "MessageListener":
+        """
+        Calls `callback(conversation, messages)` for every batch from a daemon thread until `stop()`.
+        """
+        def run():
+            for conversation, messages in self:
+                try:
+                    callback(conversation, messages)
+                except Exception:
+                    self.stats.record_error()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name="justpaste-listener", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout:float|None=None):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
@@ -1,9 +1,12 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
 
 from .consts import *
 from .objects import *
 from .exceptions import *
 from .utils import *
+from .sync import MessageStore
+from .listener import MessageListener
 
 class MessagesMixin(JustpasteSessionProto):
 
@@ -21,7 +24,7 @@ class MessagesMixin(JustpasteSessionProto):
         resp = self.session.post(APIEndpoints.CONVERSATION_CHECK_MESSAGES.value.format(conversation.id), json=data)
         check_response(resp, APIError, "Error while getting messages", (lambda r: r.ok, lambda r: 'messages' in r.json()))
 
-        return [ModelInitializer.message(m) for m in resp.json()['messages']]
+        return [self.models.message(m) for m in resp.json()['messages']]
     
     def get_conversation(self, user:User, before:datetime.datetime|None=None, after:datetime.datetime|None=None):
 
@@ -34,17 +37,97 @@ class MessagesMixin(JustpasteSessionProto):
         data = {"receiverPermalink":username}
         resp = self.session.post(APIEndpoints.CONVERSATION_NEW.value, json=data)
         check_response(resp, APIError, "Error while getting conversation info", (lambda r: r.ok, lambda r: 'conversation' in r.json()))
-        return ModelInitializer.conversation(resp.json()['conversation'], user)
+        return self.models.conversation(resp.json()['conversation'], user)
+
+    def _hydrate_users(self, profiles:list[tuple[str, str]], load_article_previews:bool=True, max_workers:int=4) -> list[User]:
+        # `profiles` are (permalink, url) pairs, only users missing from the cache are fetched
+        missing = {
+            permalink : url
+            for permalink, url in profiles
+            if not self._user_cached(permalink, load_article_previews)
+        }
+
+        if missing:
+            with ThreadPoolExecutor(max_workers, thread_name_prefix="justpaste-user") as executor:
+                users = executor.map(lambda url: self.user_from_url(url, load_article_previews), missing.values())
+                for permalink, user in zip(missing, users):
+                    self.user_cache[permalink] = (user, load_article_previews)
+
+        return [self.user_cache[permalink][0] for permalink, _ in profiles]
 
-    def list_conversations(self, preload=False) -> list[Conversation]:
+    def _user_cached(self, permalink:str, load_article_previews:bool) -> bool:
+        cached = self.user_cache.get(permalink)
+        return cached is not None and (cached[1] or not load_article_previews)
+
+    def hydrate_user(self, user:User|UserShort, load_article_previews=True) -> User:
+        """
+        Turns the short user of a conversation into a full `User`, reusing users this client already loaded.
+
+        ### Parameters:
+        - user: User or UserShort
+        - load_article_previews: Load article previews into the object. Default=True
+        """
+        if isinstance(user, UserShort):
+            url = str(user.user_link)
+        else:
+            url = str(user.url)
+        return self._hydrate_users([(user.permalink, url)], load_article_previews)[0]
+
+    def list_conversations(self, preload=False, hydrate_users=True, load_article_previews=True, max_workers:int=4) -> list[Conversation]:
+        """
+        Lists conversations.
+
+        ### Parameters:
+        - hydrate_users: Load the full profile of each interlocutor. If False, `Conversation.user` is a \
+        `UserShort` built from the list response and no extra requests are made. Default=True
+        - load_article_previews: Load the article previews of hydrated users. Default=True
+        - max_workers: Max. no. of profiles fetched at the same time while hydrating. Default=4
+
+        Hydrated users are kept per client by permalink, so listing again only fetches new interlocutors.
+        """
 
         resp = self.session.post(APIEndpoints.CONVERSATIONS_LIST.value, json={})
         check_response(resp, 
                        APIError, 
                        "Error while getting conversations list",
                        (lambda r: r.ok, lambda r: 'conversations' in r.json()))
+
+        conversations = resp.json()['conversations']
         
-        return [ModelInitializer.conversation(c, self.user_from_url(c['interlocutor']['url'])) for c in resp.json()['conversations']]
+        if hydrate_users:
+            users = self._hydrate_users(
+                [(c['interlocutor']['permalink'], c['interlocutor']['url']) for c in conversations], 
+                load_article_previews, 
+                max_workers)
+        else:
+            users = [self.models.interlocutor(c['interlocutor']) for c in conversations]
+
+        return [self.models.conversation(c, user) for c, user in zip(conversations, users)]
+
+    def listen(self, callback=None, store:MessageStore|None=None, since_start=True, min_interval:float=2.0, max_interval:float=30.0, coalesce:float=0.5, include_own=False) -> MessageListener:
+        """
+        Listens for new messages by polling the conversation list and fetching only the conversations that changed.
+
+        ### Parameters:
+        - callback: Called as `callback(conversation, messages)` from a background thread. \
+        If None, the listener is returned unstarted, iterate over it to get `(conversation, messages)` batches. Default=None
+        - store: Where the watermarks are kept. With a persistent store messages that arrived \
+        while the listener was not running are delivered on the first poll. Default=None (in memory)
+        - since_start: Skip the history of conversations the store has no watermark for. Default=True
+        - min_interval: Seconds between polls while messages keep arriving. Default=2.0
+        - max_interval: Max. seconds between polls once things go quiet or polls fail. Default=30.0
+        - coalesce: Seconds to wait for the rest of a burst before delivering it. Default=0.5
+        - include_own: Also deliver messages sent by this account. Default=False
+
+        `listener.stats` counts polls, deliveries and errors and keeps latency from message creation to delivery.
+        Call `listener.stop()` to end it.
+        """
+        listener = MessageListener(
+            self, store, since_start,
+            min_interval=min_interval, max_interval=max_interval, coalesce=coalesce, include_own=include_own)
+        if callback is not None:
+            listener.start(callback)
+        return listener
 
     def send_message(self, user:User, message:str):
 
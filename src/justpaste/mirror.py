@@ -0,0 +1,279 @@
+import os
+import json
+import sqlite3
+import datetime
+import threading
+
+from typing import TYPE_CHECKING, Any, Generator, Iterable
+
+from .objects import ArticlePreview, LiteArticlePreview, Article, OwnArticle
+from .ratelimit import Priority, request_priority
+
+if TYPE_CHECKING:
+    from . import Justpaste
+
+DEFAULT_MIRROR_PATH = os.path.join(os.path.expanduser("~"), ".justpaste", "mirror.sqlite3")
+
+# preview fields that change when an article is edited, voted on or moved, a changed one means fetching the article again.
+# views and the other counts only change the preview, which is stored again on every sync
+CHANGE_FIELDS = ('title', 'positive_votes', 'negative_votes', 'created_at', 'visibility_level', 'is_password_protected')
+
+PREVIEW_FIELDS = ('id', 'secure_code', 'url', 'title', 'is_password_protected', 'is_public', 'visibility_level',
+                  'unique_views', 'online', 'created_at', 'favourite_count', 'positive_votes', 'negative_votes', 'tags')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS previews (
+    id INTEGER PRIMARY KEY,
+    in_trash INTEGER NOT NULL,
+    secure_code TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    is_password_protected INTEGER NOT NULL,
+    is_public INTEGER NOT NULL,
+    visibility_level TEXT NOT NULL,
+    unique_views INTEGER NOT NULL,
+    online INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    favourite_count INTEGER NOT NULL,
+    positive_votes INTEGER NOT NULL,
+    negative_votes INTEGER NOT NULL,
+    tags TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    is_own INTEGER NOT NULL,
+    title TEXT,
+    body TEXT NOT NULL,
+    url TEXT NOT NULL,
+    visibility_level TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    modified_at TEXT NOT NULL,
+    is_in_trash INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(title, body, content='articles', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO articles_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+def upsert(table:str, row:dict[str, Any]) -> str:
+    # INSERT OR REPLACE deletes the old row without running the delete trigger, so the FTS index would keep its terms
+    columns = ', '.join(row)
+    values = ', '.join(':' + k for k in row)
+    updates = ', '.join(f"{k} = excluded.{k}" for k in row if k != 'id')
+    return f"INSERT INTO {table} ({columns}) VALUES ({values}) ON CONFLICT(id) DO UPDATE SET {updates}"
+
+def is_relative_date(created_at:str) -> bool:
+    # short dates ("Jun 7, 2022") are whole days, relative ones ("5h", "32m") are worked out from the time of listing
+    return datetime.datetime.fromisoformat(created_at).time() != datetime.time()
+
+def preview_changed(stored:sqlite3.Row, listed:dict[str, Any]) -> bool:
+    for field in CHANGE_FIELDS:
+        if field == 'created_at' and (is_relative_date(stored[field]) or is_relative_date(listed[field])):
+            # a relative date never matches the one stored at the last sync
+            continue
+        if stored[field] != listed[field]:
+            return True
+    return False
+
+def preview_row(preview:ArticlePreview|LiteArticlePreview, in_trash:bool) -> dict[str, Any]:
+    row = {field : getattr(preview, field) for field in PREVIEW_FIELDS}
+    row['url'] = str(row['url'])
+    row['created_at'] = row['created_at'].isoformat()
+    row['tags'] = json.dumps(row['tags'])
+    row['in_trash'] = in_trash
+    return row
+
+class ArticleMirror:
+
+    """
+    A local SQLite copy of the account's articles, with a full-text index over their titles and bodies.
+
+    Every `sync()` lists the notes and the trash, and only fetches articles that are new or whose
+    preview changed (see `CHANGE_FIELDS`). The previews of the other articles are stored again, so view
+    counts stay current without fetching. Articles that are no longer listed are removed. A preview is only
+    stored once its article was fetched, so articles that failed are fetched again on the next sync.
+    Articles of other users can be kept with `save()`, syncing leaves them alone.
+
+    ```python
+    mirror = ArticleMirror(jp, "articles.sqlite3")
+    mirror.sync()
+    for article in mirror.search("invoice OR receipt"):
+        ...
+    ```
+    """
+
+    def __init__(self, client:"Justpaste", path:str|os.PathLike=DEFAULT_MIRROR_PATH):
+        self.client = client
+        self.path = os.fspath(path)
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ArticleMirror":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _query(self, sql:str, params:Iterable[Any]=()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def _listed(self, trash:bool) -> Generator[tuple[ArticlePreview|LiteArticlePreview, bool], None, None]:
+        # an article moved to the trash while listing shows up twice, the first listing counts
+        seen : set[int] = set()
+        listings = (False, True) if trash else (False,)
+        for in_trash in listings:
+            with request_priority(Priority.BULK):
+                previews = self.client.get_own_article_previews(trash=in_trash)
+                for preview in previews:
+                    if preview.id not in seen:
+                        seen.add(preview.id)
+                        yield preview, in_trash
+
+    def changed(self, listed:list[tuple[ArticlePreview|LiteArticlePreview, bool]]) -> list[tuple[ArticlePreview|LiteArticlePreview, bool]]:
+        """
+        Listed previews without a stored article, or whose preview fields or listing differ from the stored ones.
+        """
+        stored = {row['id'] : row for row in self._query(
+            f"SELECT previews.id, in_trash, {', '.join('previews.' + f for f in CHANGE_FIELDS)}, articles.id IS NOT NULL AS has_article "
+            "FROM previews LEFT JOIN articles ON articles.id = previews.id")}
+
+        changed = []
+        for preview, in_trash in listed:
+            row = stored.get(preview.id)
+            if (row is None
+                or not row['has_article']
+                or row['in_trash'] != in_trash
+                or preview_changed(row, preview_row(preview, in_trash))):
+                changed.append((preview, in_trash))
+        return changed
+
+    def sync(self, max_workers:int=4, trash:bool=True, prune:bool=True) -> list[tuple[ArticlePreview|LiteArticlePreview, Article|OwnArticle|Exception]]:
+        """
+        Fetches every new or changed article of the account.
+
+        ### Parameters:
+        - max_workers: Max. no. of articles fetched at the same time. Default=4
+        - trash: Mirror the trashed notes as well. Default=True
+        - prune: Remove own articles that are no longer listed. Default=True
+
+        Returns the fetched `(preview, article)` pairs, or `(preview, exception)` for articles that failed.
+        """
+        listed = [*self._listed(trash)]
+        changed = self.changed(listed)
+        in_trash_of = {preview.id : in_trash for preview, in_trash in changed}
+        self._store_previews([preview_row(preview, in_trash) for preview, in_trash in listed if preview.id not in in_trash_of])
+
+        fetched = []
+        for preview, article in self.client.load_articles_from_previews([p for p, _ in changed], max_workers):
+            if not isinstance(article, Exception):
+                self._store(article, preview_row(preview, in_trash_of[preview.id]))
+            fetched.append((preview, article))
+
+        if prune:
+            self._prune({preview.id for preview, _ in listed})
+        return fetched
+
+    def _store(self, article:Article|OwnArticle, preview:dict[str, Any]|None):
+        row = {
+            'id' : article.id,
+            'is_own' : isinstance(article, OwnArticle),
+            'title' : article.title,
+            'body' : article.body,
+            'url' : str(article.url),
+            'visibility_level' : article.visibility_level,
+            'created_at' : article.created_at.isoformat(),
+            'modified_at' : article.modified_at.isoformat(),
+            'is_in_trash' : article.is_in_trash,
+            'data' : article.model_dump_json(exclude={'qr_code_data'}, warnings=False),
+            'fetched_at' : datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        with self._lock, self._conn:
+            self._conn.execute(upsert('articles', row), row)
+            if preview is not None:
+                self._conn.execute(upsert('previews', preview), preview)
+
+    def _store_previews(self, previews:list[dict[str, Any]]):
+        # previews of articles that are stored and didn't change, e.g. only their view count went up
+        if not previews:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(upsert('previews', previews[0]), previews)
+
+    def _prune(self, listed_ids:set[int]):
+        with self._lock, self._conn:
+            stale = [row['id'] for row in self._conn.execute("SELECT id FROM previews") if row['id'] not in listed_ids]
+            self._conn.executemany("DELETE FROM previews WHERE id = ?", [(i,) for i in stale])
+            self._conn.executemany("DELETE FROM articles WHERE id = ? AND is_own", [(i,) for i in stale])
+
+    def save(self, article:Article|OwnArticle):
+        """
+        Stores any article, e.g. one of another user from `article_from_url`.
+        """
+        self._store(article, None)
+
+    @staticmethod
+    def _article(row:sqlite3.Row) -> Article | OwnArticle:
+        model = OwnArticle if row['is_own'] else Article
+        return model.model_validate_json(row['data'])
+
+    def article(self, article_id:int) -> Article | OwnArticle | None:
+        rows = self._query("SELECT is_own, data FROM articles WHERE id = ?", (article_id,))
+        return self._article(rows[0]) if rows else None
+
+    def articles(self, in_trash:bool|None=None) -> list[Article | OwnArticle]:
+        """
+        Every stored article, newest first. `in_trash` keeps only trashed or only active ones.
+        """
+        if in_trash is None:
+            rows = self._query("SELECT is_own, data FROM articles ORDER BY created_at DESC")
+        else:
+            rows = self._query("SELECT is_own, data FROM articles WHERE is_in_trash = ? ORDER BY created_at DESC", (in_trash,))
+        return [self._article(row) for row in rows]
+
+    def previews(self, in_trash:bool|None=None) -> list[ArticlePreview]:
+        """
+        The previews the last sync stored, newest first.
+        """
+        if in_trash is None:
+            rows = self._query("SELECT * FROM previews ORDER BY created_at DESC")
+        else:
+            rows = self._query("SELECT * FROM previews WHERE in_trash = ? ORDER BY created_at DESC", (in_trash,))
+        return [ArticlePreview.model_validate({**dict(row), 'tags' : json.loads(row['tags'])}) for row in rows]
+
+    def search(self, query:str, limit:int|None=20) -> list[Article | OwnArticle]:
+        """
+        Articles matching an FTS5 `query` over their titles and bodies, best match first.
+
+        ### Parameters:
+        - query: e.g. `invoice`, `"exact phrase"`, `title:report AND 2024`, `draft*`
+        - limit: Max. no. of articles. Default=20, None for all
+        """
+        rows = self._query(
+            "SELECT articles.is_own, articles.data FROM articles_fts JOIN articles ON articles.id = articles_fts.rowid "
+            "WHERE articles_fts MATCH ? ORDER BY rank LIMIT ?", (query, -1 if limit is None else limit))
+        return [self._article(row) for row in rows]
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM articles")[0][0]
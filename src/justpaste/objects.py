@@ -1,25 +1,48 @@
 import datetime
-from typing_extensions import Literal, Any, Protocol, TYPE_CHECKING
+from typing_extensions import Literal, Any, Callable, ClassVar, Protocol, TYPE_CHECKING
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr, SerializerFunctionWrapHandler, model_serializer
 from pydantic.networks import HttpUrl
 
 from requests import Session
 
 from .consts import *
+from .paging import PagedSequence
 
 sentinel = object()
 
+if TYPE_CHECKING:
+    from .utils import ModelInitializer
+
 class JustpasteSessionProto:
     if TYPE_CHECKING:
         session : Session
         email : str
         password : str
 
-        def user_from_url(self, user_profile_url:str) -> "User": ...
-        def __init__(self, email:str|None=None, password:str|None=None): ...
+        user_cache : dict[str, tuple["User", bool]]
+        models : type["ModelInitializer"]
+
+        def user_from_url(self, user_profile_url:str, load_article_previews:bool=True) -> "User": ...
+        def _login(self, session:Session|None=None) -> Session: ...
+        def save_session(self) -> None: ...
         def logout(self) -> None: ...
 
+class AsyncJustpasteSessionProto:
+    if TYPE_CHECKING:
+        import httpx
+
+        session : httpx.AsyncClient
+        email : str
+        password : str
+
+        user_cache : dict[str, tuple["User", bool]]
+        models : type["ModelInitializer"]
+
+        async def user_from_url(self, user_profile_url:str, load_article_previews:bool=True) -> "User": ...
+        async def _login(self) -> None: ...
+        async def logout(self) -> None: ...
+
 class SaveArticleData(BaseModel):
     articleId : int
     secureCode : str
@@ -71,13 +94,91 @@ class ArticlePreview(BaseModel, extra='ignore'):
     negative_votes : int
     tags : list
 
+class LiteModel:
+
+    """
+    `__slots__` stand-in for a preview model, a fraction of its size and built without validation.
+    Subclasses list the fields of `model` in `__slots__`.
+    """
+
+    __slots__ = ()
+    model : ClassVar[type[BaseModel]]
+
+    def __init__(self, fields:dict[str, Any]):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def model_dump(self) -> dict[str, Any]:
+        return {name : getattr(self, name) for name in self.__slots__}
+
+    def to_model(self) -> Any:
+        return self.model(**self.model_dump())
+
+    def __eq__(self, other:object) -> bool:
+        if type(other) is type(self):
+            return self.model_dump() == other.model_dump() # type: ignore
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.model_dump().items())})"
+
+class LitePublicArticlePreview(LiteModel):
+    __slots__ = tuple(PublicArticlePreview.model_fields)
+    model = PublicArticlePreview
+
+class LiteArticlePreview(LiteModel):
+    __slots__ = tuple(ArticlePreview.model_fields)
+    model = ArticlePreview
+
 class UserShort(BaseModel, extra='ignore'):
-    avatar : HttpUrl | None
+    avatar : HttpUrl | None = None
     user_name : str
     permalink : str
     user_link : HttpUrl
 
-class User(BaseModel, extra='ignore'):
+class LazyQRCode(BaseModel):
+
+    """
+    Keeps the base64 `qrCodeData` of a page as it came and decodes it into `qr_code_data` the first time it is read
+    or serialized, also when the model is serialized as part of another one.
+    `qr_code_data` is None if the client dropped QR codes (`qr_codes="drop"`) or the page had none.
+    """
+
+    _qr_code_raw : str | None = PrivateAttr(default=None)
+
+    def _load_qr_code(self):
+        if 'qr_code_data' not in self.__dict__:
+            from .utils import decode_qr_code
+            raw = self._qr_code_raw
+            self.__dict__['qr_code_data'] = None if raw is None else decode_qr_code(raw)
+            self._qr_code_raw = None
+
+    def _defer_qr_code(self, raw:str):
+        self.__dict__.pop('qr_code_data', None)
+        self._qr_code_raw = raw
+
+    def __getattr__(self, name:str) -> Any:
+        if name == 'qr_code_data':
+            self._load_qr_code()
+            return self.__dict__['qr_code_data']
+        return super().__getattr__(name) # type: ignore
+
+    def _prepare_dump(self):
+        # fills in whatever __dict__ is still missing before pydantic-core reads it
+        self._load_qr_code()
+
+    @model_serializer(mode='wrap')
+    def _serialize(self, handler:SerializerFunctionWrapHandler) -> Any:
+        self._prepare_dump()
+        return handler(self)
+
+    def __eq__(self, other:object) -> bool:
+        self._load_qr_code()
+        if isinstance(other, LazyQRCode):
+            other._load_qr_code()
+        return super().__eq__(other)
+
+class User(LazyQRCode, extra='ignore'):
     id : int
     name : str
     permalink : str
@@ -93,12 +194,12 @@ class User(BaseModel, extra='ignore'):
     location : str | None
     articles_count : int
     join_date : datetime.datetime
-    qr_code_data : bytes
+    qr_code_data : bytes | None = None
     visiting_user_is_public : bool
     visitor_is_logged : bool
-    public_articles : list[PublicArticlePreview]
+    public_articles : PagedSequence[PublicArticlePreview]
 
-class Article(BaseModel, extra='ignore'):
+class Article(LazyQRCode, extra='ignore'):
     id : int
     title : str | None
     body : str
@@ -106,7 +207,7 @@ class Article(BaseModel, extra='ignore'):
     short_url : HttpUrl
     pdf_url : HttpUrl
     path : str
-    qr_code_data : bytes
+    qr_code_data : bytes | None = None
     positive_votes : int
     negative_votes : int
     content_lang : str
@@ -126,6 +227,76 @@ class OwnArticle(Article):
     edit_url : str
     is_owner : Literal[True]
 
+class EditedArticle(OwnArticle):
+
+    """
+    `OwnArticle` returned by `edit_article(..., refetch=False)`, patched with the submitted fields instead of reloaded.
+    Fields the server works out on save (`SERVER_FIELDS`) are loaded from the article page the first time one of them is read.
+    The async client can't load them on access, they keep their values from before the edit there.
+    """
+
+    SERVER_FIELDS : ClassVar[tuple[str, ...]] = ('modified_at', 'content_lang', 'views', 'online')
+
+    _loader : Callable[[], OwnArticle] | None = PrivateAttr(default=None)
+
+    @property
+    def is_stale(self) -> bool:
+        return any(f not in self.__dict__ for f in self.SERVER_FIELDS)
+
+    def refresh(self) -> "EditedArticle":
+        """
+        Loads the server computed fields now.
+        """
+        if self._loader is None:
+            raise AttributeError("This article can't reload itself, load it again with article_from_url")
+        fresh = self._loader()
+        for field in self.SERVER_FIELDS:
+            self.__dict__[field] = getattr(fresh, field)
+        return self
+
+    def __getattr__(self, name:str) -> Any:
+        if name in EditedArticle.SERVER_FIELDS:
+            self.refresh()
+            return self.__dict__[name]
+        return super().__getattr__(name) # type: ignore
+
+    def _prepare_dump(self):
+        if self.is_stale:
+            self.refresh()
+        super()._prepare_dump()
+
+class PublishedArticle(BaseModel, extra='ignore'):
+    id : int
+    secure_code : str
+    url : HttpUrl
+    title : str
+    visibility_level : Literal['public','hidden','private']
+
+class PublishResult:
+
+    """
+    Outcome of one article spec given to `new_articles`. `index` is its position in the input.
+    `article_id` / `secure_code` are set once an id was allocated, even if saving failed afterwards.
+    """
+
+    __slots__ = ("index", "spec", "article", "error", "article_id", "secure_code")
+
+    def __init__(self, index:int, spec:dict[str, Any]):
+        self.index = index
+        self.spec = spec
+        self.article : OwnArticle | PublishedArticle | None = None
+        self.error : Exception | None = None
+        self.article_id : int | None = None
+        self.secure_code : str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.article is not None
+
+    def __repr__(self) -> str:
+        outcome = f"article={self.article!r}" if self.ok else f"error={self.error!r}"
+        return f"PublishResult(index={self.index}, {outcome})"
+
 class Message(BaseModel, extra='ignore'):
     content : str
     creation_date : datetime.datetime
@@ -137,7 +308,7 @@ class Message(BaseModel, extra='ignore'):
 
 class Conversation(BaseModel, extra='ignore'):
     id : int
-    user : User
+    user : User | UserShort
     last_message_date : datetime.datetime
     last_message_text : str
     last_message_unread : bool
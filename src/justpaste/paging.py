@@ -0,0 +1,183 @@
+import copy
+import threading
+from collections.abc import Sequence
+
+from typing import Any, Callable, Iterator, TypeVar, get_args, overload
+
+from pydantic_core import core_schema
+
+T = TypeVar('T')
+
+class PagedSequence(Sequence[T]):
+
+    """
+    A read-only list over a paginated listing that only downloads the pages it is asked for.
+
+    The first page comes with the listing, `load_page(n)` fetches page `n` (starting at 2) when an item
+    on it is iterated over or indexed. Every page is loaded once and kept.
+
+    Pages between the first and the last are taken to be equally long, the first can differ (e.g. pinned
+    articles are shown on it as well). `len()` and indexing work from that and load the last page, the page asked for
+    and one page in between. If loaded pages in between turn out to differ in length, every page before the one asked
+    for is counted instead. `load_all` loads the missing pages concurrently.
+
+    So the first `len()` can cost two requests, for page 2 and the last page. The length is kept and only
+    worked out again once another page was loaded, since that page may show the estimate was off.
+    """
+
+    def __init__(self, first_page:list[T], total_pages:int, load_page:Callable[[int], list[T]], load_pages:Callable[[list[int], int], Iterator[tuple[int, list[T]]]]|None=None):
+        self.total_pages = max(total_pages, 1)
+        self.per_page = len(first_page)
+        self._pages : dict[int, list[T]] = {1 : first_page}
+        self._load_page = load_page
+        self._load_pages = load_pages
+        self._lock = threading.Lock()
+        # (no. of loaded pages, length worked out from them)
+        self._length : tuple[int, int] | None = None
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source:Any, handler:Any) -> core_schema.CoreSchema:
+        # lists are validated as usual, an existing PagedSequence is kept as it is and dumped as a list
+        args = get_args(source)
+        list_schema = handler.generate_schema(list[args[0]] if args else list)
+        return core_schema.union_schema(
+            [core_schema.is_instance_schema(cls), list_schema],
+            serialization=core_schema.wrap_serializer_function_ser_schema(lambda v, serialize: serialize(list(v)), schema=list_schema))
+
+    @property
+    def loaded_pages(self) -> list[int]:
+        return sorted(self._pages)
+
+    @property
+    def is_loaded(self) -> bool:
+        return len(self._pages) == self.total_pages
+
+    def page(self, number:int) -> list[T]:
+        """
+        Items on page `number`, starting at 1. Loads it if it wasn't loaded yet.
+        """
+        if not 1 <= number <= self.total_pages:
+            raise IndexError(f"page {number} out of range 1-{self.total_pages}")
+        with self._lock:
+            if number in self._pages:
+                return self._pages[number]
+        items = self._load_page(number)
+        with self._lock:
+            return self._pages.setdefault(number, items)
+
+    def load_all(self, max_workers:int=1) -> "PagedSequence[T]":
+        """
+        Loads every missing page, up to `max_workers` of them at the same time.
+        """
+        missing = [n for n in range(2, self.total_pages + 1) if n not in self._pages]
+        if missing and self._load_pages is not None:
+            for number, items in self._load_pages(missing, max_workers):
+                with self._lock:
+                    self._pages.setdefault(number, items)
+        else:
+            for number in missing:
+                self.page(number)
+        return self
+
+    def _page_size(self) -> int | None:
+        # length of the pages between the first and the last one, None if the loaded ones differ
+        if self.total_pages <= 2:
+            return None
+        with self._lock:
+            sizes = {len(items) for number, items in self._pages.items() if 1 < number < self.total_pages}
+        if not sizes:
+            sizes = {len(self.page(2))}
+        return sizes.pop() if len(sizes) == 1 else None
+
+    def _start(self, number:int) -> int:
+        # index of the first item on page `number`
+        if number == 1:
+            return 0
+        size = self._page_size()
+        if size is None:
+            return sum(len(self.page(n)) for n in range(1, number))
+        return self.per_page + (number - 2) * size
+
+    def _locate(self, index:int) -> tuple[int, int]:
+        # (page number, offset on it) of a non-negative index
+        if index < self.per_page or self.total_pages == 1:
+            return 1, index
+        if self.total_pages == 2:
+            return 2, index - self.per_page
+
+        size = self._page_size()
+        while size:
+            number = min(2 + (index - self.per_page) // size, self.total_pages)
+            self.page(number)
+            # the page just loaded may show the pages in between aren't equally long
+            if self._page_size() == size:
+                return number, index - self._start(number)
+            size = self._page_size()
+
+        start = self.per_page
+        for number in range(2, self.total_pages):
+            items = self.page(number)
+            if index < start + len(items):
+                return number, index - start
+            start += len(items)
+        return self.total_pages, index - start
+
+    def __len__(self) -> int:
+        if self.total_pages == 1:
+            return self.per_page
+        with self._lock:
+            if self._length is not None and self._length[0] == len(self._pages):
+                return self._length[1]
+        length = self._start(self.total_pages) + len(self.page(self.total_pages))
+        with self._lock:
+            self._length = (len(self._pages), length)
+        return length
+
+    @overload
+    def __getitem__(self, index:int) -> T: ...
+    @overload
+    def __getitem__(self, index:slice) -> list[T]: ...
+    def __getitem__(self, index:int|slice) -> T | list[T]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if index < 0 or self.per_page == 0:
+            raise IndexError("PagedSequence index out of range")
+        number, offset = self._locate(index)
+        items = self.page(number)
+        if offset >= len(items):
+            raise IndexError("PagedSequence index out of range")
+        return items[offset]
+
+    def __iter__(self) -> Iterator[T]:
+        for number in range(1, self.total_pages + 1):
+            yield from self.page(number)
+
+    def __bool__(self) -> bool:
+        return self.per_page > 0
+
+    def __eq__(self, other:object) -> bool:
+        # compares what is loaded, so comparing two users doesn't download their listings
+        if isinstance(other, PagedSequence):
+            if self is other:
+                return True
+            with self._lock:
+                pages = dict(self._pages)
+            with other._lock:
+                other_pages = dict(other._pages)
+            return self.total_pages == other.total_pages and pages == other_pages
+        if isinstance(other, (list, tuple)):
+            return self.is_loaded and list(self) == list(other)
+        return NotImplemented
+
+    def __deepcopy__(self, memo:dict) -> "PagedSequence[T]":
+        # the loaders hold the client, only the loaded items are copied
+        copied = copy.copy(self)
+        copied._pages = copy.deepcopy(self._pages, memo)
+        copied._lock = threading.Lock()
+        return copied
+
+    def __repr__(self) -> str:
+        return f"PagedSequence(loaded_pages={self.loaded_pages}, total_pages={self.total_pages})"
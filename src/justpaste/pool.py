@@ -0,0 +1,242 @@
+import time
+import itertools
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+
+from typing import TYPE_CHECKING, Any, Callable, Generator, Iterable, Literal, TypeVar
+
+import requests
+
+from .exceptions import APIError, CaptchaRequired, NoClientAvailable
+from .objects import Article, OwnArticle, User, PublicArticlePreview, ArticlePreview
+
+if TYPE_CHECKING:
+    from . import Justpaste
+
+T = TypeVar('T')
+
+def is_client_failure(error:BaseException) -> bool:
+    """
+    Whether `error` says something about the account or proxy behind a client rather than about the request.
+    A missing article (404) is the request's fault, a captcha, a block, a 5xx or a dead proxy are the client's.
+    """
+    if isinstance(error, (CaptchaRequired, requests.RequestException)):
+        return True
+    if isinstance(error, APIError):
+        status = getattr(error.response, 'status_code', None)
+        return status is None or not 400 <= status < 500 or status in (401, 403, 407, 429)
+    return False
+
+class PooledClient:
+
+    """
+    A `Justpaste` client in a `ClientPool` and its health.
+    """
+
+    __slots__ = ("client", "in_flight", "served", "failures", "consecutive_failures", "captchas", "quarantined_until")
+
+    def __init__(self, client:"Justpaste"):
+        self.client = client
+        self.in_flight = 0
+        self.served = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.captchas = 0
+        self.quarantined_until = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.client.email or f"anonymous@{id(self.client):x}"
+
+    def available(self, now:float) -> bool:
+        return self.quarantined_until <= now
+
+    def stats(self, now:float) -> dict[str, Any]:
+        return {
+            "in_flight" : self.in_flight,
+            "served" : self.served,
+            "failures" : self.failures,
+            "captchas" : self.captchas,
+            "quarantined_for" : max(self.quarantined_until - now, 0.0),
+        }
+
+class ClientPool:
+
+    """
+    Spreads requests over several logged in `Justpaste` clients, e.g. one per account and proxy.
+
+    Every call goes to the next available client, either in turn (`"round_robin"`) or to the one with
+    the fewest requests in flight (`"least_loaded"`). A client that hits `CaptchaRequired`, or fails
+    `max_failures` times in a row, is left out for `quarantine` seconds.
+
+    ```python
+    pool = ClientPool.from_accounts([
+        {"email" : "<email 1>", "password" : "<password 1>", "proxy" : "http://user:password@ip:port"},
+        {"email" : "<email 2>", "password" : "<password 2>"},
+    ])
+    article = pool.article_from_url("...")
+    ```
+    """
+
+    def __init__(self, clients:Iterable["Justpaste"], strategy:Literal['round_robin', 'least_loaded']='least_loaded', max_failures:int=3, quarantine:float=300.0):
+        self.members = [PooledClient(c) for c in clients]
+        if not self.members:
+            raise ValueError("ClientPool needs at least one client")
+        if strategy not in ('round_robin', 'least_loaded'):
+            raise ValueError(f"Unknown strategy {strategy!r}")
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.quarantine = quarantine
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_accounts(cls, accounts:Iterable[dict[str, Any]], max_workers:int=4, **options) -> "ClientPool":
+        """
+        Logs in to every account concurrently.
+
+        ### Parameters:
+        - accounts: `Justpaste` keyword arguments for each client, e.g. `{"email" : ..., "password" : ..., "proxy" : ...}`
+        - max_workers: Max. no. of logins at the same time. Default=4
+        - options: Passed to `ClientPool`
+        """
+        from . import Justpaste
+
+        with ThreadPoolExecutor(max_workers, thread_name_prefix="justpaste-login") as executor:
+            clients = list(executor.map(lambda kwargs: Justpaste(**kwargs), accounts))
+        return cls(clients, **options)
+
+    def _pick(self, exclude:set[int]) -> PooledClient:
+        now = time.monotonic()
+        with self._lock:
+            candidates = [m for m in self.members if m.available(now) and id(m) not in exclude]
+            if not candidates:
+                raise NoClientAvailable("Every client in the pool is quarantined or has already failed this request")
+
+            if self.strategy == 'round_robin':
+                member = candidates[next(self._turn) % len(candidates)]
+            else:
+                member = min(candidates, key=lambda m: (m.in_flight, m.served))
+            member.in_flight += 1
+            return member
+
+    def _release(self, member:PooledClient, error:BaseException|None):
+        with self._lock:
+            member.in_flight -= 1
+            if error is None:
+                member.served += 1
+                member.consecutive_failures = 0
+                return
+
+            member.failures += 1
+            member.consecutive_failures += 1
+            if isinstance(error, CaptchaRequired):
+                member.captchas += 1
+                member.quarantined_until = time.monotonic() + self.quarantine
+            elif member.consecutive_failures >= self.max_failures:
+                member.quarantined_until = time.monotonic() + self.quarantine
+
+    @contextlib.contextmanager
+    def client(self) -> Generator["Justpaste", None, None]:
+        """
+        Borrows a client for several calls, e.g. to page through previews with one session.
+        Client failures raised inside the block count against it.
+        """
+        member = self._pick(set())
+        try:
+            yield member.client
+        except BaseException as e:
+            self._release(member, e if is_client_failure(e) else None)
+            raise
+        else:
+            self._release(member, None)
+
+    def call(self, fn:Callable[["Justpaste"], T], attempts:int=2, retry_on:tuple[type[BaseException], ...]=(APIError, requests.RequestException)) -> T:
+        """
+        Runs `fn(client)` on a client from the pool. If it fails because of the client (see `is_client_failure`)
+        with one of `retry_on`, it runs again on another client, up to `attempts` clients in total.
+        """
+        tried : set[int] = set()
+        error : BaseException | None = None
+        while True:
+            try:
+                member = self._pick(tried)
+            except NoClientAvailable:
+                if error is not None:
+                    raise error
+                raise
+            tried.add(id(member))
+            try:
+                result = fn(member.client)
+            except BaseException as e:
+                if not is_client_failure(e):
+                    self._release(member, None)
+                    raise
+                self._release(member, e)
+                if len(tried) >= attempts or not isinstance(e, retry_on):
+                    raise
+                error = e
+            else:
+                self._release(member, None)
+                return result
+
+    def article_from_url(self, url:str) -> Article | OwnArticle:
+        return self.call(lambda c: c.article_from_url(url))
+
+    def user_from_url(self, user_profile_url:str, load_article_previews=True) -> User:
+        return self.call(lambda c: c.user_from_url(user_profile_url, load_article_previews))
+
+    def get_public_article_previews(self, user:User, pages:int|None=None, page_buffer:int=1, max_workers:int=1) -> Generator[PublicArticlePreview, None, None]:
+        """
+        Same as `Justpaste.get_public_article_previews`, paged through by one client.
+        """
+        with self.client() as client:
+            yield from client.get_public_article_previews(user, pages, page_buffer, max_workers=max_workers)
+
+    def load_articles_from_previews(self, previews:Iterable[PublicArticlePreview | ArticlePreview], max_workers:int|None=None) -> Generator[tuple[PublicArticlePreview | ArticlePreview, Article | OwnArticle | Exception], None, None]:
+        """
+        Same as `Justpaste.load_articles_from_previews`, with the articles spread over the pool.
+
+        Args:
+            max_workers: Max. no. of articles fetched at the same time. Default: None (2 per client)
+        """
+        if max_workers is None:
+            max_workers = 2 * len(self.members)
+
+        executor = ThreadPoolExecutor(max_workers, thread_name_prefix="justpaste-pool")
+        remaining = iter(previews)
+        pending : dict[Future[Article | OwnArticle], PublicArticlePreview | ArticlePreview] = {}
+
+        def submit(preview:PublicArticlePreview | ArticlePreview):
+            pending[executor.submit(self.article_from_url, str(preview.url))] = preview
+
+        try:
+            for preview in itertools.islice(remaining, max_workers):
+                submit(preview)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    preview = pending.pop(future)
+                    for next_preview in itertools.islice(remaining, 1):
+                        submit(next_preview)
+
+                    try:
+                        yield preview, future.result()
+                    except Exception as e:
+                        yield preview, e
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def new_article(self, **kwargs) -> OwnArticle:
+        """
+        Same as `Justpaste.new_article`. Only a `CaptchaRequired` moves the article to another client,
+        any other error may have come after the article was created.
+        """
+        return self.call(lambda c: c.new_article(**kwargs), retry_on=(CaptchaRequired,))
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return {m.name : m.stats(now) for m in self.members}
@@ -0,0 +1,219 @@
+import time
+import heapq
+import itertools
+import threading
+import contextlib
+import contextvars
+from enum import IntEnum
+
+from typing import Generator
+
+import requests
+from requests.adapters import BaseAdapter
+
+from .consts import ROOT, MESSAGE_API_ROOT
+
+class Priority(IntEnum):
+
+    """
+    Lower goes first. Calls made directly by the user are `INTERACTIVE`,
+    message syncing is `NORMAL` and pagination / bulk loading is `BULK`.
+    """
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+_request_priority : contextvars.ContextVar[Priority] = contextvars.ContextVar("justpaste_request_priority", default=Priority.INTERACTIVE)
+
+@contextlib.contextmanager
+def request_priority(priority:Priority) -> Generator[None, None, None]:
+    """
+    Requests sent inside the block (in this thread or task) are scheduled with `priority`.
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+def current_priority() -> Priority:
+    return _request_priority.get()
+
+class RateLimit:
+
+    """
+    `rate` requests per second on average, with bursts of up to `burst` requests.
+    """
+
+    def __init__(self, rate:float, burst:int=1):
+        self.rate = rate
+        self.burst = burst
+
+class TokenBucket:
+
+    """
+    A token bucket that hands tokens out in priority order, then first come first served.
+
+    Waiters queue by `(priority, arrival)`. Only the head of the queue may take a token, everyone
+    else sleeps for as long as the tokens ahead of them take to refill and checks again.
+    """
+
+    def __init__(self, limit:RateLimit):
+        self.rate = limit.rate
+        self.burst = limit.burst
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+        self._waiters : list[tuple[int, int]] = []
+        self._arrivals = itertools.count()
+        self._lock = threading.Lock()
+
+        self.acquired = {p.name : 0 for p in Priority}
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_queue_depth = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _enqueue(self, priority:Priority) -> tuple[int, int]:
+        ticket = (int(priority), next(self._arrivals))
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        return ticket
+
+    def _try_take(self, ticket:tuple[int, int]) -> float:
+        # 0 once the token is taken, otherwise seconds until it is worth checking again
+        with self._lock:
+            self._refill()
+            ahead = sum(1 for w in self._waiters if w < ticket)
+            if ahead == 0 and self._tokens >= 1:
+                heapq.heappop(self._waiters)
+                self._tokens -= 1
+                return 0.0
+            return max((ahead + 1 - self._tokens) / self.rate, 0.001)
+
+    def _discard(self, ticket:tuple[int, int]):
+        with self._lock:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+
+    def _record(self, priority:Priority, waited:float):
+        with self._lock:
+            self.acquired[priority.name] += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def acquire(self, priority:Priority=Priority.INTERACTIVE) -> float:
+        """
+        Blocks until a token is available and returns the seconds spent waiting.
+        """
+        start = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while (delay := self._try_take(ticket)) > 0:
+                time.sleep(delay)
+        except BaseException:
+            self._discard(ticket)
+            raise
+        waited = time.monotonic() - start
+        self._record(priority, waited)
+        return waited
+
+    async def acquire_async(self, priority:Priority=Priority.INTERACTIVE) -> float:
+        """
+        Same as `acquire`, without blocking the event loop.
+        """
+        import asyncio
+
+        start = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while (delay := self._try_take(ticket)) > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            self._discard(ticket)
+            raise
+        waited = time.monotonic() - start
+        self._record(priority, waited)
+        return waited
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = sum(self.acquired.values())
+            return {
+                "queue_depth" : len(self._waiters),
+                "max_queue_depth" : self.max_queue_depth,
+                "acquired" : dict(self.acquired),
+                "mean_wait" : self.total_wait / total if total else 0.0,
+                "max_wait" : self.max_wait,
+                "total_wait" : self.total_wait,
+            }
+
+class RateLimitedAdapter(BaseAdapter):
+
+    """
+    Takes a token from `bucket` before handing the request to the wrapped adapter.
+    """
+
+    def __init__(self, adapter:BaseAdapter, bucket:TokenBucket):
+        super().__init__()
+        self.adapter = adapter
+        self.bucket = bucket
+
+    def send(self, request:requests.PreparedRequest, **kwargs) -> requests.Response:
+        self.bucket.acquire(current_priority())
+        return self.adapter.send(request, **kwargs)
+
+    def close(self):
+        self.adapter.close()
+
+class RequestScheduler:
+
+    """
+    Rate limits a client's requests with one token bucket for justpaste.it and one for
+    the message API on msg.justpaste.it. Pass None for a host to leave it unlimited.
+
+    ```python
+    jp = Justpaste(email, password, scheduler=RequestScheduler(site=RateLimit(5, burst=10)))
+    jp.scheduler.stats()
+    ```
+    """
+
+    def __init__(self, site:RateLimit|None=RateLimit(5, burst=10), messages:RateLimit|None=RateLimit(2, burst=5)):
+        self.buckets : dict[str, TokenBucket] = {}
+        if site is not None:
+            self.buckets[ROOT] = TokenBucket(site)
+        if messages is not None:
+            self.buckets[MESSAGE_API_ROOT] = TokenBucket(messages)
+
+    def bucket_for(self, url:str) -> TokenBucket | None:
+        for prefix, bucket in self.buckets.items():
+            if url.startswith(prefix):
+                return bucket
+        return None
+
+    def install(self, session:requests.Session):
+        """
+        Wraps the adapters `session` uses for each limited host.
+        """
+        for prefix, bucket in self.buckets.items():
+            session.mount(prefix, RateLimitedAdapter(session.get_adapter(prefix), bucket))
+
+    def install_async(self, client):
+        """
+        Adds a request hook to an `httpx.AsyncClient` that waits for a token.
+        """
+        async def wait_for_token(request):
+            bucket = self.bucket_for(str(request.url))
+            if bucket is not None:
+                await bucket.acquire_async(current_priority())
+
+        client.event_hooks['request'].append(wait_for_token)
+
+    def stats(self) -> dict[str, dict]:
+        return {prefix : bucket.stats() for prefix, bucket in self.buckets.items()}
@@ -0,0 +1,249 @@
+import re
+import sys
+import time
+import random
+import threading
+import contextlib
+import contextvars
+import email.utils
+from collections import Counter
+
+from typing import TYPE_CHECKING, Generator
+
+import requests
+from requests.adapters import BaseAdapter
+
+from .consts import ROOT, MESSAGE_API_ROOT, APIEndpoints
+from .ratelimit import current_priority
+
+if TYPE_CHECKING:
+    import httpx
+    from .ratelimit import RequestScheduler
+
+def endpoint_pattern(endpoint:APIEndpoints) -> re.Pattern:
+    return re.compile(re.escape(endpoint.value).replace(r'\{\}', r'[^/]+') + r'/?(\?.*)?$')
+
+# POST endpoints that only read, so sending them twice changes nothing
+IDEMPOTENT_POSTS = tuple(endpoint_pattern(e) for e in (
+    APIEndpoints.ARTICLE_DYNAMIC,
+    APIEndpoints.EXISTING_ARTICLE,
+    APIEndpoints.CONVERSATIONS_LIST,
+    APIEndpoints.CONVERSATION_CHECK_MESSAGES,
+))
+
+_retry_safe : contextvars.ContextVar[bool] = contextvars.ContextVar("justpaste_retry_safe", default=False)
+
+@contextlib.contextmanager
+def retry_safe() -> Generator[None, None, None]:
+    """
+    Requests sent inside the block (in this thread or task) are retried like GETs.
+    Only for requests that change nothing when sent twice, e.g. saving an article that already exists.
+    """
+    token = _retry_safe.set(True)
+    try:
+        yield
+    finally:
+        _retry_safe.reset(token)
+
+def parse_retry_after(value:str|None) -> float | None:
+    """
+    Seconds to wait from a Retry-After header, given either as seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+class RetryPolicy:
+
+    """
+    Retries failed requests with exponential backoff and full jitter.
+
+    Only requests that are safe to send twice are retried after a failed response or a dropped connection:
+    GETs, the read-only POSTs in `IDEMPOTENT_POSTS`, and requests sent inside `retry_safe()`, which is how
+    editing marks its save of an existing article. Saving a new article is never marked, a retry could save it twice.
+    A 429 or a connect timeout means the request was never processed, so those are retried for any request.
+
+    Args:
+        total: Max. no. of retries per request. Default: 3
+        backoff: Base delay in seconds, doubled on every retry. Default: 0.5
+        max_backoff: Cap of a single delay in seconds. Default: 30
+        statuses: Response codes worth retrying. Default: 429, 500, 502, 503, 504
+        max_retry_after: A longer Retry-After is not waited for, the response is returned instead. Default: 120
+    """
+
+    def __init__(self, total:int=3, backoff:float=0.5, max_backoff:float=30.0, statuses:frozenset[int]=frozenset({429, 500, 502, 503, 504}), max_retry_after:float=120.0):
+        self.total = total
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        self.max_retry_after = max_retry_after
+
+        self.requests = 0
+        self.retries = 0
+        self.gave_up = 0
+        self.time_spent = 0.0
+        self.reasons : Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def is_idempotent(self, method:str, url:str) -> bool:
+        if method in ('GET', 'HEAD', 'OPTIONS') or _retry_safe.get():
+            return True
+        return method == 'POST' and any(p.match(url) for p in IDEMPOTENT_POSTS)
+
+    def delay(self, retry:int, retry_after:float|None=None) -> float:
+        """
+        Seconds to wait before the `retry`th retry, at least `retry_after` if the server sent one.
+        """
+        backoff = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (retry - 1)))
+        if retry_after is not None:
+            return max(retry_after, backoff)
+        return backoff
+
+    def should_retry_status(self, status:int, idempotent:bool, retry_after:float|None) -> bool:
+        if status not in self.statuses:
+            return False
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return False
+        return idempotent or status == 429
+
+    def should_retry_error(self, error:Exception, idempotent:bool) -> bool:
+        connect_errors : tuple[type[Exception], ...] = (requests.exceptions.ConnectTimeout,)
+        transport_errors : tuple[type[Exception], ...] = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+        # only the async client raises httpx errors, and it has imported httpx by then
+        if (httpx := sys.modules.get('httpx')) is not None:
+            connect_errors += (httpx.ConnectError, httpx.ConnectTimeout)
+            transport_errors += (httpx.TransportError,)
+
+        if isinstance(error, connect_errors):
+            return True
+        return idempotent and isinstance(error, transport_errors)
+
+    def record(self, reason:str|None, spent:float, gave_up:bool=False):
+        with self._lock:
+            if reason is not None:
+                self.retries += 1
+                self.reasons[reason] += 1
+            self.time_spent += spent
+            self.gave_up += gave_up
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests" : self.requests,
+                "retries" : self.retries,
+                "gave_up" : self.gave_up,
+                "time_spent" : self.time_spent,
+                "reasons" : dict(self.reasons),
+            }
+
+    def install(self, session:requests.Session):
+        """
+        Wraps the adapters `session` uses for justpaste.it and msg.justpaste.it.
+        Install it after a `RequestScheduler`, so every attempt waits for a token.
+        """
+        for prefix in (ROOT, MESSAGE_API_ROOT):
+            session.mount(prefix, RetryingAdapter(session.get_adapter(prefix), self))
+
+class RetryingAdapter(BaseAdapter):
+
+    """
+    Sends the request through the wrapped adapter again while `policy` says so.
+    """
+
+    def __init__(self, adapter:BaseAdapter, policy:RetryPolicy):
+        super().__init__()
+        self.adapter = adapter
+        self.policy = policy
+
+    def send(self, request:requests.PreparedRequest, **kwargs) -> requests.Response:
+        policy = self.policy
+        idempotent = policy.is_idempotent(request.method or 'GET', request.url or '')
+        with policy._lock:
+            policy.requests += 1
+
+        retries = 0
+        while True:
+            start = time.monotonic()
+            try:
+                resp = self.adapter.send(request, **kwargs)
+            except Exception as e:
+                if retries >= policy.total or not policy.should_retry_error(e, idempotent):
+                    policy.record(None, 0.0, gave_up=retries > 0)
+                    raise
+                wait = policy.delay(retries + 1)
+                reason = type(e).__name__
+            else:
+                retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+                if not policy.should_retry_status(resp.status_code, idempotent, retry_after):
+                    return resp
+                if retries >= policy.total:
+                    policy.record(None, 0.0, gave_up=True)
+                    return resp
+                wait = policy.delay(retries + 1, retry_after)
+                reason = str(resp.status_code)
+                resp.close()
+
+            retries += 1
+            time.sleep(wait)
+            policy.record(reason, time.monotonic() - start)
+
+    def close(self):
+        self.adapter.close()
+
+def async_retry_transport(transport:"httpx.AsyncBaseTransport", policy:RetryPolicy, scheduler:"RequestScheduler|None"=None) -> "httpx.AsyncBaseTransport":
+    """
+    Wraps an httpx transport with `policy`. Every retry waits for a token from `scheduler` first,
+    since the client's request hooks only run once per request.
+    """
+    import asyncio
+    import httpx
+
+    class AsyncRetryTransport(httpx.AsyncBaseTransport):
+
+        async def handle_async_request(self, request:httpx.Request) -> httpx.Response:
+            url = str(request.url)
+            idempotent = policy.is_idempotent(request.method, url)
+            bucket = scheduler.bucket_for(url) if scheduler is not None else None
+            with policy._lock:
+                policy.requests += 1
+
+            retries = 0
+            while True:
+                start = time.monotonic()
+                if retries > 0 and bucket is not None:
+                    await bucket.acquire_async(current_priority())
+                try:
+                    resp = await transport.handle_async_request(request)
+                except Exception as e:
+                    if retries >= policy.total or not policy.should_retry_error(e, idempotent):
+                        policy.record(None, 0.0, gave_up=retries > 0)
+                        raise
+                    wait = policy.delay(retries + 1)
+                    reason = type(e).__name__
+                else:
+                    retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+                    if not policy.should_retry_status(resp.status_code, idempotent, retry_after):
+                        return resp
+                    if retries >= policy.total:
+                        policy.record(None, 0.0, gave_up=True)
+                        return resp
+                    wait = policy.delay(retries + 1, retry_after)
+                    reason = str(resp.status_code)
+                    await resp.aclose()
+
+                retries += 1
+                await asyncio.sleep(wait)
+                policy.record(reason, time.monotonic() - start)
+
+        async def aclose(self):
+            await transport.aclose()
+
+    return AsyncRetryTransport()
@@ -0,0 +1,121 @@
+import os
+import abc
+import json
+import tempfile
+import threading
+
+from typing import TYPE_CHECKING, Any
+
+from http.cookiejar import CookieJar
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.cookies import create_cookie
+
+if TYPE_CHECKING:
+    from .base import JustpasteBase
+
+DEFAULT_SESSION_FILE = os.path.join(os.path.expanduser("~"), ".justpaste", "sessions.json")
+
+class SessionStore(abc.ABC):
+
+    """
+    Where logged in sessions are kept between process restarts.
+    Subclass it and implement `load`, `save` and `delete` to keep sessions somewhere else.
+    """
+
+    @abc.abstractmethod
+    def load(self, key:str) -> dict[str, Any] | None:
+        ...
+
+    @abc.abstractmethod
+    def save(self, key:str, state:dict[str, Any]) -> None:
+        ...
+
+    @abc.abstractmethod
+    def delete(self, key:str) -> None:
+        ...
+
+class FileSessionStore(SessionStore):
+
+    """
+    Keeps every session in a single JSON file, keyed by account email.
+    The file holds live cookies, so it is only readable by its owner.
+    """
+
+    def __init__(self, path:str|os.PathLike=DEFAULT_SESSION_FILE):
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, sessions:dict[str, dict[str, Any]]):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.sessions-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(sessions, f)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def load(self, key:str) -> dict[str, Any] | None:
+        with self._lock:
+            return self._read().get(key)
+
+    def save(self, key:str, state:dict[str, Any]) -> None:
+        with self._lock:
+            sessions = self._read()
+            sessions[key] = state
+            self._write(sessions)
+
+    def delete(self, key:str) -> None:
+        with self._lock:
+            sessions = self._read()
+            if sessions.pop(key, None) is not None:
+                self._write(sessions)
+
+def dump_cookies(jar:CookieJar) -> list[dict[str, Any]]:
+    return [
+        {
+            "name" : c.name,
+            "value" : c.value,
+            "domain" : c.domain,
+            "path" : c.path,
+            "expires" : c.expires,
+            "secure" : c.secure,
+        }
+        for c in jar
+    ]
+
+def load_cookies(jar:CookieJar, cookies:list[dict[str, Any]]):
+    # any cookiejar, the requests session's or the `.jar` of httpx's cookies
+    for c in cookies:
+        jar.set_cookie(create_cookie(c["name"], c["value"], domain=c["domain"], path=c["path"], expires=c["expires"], secure=c["secure"]))
+
+class LoginGenerationAdapter(BaseAdapter):
+
+    """
+    Notes on every request which login of `client` its cookies belong to, as `request.login_generation`.
+    Mounted outside the other adapters, so the cookies were prepared just before.
+    """
+
+    def __init__(self, adapter:BaseAdapter, client:"JustpasteBase"):
+        super().__init__()
+        self.adapter = adapter
+        self.client = client
+
+    def send(self, request:requests.PreparedRequest, **kwargs) -> requests.Response:
+        request.login_generation = self.client._login_generation # type: ignore[attr-defined]
+        return self.adapter.send(request, **kwargs)
+
+    def close(self):
+        self.adapter.close()
@@ -1,12 +1,31 @@
 import re
+import copy
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 from .consts import *
 from .utils import *
 from .exceptions import *
 
-class SettingsMixin(JustpasteSessionProto):
+SETTINGS_PAGES : dict[str, tuple[APIEndpoints, RegexPatterns]] = {
+    "profile" : (APIEndpoints.PROFILE_SETTINGS, RegexPatterns.PREMIUM_USER_DATA),
+    "notes" : (APIEndpoints.NOTES_SETTINGS, RegexPatterns.NOTES_SETTINGS_PAGE_SETTINGS),
+    "notification" : (APIEndpoints.NOTIFICATION_SETTINGS, RegexPatterns.NOTIFICATION_SETTINGS_PAGE_SETTINGS),
+    "privacy" : (APIEndpoints.PRIVACY_SETTINGS, RegexPatterns.PRIVACY_SETTINGS_PAGE_SETTINGS),
+}
+
+SETTINGS_SAVE_ENDPOINTS : dict[str, APIEndpoints] = {
+    "notes" : APIEndpoints.NOTES_SETTINGS_SAVE,
+    "notification" : APIEndpoints.NOTIFICATION_SETTINGS_SAVE,
+    "privacy" : APIEndpoints.PRIVACY_SETTINGS_SAVE,
+}
+
+class SettingsStore:
+
+    """
+    Settings state and bookkeeping shared by the sync and async settings mixins.
+    """
 
     settings : dict[Literal['profile', 'notes', 'notification', 'privacy'], dict[str, Any]] = {
         "profile" : {
@@ -34,6 +53,72 @@ class SettingsMixin(JustpasteSessionProto):
         },
 
     }
+
+    def _init_settings(self, state:dict[str, Any]|None=None):
+        # every client gets its own copy, nothing is fetched yet unless a saved session brought some along
+        self.settings = copy.deepcopy(SettingsStore.settings)
+        self.loaded_settings : set[str] = set()
+
+        if state is not None:
+            for category in state.get("loaded_settings", []):
+                self.settings[category].update(state["settings"][category])
+                self.loaded_settings.add(category)
+
+        self._build_category_map()
+
+    def _store_settings(self, category:Literal['profile', 'notes', 'notification', 'privacy'], defaults:dict[str, Any]):
+        for k, v in defaults.items():
+            if k in ("saveSettingsUrl", "isPublic", "profileLink", "avatarUrl", "backgroundUrl"):
+                continue
+            self.settings[category][k] = v
+        self.loaded_settings.add(category)
+
+    def _build_category_map(self):
+        self.category_map : dict[str, str] = {}
+        for category, mapping in self.settings.items():
+            if category == 'profile':
+                self.category_map.update({
+                    k.casefold(): category
+                    for k in
+                    (*mapping.keys(), "photo", "background", "removeBackground")
+                    })
+            else:
+                self.category_map.update({
+                    k.casefold(): category
+                    for k in
+                    mapping.keys()
+                })
+
+    def _profile_form(self, pairs:dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+        files = {}
+        form = {**self.settings["profile"]}
+        for name, value in pairs.items():
+            if name in ('photo', 'background'):
+                files[name] = ('tmp.'+determine_filetype(value), value)
+            else:
+                form[name] = value
+
+        if 'removeBackground' not in pairs:
+            form['removeBackground'] = False
+
+        files['form'] = (None, json.dumps(form))
+        return files, form
+
+    def _group_settings(self, pairs:dict[str, Any]) -> dict[str, dict[str, Any]]:
+        settings_to_update = {}
+
+        for key,value in pairs.items():
+            category = self.category_map.get(key.casefold(), sentinel)
+            if category is sentinel:
+                raise ValueError(f"{key} is not a supported setting")
+            else:
+                if category not in settings_to_update:
+                    settings_to_update[category] = {}
+                settings_to_update[category][key] = value
+
+        return settings_to_update
+
+class SettingsMixin(SettingsStore, JustpasteSessionProto):
         
     def change_password(self, new_password:str):
         form = {
@@ -45,23 +130,14 @@ class SettingsMixin(JustpasteSessionProto):
         resp = self.session.post(APIEndpoints.CHANGE_PASSWORD.value, json=form)
         check_response(resp, APIError, "Could not change password")
 
-        self.__init__(self.email, new_password)
+        self.password = new_password
+        self.session = self._login(self.session)
+        self.save_session()
 
     def _change_setting(self, category:Literal['profile', 'notes', 'notification', 'privacy'], pairs:dict[str, Any]): 
         
         if category == "profile":
-            files = {}
-            form = {**self.settings["profile"]}
-            for name, value in pairs.items():
-                if name in ('photo', 'background'):
-                    files[name] = ('tmp.'+determine_filetype(value), value)
-                else:
-                    form[name] = value
-
-            if 'removeBackground' not in pairs:
-                form['removeBackground'] = False
-
-            files['form'] = (None, json.dumps(form))
+            files, form = self._profile_form(pairs)
 
             self.session.headers['Accept'] = 'application/json, text/plain, */*'
 
@@ -71,67 +147,47 @@ class SettingsMixin(JustpasteSessionProto):
             self.settings['profile'] = without_key(form, 'removeBackground')
 
         else:
+            if category not in SETTINGS_SAVE_ENDPOINTS:
+                raise ValueError(category + ' is not a valid settings category')
+
             self.settings[category].update(pairs)
-            
-            match category:
-                case 'notes':
-                    url = APIEndpoints.NOTES_SETTINGS_SAVE.value
-                case 'notification':
-                    url = APIEndpoints.NOTIFICATION_SETTINGS_SAVE.value
-                case 'privacy':
-                    url = APIEndpoints.PRIVACY_SETTINGS_SAVE.value
-                case _:
-                    raise ValueError(category + ' is not a valid settings category')
+            url = SETTINGS_SAVE_ENDPOINTS[category].value
             
             resp = self.session.post(url, json=self.settings[category])
             check_response(resp, APIError, f"Error while updating {category} settings", (lambda r: r.ok, lambda r: r.json()['success']))
 
 
     def get_settings(self,mode:Literal['profile', 'notes', 'notification', 'privacy']):
-        match mode:
-            case "profile":
-                resp = self.session.get(APIEndpoints.PROFILE_SETTINGS.value)
-                check_response(resp, APIError, "Failed to fetch settings")
-                default_values = json.loads(scrape_from_script_tags(RegexPatterns.PREMIUM_USER_DATA.value, resp.text, 5).group(1))
-            case "notes":
-                resp = self.session.get(APIEndpoints.NOTES_SETTINGS.value)
-                check_response(resp, APIError, "Failed to fetch settings")
-                default_values = json.loads(scrape_from_script_tags(RegexPatterns.NOTES_SETTINGS_PAGE_SETTINGS.value, resp.text, 6).group(1))
-            case "notification":
-                resp = self.session.get(APIEndpoints.NOTIFICATION_SETTINGS.value)
-                check_response(resp, APIError, "Failed to fetch settings")
-                default_values = json.loads(scrape_from_script_tags(RegexPatterns.NOTIFICATION_SETTINGS_PAGE_SETTINGS.value, resp.text, 6).group(1))
-            case "privacy":
-                resp = self.session.get(APIEndpoints.PRIVACY_SETTINGS.value)
-                check_response(resp, APIError, "Failed to fetch settings")
-                default_values = json.loads(scrape_from_script_tags(RegexPatterns.PRIVACY_SETTINGS_PAGE_SETTINGS.value, resp.text, 6).group(1))
-            case _:
-                raise ValueError(f"{mode} is not a valid settings category")
+        if mode not in SETTINGS_PAGES:
+            raise ValueError(f"{mode} is not a valid settings category")
+
+        endpoint, pattern = SETTINGS_PAGES[mode]
+        resp = self.session.get(endpoint.value)
+        check_response(resp, APIError, "Failed to fetch settings")
+        default_values = load_window_assignment(resp.text, pattern)
             
         return default_values
     
-    def load_all_settings(self):
-        for setting in self.settings:
-            defaults = self.get_settings(setting)
-            for k, v in defaults.items():
-                if k in ("saveSettingsUrl", "isPublic", "profileLink", "avatarUrl", "backgroundUrl"):
-                    continue
-                self.settings[setting][k] = v
+    def load_all_settings(self, max_workers:int=4):
+        """
+        Fetches every settings category. The pages are requested concurrently.
+        """
+        categories = [*self.settings]
+        with ThreadPoolExecutor(max_workers, thread_name_prefix="justpaste-settings") as executor:
+            for setting, defaults in zip(categories, executor.map(self.get_settings, categories)):
+                self._store_settings(setting, defaults)
 
-        self.category_map : dict[str, str] = {}
-        for category, mapping in self.settings.items():
-            if category == 'profile':
-                self.category_map.update({
-                    k.casefold(): category
-                    for k in
-                    (*mapping.keys(), "photo", "background", "removeBackground")
-                    })
-            else:
-                self.category_map.update({
-                    k.casefold(): category
-                    for k in
-                    mapping.keys()
-                })
+        self._build_category_map()
+
+    def _ensure_settings_loaded(self, categories:Iterable[str]):
+        missing = [c for c in categories if c not in self.loaded_settings]
+        if not missing:
+            return
+        with ThreadPoolExecutor(len(missing), thread_name_prefix="justpaste-settings") as executor:
+            for setting, defaults in zip(missing, executor.map(self.get_settings, missing)):
+                self._store_settings(setting, defaults)
+
+        self._build_category_map()
 
 
     def change_settings(self, pairs:dict[str, Any], /):
@@ -162,22 +218,14 @@ class SettingsMixin(JustpasteSessionProto):
             - sharedArticleEmailNotification ("always_notify","only_contacts","never_notify"): Sets if the account owner is notified for new shared articles via email.
             - subscribedArticleEmailNotification ("instantly_notify","hourly_notification","daily_notification","weekly_notification","never_notify"): Sets if and when the account owner is notified when there is a new article from subscribed author via email.
         """
-        settings_to_update = {}
+        if "password" in pairs:
+            self.change_password(pairs["password"])
+            pairs = without_key(pairs, "password")
 
-        for key,value in pairs.items():
-            if key == "password":
-                self.change_password(value)
+        settings_to_update = self._group_settings(pairs)
+        self._ensure_settings_loaded(settings_to_update)
 
-            category = self.category_map.get(key.casefold(), sentinel)
-            if category is sentinel:
-                raise ValueError(f"{key} is not a supported setting")
-            else:
-                if category not in settings_to_update:
-                    settings_to_update[category] = {}
-                settings_to_update[category][key] = value
-        
         for category, mapping in settings_to_update.items():
             self._change_setting(category, mapping)
 
-
-                    
\ No newline at end of file
+        self.save_session()
@@ -0,0 +1,239 @@
+import os
+import abc
+import json
+import datetime
+import tempfile
+import threading
+
+from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+
+from .objects import Conversation, Message
+from .ratelimit import Priority, request_priority
+
+if TYPE_CHECKING:
+    from . import Justpaste
+
+DEFAULT_MESSAGE_DIR = os.path.join(os.path.expanduser("~"), ".justpaste", "messages")
+
+class Watermark(BaseModel):
+
+    """
+    How far a conversation has been synced.
+
+    `last_message_date` and `total_messages` are the conversation's when it was last synced, a conversation
+    is only fetched again once the list shows a newer last message or a different total. `message_date` and
+    `message_id` point at the newest stored message, messages are fetched after `message_date` and anything
+    at or before it is dropped. Without a `message_id` everything up to `message_date` counts as seen.
+    """
+
+    last_message_date : datetime.datetime
+    total_messages : int | None = None
+    message_date : datetime.datetime | None = None
+    message_id : int | None = None
+
+    def is_new(self, message:Message) -> bool:
+        if self.message_date is None:
+            return True
+        if self.message_id is None:
+            return message.creation_date > self.message_date
+        return (message.creation_date, message.id) > (self.message_date, self.message_id)
+
+class MessageStore(abc.ABC):
+
+    """
+    Where synced messages and the watermark of every conversation are kept.
+    Subclass it and implement `watermark`, `save` and `messages` to keep them somewhere else.
+    """
+
+    @abc.abstractmethod
+    def watermark(self, conversation_id:int) -> Watermark | None:
+        ...
+
+    @abc.abstractmethod
+    def save(self, conversation_id:int, messages:list[Message], watermark:Watermark) -> None:
+        """
+        Appends `messages`, which are all newer than the previous watermark, and stores `watermark`.
+        """
+
+    @abc.abstractmethod
+    def messages(self, conversation_id:int) -> list[Message]:
+        ...
+
+class MemoryMessageStore(MessageStore):
+
+    def __init__(self):
+        self._watermarks : dict[int, Watermark] = {}
+        self._messages : dict[int, list[Message]] = {}
+        self._lock = threading.Lock()
+
+    def watermark(self, conversation_id:int) -> Watermark | None:
+        return self._watermarks.get(conversation_id)
+
+    def save(self, conversation_id:int, messages:list[Message], watermark:Watermark) -> None:
+        with self._lock:
+            self._messages.setdefault(conversation_id, []).extend(messages)
+            self._watermarks[conversation_id] = watermark
+
+    def messages(self, conversation_id:int) -> list[Message]:
+        return [*self._messages.get(conversation_id, [])]
+
+class JsonlMessageStore(MessageStore):
+
+    """
+    Appends the messages of every conversation to `<directory>/<conversation id>.jsonl`
+    and keeps the watermarks in `<directory>/watermarks.json`.
+
+    Messages are written before their watermark, so a crash in between
+    fetches those messages again on the next sync.
+    """
+
+    def __init__(self, directory:str|os.PathLike=DEFAULT_MESSAGE_DIR):
+        self.directory = os.fspath(directory)
+        self._lock = threading.Lock()
+        self._watermarks : dict[int, Watermark] | None = None
+
+    @property
+    def watermarks_path(self) -> str:
+        return os.path.join(self.directory, "watermarks.json")
+
+    def messages_path(self, conversation_id:int) -> str:
+        return os.path.join(self.directory, f"{conversation_id}.jsonl")
+
+    def _load_watermarks(self) -> dict[int, Watermark]:
+        if self._watermarks is None:
+            try:
+                with open(self.watermarks_path, 'r', encoding='utf-8') as f:
+                    self._watermarks = {int(k) : Watermark.model_validate(v) for k, v in json.load(f).items()}
+            except FileNotFoundError:
+                self._watermarks = {}
+        return self._watermarks
+
+    def _write_watermarks(self):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.watermarks-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({str(k) : w.model_dump(mode='json') for k, w in self._watermarks.items()}, f)
+            os.replace(tmp, self.watermarks_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def watermark(self, conversation_id:int) -> Watermark | None:
+        with self._lock:
+            return self._load_watermarks().get(conversation_id)
+
+    def save(self, conversation_id:int, messages:list[Message], watermark:Watermark) -> None:
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if messages:
+                with open(self.messages_path(conversation_id), 'a', encoding='utf-8') as f:
+                    f.writelines(m.model_dump_json() + '\n' for m in messages)
+            self._load_watermarks()[conversation_id] = watermark
+            self._write_watermarks()
+
+    def messages(self, conversation_id:int) -> list[Message]:
+        try:
+            with open(self.messages_path(conversation_id), 'r', encoding='utf-8') as f:
+                return [Message.model_validate_json(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+class MessageSyncBase:
+
+    """
+    Decides what to fetch and what to keep, shared by `MessageSync` and `AsyncMessageSync`.
+    """
+
+    def __init__(self, store:MessageStore|None=None):
+        self.store = store if store is not None else MemoryMessageStore()
+
+    def changed(self, conversations:list[Conversation]) -> list[tuple[Conversation, Watermark|None]]:
+        """
+        Conversations whose last message date or message count moved past their watermark, with that watermark.
+        """
+        changed = []
+        for conversation in conversations:
+            watermark = self.store.watermark(conversation.id)
+            if (watermark is None
+                or conversation.last_message_date > watermark.last_message_date
+                or (watermark.total_messages is not None and conversation.total_messages != watermark.total_messages)):
+                changed.append((conversation, watermark))
+        return changed
+
+    def seed(self, conversations:list[Conversation]):
+        """
+        Marks everything up to now as synced for conversations without a watermark, without fetching them.
+        """
+        for conversation in conversations:
+            if self.store.watermark(conversation.id) is None:
+                self.store.save(conversation.id, [], Watermark(
+                    last_message_date=conversation.last_message_date,
+                    total_messages=conversation.total_messages,
+                    message_date=conversation.last_message_date))
+
+    def apply(self, conversation:Conversation, watermark:Watermark|None, fetched:list[Message]) -> list[Message]:
+        """
+        Stores the messages newer than `watermark`, moves the watermark and returns the new messages.
+        """
+        if watermark is None:
+            watermark = Watermark(last_message_date=conversation.last_message_date)
+
+        new = sorted((m for m in fetched if watermark.is_new(m)), key=lambda m: (m.creation_date, m.id))
+        if new:
+            watermark = watermark.model_copy(update={"message_date" : new[-1].creation_date, "message_id" : new[-1].id})
+        watermark = watermark.model_copy(update={"last_message_date" : conversation.last_message_date, "total_messages" : conversation.total_messages})
+
+        self.store.save(conversation.id, new, watermark)
+        return new
+
+class MessageSync(MessageSyncBase):
+
+    """
+    Keeps a `MessageStore` in sync with the account's conversations.
+
+    Every `sync()` lists conversations once, then fetches messages only for conversations whose
+    last message date changed, and only the messages after that conversation's watermark.
+
+    ```python
+    sync = MessageSync(jp, JsonlMessageStore("messages"))
+    for conversation, messages in sync.sync():
+        ...
+    ```
+    """
+
+    def __init__(self, client:"Justpaste", store:MessageStore|None=None):
+        super().__init__(store)
+        self.client = client
+
+    def sync(self, max_workers:int=4, conversations:list[Conversation]|None=None) -> list[tuple[Conversation, list[Message]]]:
+        """
+        Syncs every changed conversation.
+
+        ### Parameters:
+        - max_workers: Max. no. of conversations fetched at the same time. Default=4
+        - conversations: An already fetched `list_conversations(hydrate_users=False)`. Default=None
+
+        Returns the conversations that got new messages, with those messages, oldest first.
+        """
+        if conversations is None:
+            with request_priority(Priority.NORMAL):
+                conversations = self.client.list_conversations(hydrate_users=False)
+        changed = self.changed(conversations)
+        if not changed:
+            return []
+
+        def fetch(item:tuple[Conversation, Watermark|None]) -> list[Message]:
+            conversation, watermark = item
+            with request_priority(Priority.NORMAL):
+                return self.client.get_messages(conversation, after=watermark.message_date if watermark else None)
+
+        synced = []
+        with ThreadPoolExecutor(max_workers, thread_name_prefix="justpaste-sync") as executor:
+            for (conversation, watermark), fetched in zip(changed, executor.map(fetch, changed)):
+                new = self.apply(conversation, watermark, fetched)
+                if new:
+                    synced.append((conversation, new))
+        return synced
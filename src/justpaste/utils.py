@@ -1,9 +1,9 @@
-from bs4 import BeautifulSoup
 import re
 import json
 import html
 import base64
 import datetime
+import functools
 
 from urllib.parse import urlparse
 
@@ -11,10 +11,11 @@ from .objects import *
 from .consts import *
 from .exceptions import RequireDynamicLoading
 
-from typing import Any, Generator, Iterable, TypeVar, Unpack
-from bs4 import NavigableString, Tag
+from typing import Any, Callable, Generator, Iterable, TypeVar, Unpack
 
 T = TypeVar('T')
+M = TypeVar('M', bound=BaseModel)
+L = TypeVar('L', bound=LazyQRCode)
 
 def without_key(d:dict[T, Any], *ks:T) -> dict:
     d_copy = {}
@@ -41,11 +42,15 @@ def delta_to_datetime(deltastr:str) -> datetime.datetime:
 
     return current - delta
 
+@functools.cache
 def camel_case_to_snake_case(string:str) -> str:
+    # the API only ever sends a handful of distinct keys, so every translation is worth keeping
     matches : list[str] = CAMEL_TO_SNAKE_REGEX.findall(string)
     return '_'.join(m.lower() for m in matches)
 
 def scrape_from_tags(tag:str, regex:re.Pattern, page_source:str, index:int|None=None) -> re.Match:
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(page_source,"html.parser")
     scripts = soup.find_all(tag)
     results = None
@@ -67,6 +72,72 @@ def scrape_from_tags(tag:str, regex:re.Pattern, page_source:str, index:int|None=
 def scrape_from_script_tags(regex:re.Pattern, page_source:str, index:int|None=None) -> re.Match:
     return scrape_from_tags("script", regex, page_source, index)
 
+WINDOW_ASSIGNMENT_PATTERNS = tuple(p for p in RegexPatterns if p.value.pattern.startswith(r"window\."))
+
+class ParsedPage:
+    """
+    Page source that is parsed only once. Every `window.xxx = ...;` assignment
+    listed in `RegexPatterns`, the article title and the `#articleContent` node
+    are picked up in the same pass so the `extract_*` functions can share it.
+    """
+
+    def __init__(self, page_source:str):
+        from bs4 import BeautifulSoup
+
+        self.page_source = page_source
+        self.assignments : dict[RegexPatterns, re.Match] = {}
+
+        soup = BeautifulSoup(page_source, "html.parser")
+
+        for script in soup.find_all("script"):
+            script_source = str(script)
+            if "window." not in script_source:
+                continue
+            for pattern in WINDOW_ASSIGNMENT_PATTERNS:
+                if pattern not in self.assignments:
+                    match = pattern.value.search(script_source)
+                    if match is not None:
+                        self.assignments[pattern] = match
+
+        self.title_tag = soup.find('h1', {'class' : "articleFirstTitle"})
+        self.content_tag = soup.find('div', {'id' : "articleContent"})
+
+    def match(self, pattern:RegexPatterns) -> re.Match:
+        try:
+            return self.assignments[pattern]
+        except KeyError:
+            raise RuntimeError(f"Regex ({repr(pattern.value)}) returned 0 results") from None
+
+    def load(self, pattern:RegexPatterns) -> Any:
+        return json.loads(self.match(pattern).group(1))
+
+def parse_page(page:"str | ParsedPage") -> ParsedPage:
+    if isinstance(page, ParsedPage):
+        return page
+    return ParsedPage(page)
+
+JSON_DECODER = json.JSONDecoder()
+
+def scan_window_assignment(pattern:RegexPatterns, page_source:str) -> Any:
+    # finds `window.xxx = ` in the raw text and decodes the JSON value that follows it, no DOM involved
+    match = pattern.value.search(page_source)
+    if match is None:
+        raise ValueError(f"Regex ({repr(pattern.value)}) returned 0 results")
+    value, _ = JSON_DECODER.raw_decode(page_source, match.start(1))
+    return value
+
+def load_window_assignments(page_source:str|ParsedPage, *patterns:RegexPatterns) -> list[Any]:
+    if not isinstance(page_source, ParsedPage):
+        try:
+            return [scan_window_assignment(pattern, page_source) for pattern in patterns]
+        except ValueError:
+            # page layout changed, let the HTML parser have a go
+            page_source = ParsedPage(page_source)
+    return [page_source.load(pattern) for pattern in patterns]
+
+def load_window_assignment(page_source:str|ParsedPage, pattern:RegexPatterns) -> Any:
+    return load_window_assignments(page_source, pattern)[0]
+
 def determine_filetype(b:bytes):
     _hex = b.hex().upper()
     for k,v in FILE_MAGIC_BYTES.items():
@@ -74,207 +145,269 @@ def determine_filetype(b:bytes):
             return k
     raise RuntimeError("File type not found")
 
+def parse_short_date(v:str) -> datetime.datetime:
+    if v.count(' ') == 1:
+        # Jun 7
+        month, day = v.split(' ')
+        year = datetime.datetime.now().year
+    elif v.count(' ') == 2:
+        # Jun 7, 2022
+        month, day, year = v.split(' ')
+        day = day.strip(',')
+    else:
+        raise NotImplementedError(f"Cannot parse {v}")
+
+    return _strptime_short_date(month, day, int(year))
+
+@functools.lru_cache(maxsize=4096)
+def _strptime_short_date(month:str, day:str, year:int) -> datetime.datetime:
+    # previews on a page mostly share a handful of dates, and strptime is slow
+    if len(day) == 1:
+        day = '0'+day
+    # Jun 07 2022
+    return datetime.datetime.strptime(f"{month} {day} {year}", '%b %d %Y')
+
+def parse_relative_or_short_date(v:str) -> datetime.datetime:
+    if v.count(' ') == 0:
+        # 5h, 32m, 10s etc
+        return delta_to_datetime(v)
+    return parse_short_date(v)
+
+def parse_count(v:str) -> int:
+    return int(v.replace(',', ''))
+
+def parse_optional_count(v:str|None) -> int | None:
+    return None if v is None else parse_count(v)
+
+def parse_loose_count(v:str|int|None) -> int | None:
+    return parse_count(v) if isinstance(v, str) else v
+
+def decode_qr_code(v:str) -> bytes:
+    return base64.b64decode(v.partition('base64,')[2])
+
+def parse_message_content(v:str) -> str:
+    if "<span" in v:
+        match = RegexPatterns.MESSAGE_EMOJI_ONLYEMOJI.value.fullmatch(v)
+        if match:
+            return match.group(3)
+        match = RegexPatterns.MESSAGE_EMOJI_ANYEMOJI.value.fullmatch(v)
+        if match:
+            return match.group(1) + match.group(3) + match.group(5)
+    return v
+
+FieldMap = dict[str, tuple[str, Callable[[Any], Any] | None]]
+
+def translate_keys(raw:dict[str, Any], field_map:FieldMap) -> dict[str, Any]:
+    # keys not in the map are snake cased as they are and remembered for the next object
+    cleaned = {}
+    for k, v in raw.items():
+        field = field_map.get(k)
+        if field is None:
+            field = field_map[k] = (camel_case_to_snake_case(k), None)
+        key, convert = field
+        cleaned[key] = v if convert is None else convert(v)
+    return cleaned
+
 class ModelInitializer:
 
+    # QR codes are kept encoded and decoded on first access, False drops them
+    KEEP_QR_CODES : bool = True
+
+    ARTICLE_FIELDS : FieldMap = {
+        'qrCodeData' : ('qr_code_data', None),
+        'createdText' : ('created_at', datetime.datetime.fromisoformat),
+        'modifiedText' : ('modified_at', datetime.datetime.fromisoformat),
+        'viewsText' : ('views', parse_loose_count),
+        'onlineText' : ('online', parse_loose_count),
+        'premiumUserData' : ('publisher', None),
+        'isArticleOwner' : ('is_owner', None),
+    }
+
+    PUBLIC_ARTICLE_PREVIEW_FIELDS : FieldMap = {
+        'createdDate' : ('created_at', parse_short_date),
+        'visits' : ('visits', parse_optional_count),
+        'favouriteCount' : ('favourite_count', parse_optional_count),
+        'positive' : ('positive_votes', None),
+        'negative' : ('negative_votes', None),
+    }
+
+    USER_SHORT_FIELDS : FieldMap = {
+        'userLink' : ('user_link', lambda v: ROOT+v),
+    }
+
+    INTERLOCUTOR_FIELDS : FieldMap = {
+        'name' : ('user_name', None),
+        'url' : ('user_link', None),
+    }
+
+    USER_FIELDS : FieldMap = {
+        'qrCodeData' : ('qr_code_data', None),
+        'joinedHowLongAgo' : ('join_date', parse_short_date),
+    }
+
+    ARTICLE_PREVIEW_FIELDS : FieldMap = {
+        'uniqueViews' : ('unique_views', parse_count),
+        'online' : ('online', parse_count),
+        'favouriteCount' : ('favourite_count', parse_count),
+        'created' : ('created_at', parse_relative_or_short_date),
+        'positive' : ('positive_votes', None),
+        'negative' : ('negative_votes', None),
+    }
+
+    MESSAGE_FIELDS : FieldMap = {
+        'lastUpdateDate' : ('last_update_date', datetime.datetime.fromisoformat),
+        'creationDate' : ('creation_date', datetime.datetime.fromisoformat),
+        'content' : ('content', parse_message_content),
+    }
+
+    CONVERSATION_FIELDS : FieldMap = {
+        'lastMessageDate' : ('last_message_date', datetime.datetime.fromisoformat),
+    }
+
+    TOTAL_STATS_FIELDS : FieldMap = {
+        'totalViews' : ('total_views', parse_count),
+        'totalFavourite' : ('total_favorite', None),
+    }
+
+    @classmethod
+    def build(cls, model:type[M], data:dict[str, Any]) -> M:
+        return model(**data)
+
+    @classmethod
+    @functools.cache
+    def without_qr_codes(cls) -> type["ModelInitializer"]:
+        return type(f"{cls.__name__}WithoutQRCodes", (cls,), {"KEEP_QR_CODES" : False})
+
+    @classmethod
+    def build_lazy_qr_code(cls, model:type[L], data:dict[str, Any]) -> L:
+        raw = data.pop('qr_code_data', None)
+        obj = cls.build(model, data)
+        if raw is not None and cls.KEEP_QR_CODES:
+            obj._defer_qr_code(raw)
+        return obj
+
     @classmethod
     def article(cls, raw:dict[str, Any]) -> Article | OwnArticle:
-        cleaned = {}
         if raw['isArticleOwner'] == True:
             clss = OwnArticle
         else:
             clss = Article
 
-        for k, v in raw.items():
-            match k:
-                case 'qrCodeData':
-                    v = base64.b64decode(v.partition('base64,')[2])
-                case 'createdText' | 'modifiedText':
-                    k = k.strip('Text') + 'At'
-                    v = datetime.datetime.fromisoformat(v)
-                case 'viewsText' | 'onlineText':
-                    k = k.strip('Text')
-                    if isinstance(v, str):
-                        v = int(v.replace(',', ''))
-                case 'premiumUserData':
-                    if v is not None:
-                        k = "publisher"
-                        v['userLink'] = ROOT+v['userLink']
-                        v = {camel_case_to_snake_case(_k) : _v for _k, _v in v.items()}
-                case 'isArticleOwner':
-                    k = 'isOwner'
-
-                case 'premiumUserData':
-                    k = 'publisher'
-                    v = cls.user_short(v)
-
-            cleaned[camel_case_to_snake_case(k)] = v
-
-        return clss(**cleaned)
+        cleaned = translate_keys(raw, cls.ARTICLE_FIELDS)
+        if cleaned.get('publisher') is not None:
+            cleaned['publisher'] = cls.user_short(cleaned['publisher'])
+        return cls.build_lazy_qr_code(clss, cleaned)
 
     @classmethod
     def public_article_preview(cls, raw:dict[str, Any]) -> PublicArticlePreview:
-        cleaned = {}
-
-        for k, v in raw.items():
-            match k:
-                case 'createdDate':
-                    k = 'createdAt'
-                    if v.count(' ') == 1:
-                        # Jun 7
-                        month, day = v.split(' ')
-                        year = datetime.datetime.now().year
-                    elif v.count(' ') == 2:
-                        # Jun 7, 2022
-                        month, day, year = v.split(' ')
-                        day = day.strip(',')
-                    else:
-                        raise NotImplementedError(f"Cannot parse {v}")
-                    
-                    if len(day) == 1:
-                        day = '0'+day
-                    # Jun 07 2022
-                    v = datetime.datetime.strptime(f"{month} {day} {year}", '%b %d %Y')
-                case 'visits' | 'favouriteCount':
-                    if v is not None:
-                        v = int(v.replace(',', ''))
-                case 'positive' | 'negative':
-                    k += 'Votes'
-
-            cleaned[camel_case_to_snake_case(k)] = v
-
-        return PublicArticlePreview(**cleaned)
+        return cls.build(PublicArticlePreview, translate_keys(raw, cls.PUBLIC_ARTICLE_PREVIEW_FIELDS))
 
     @classmethod
     def user_short(cls, raw:dict[str, Any]) -> UserShort:
-        cleaned = {}
-
-        for k, v in raw.items():
-            match k:
-                case 'userLink':
-                    v = ROOT+v
-            
-            cleaned[camel_case_to_snake_case(k)] = v
-        
-        return UserShort(**cleaned)
+        return cls.build(UserShort, translate_keys(raw, cls.USER_SHORT_FIELDS))
+
+    @classmethod
+    def interlocutor(cls, raw:dict[str, Any]) -> UserShort:
+        return cls.build(UserShort, translate_keys(raw, cls.INTERLOCUTOR_FIELDS))
 
     @classmethod
     def user(cls, raw:dict[str, Any]) -> User:
-        cleaned = {}
-
-        for k, v in raw.items():
-            match k:
-                case 'qrCodeData':
-                    v = base64.b64decode(v.partition('base64,')[2])
-                case 'joinedHowLongAgo':
-                    k = 'joinDate'
-                    # Jun 7, 2022
-                    month, day, year = v.split(' ')
-                    day = day.strip(',')
-                    if len(day) == 1:
-                        day = '0'+day
-                    # Jun 07 2022
-                    v = datetime.datetime.strptime(f"{month} {day} {year}", '%b %d %Y')
-
-            cleaned[camel_case_to_snake_case(k)] = v
-
-        return User(**cleaned)
+        return cls.build_lazy_qr_code(User, translate_keys(raw, cls.USER_FIELDS))
 
     @classmethod
     def article_preview(cls, raw:dict[str, Any]) -> ArticlePreview:
-        cleaned = {}
-
-        for k, v in raw.items():
-            match k:
-                case 'uniqueViews' | 'online' | 'favouriteCount':
-                    v = int(v.replace(',', ''))
-                case 'created':
-                    k = 'createdAt'
-                    if v.count(' ') == 0:
-                        # 5h, 32m, 10s etc
-                        v = delta_to_datetime(v)
-                    else:
-                        if v.count(' ') == 1:
-                            # Jun 7
-                            month, day = v.split(' ')
-                            year = datetime.datetime.now().year
-                        elif v.count(' ') == 2:
-                            # Jun 7, 2022
-                            month, day, year = v.split(' ')
-                            day = day.strip(',')
-                        else:
-                            raise NotImplementedError(f"Cannot parse {v}")
-
-                        if len(day) == 1:
-                            day = '0'+day
-                        # Jun 07 2022
-                        v = datetime.datetime.strptime(f"{month} {day} {year}", '%b %d %Y')
-                case 'positive' | 'negative':
-                    k += 'Votes'
-            cleaned[camel_case_to_snake_case(k)] = v
-
-        return ArticlePreview(**cleaned)
+        return cls.build(ArticlePreview, translate_keys(raw, cls.ARTICLE_PREVIEW_FIELDS))
 
     @classmethod
     def message(cls, raw:dict[str, Any]) -> Message:
-        cleaned = {}
-
-        for k, v in raw.items():
-            match k:
-                case 'lastUpdateDate' | 'creationDate':
-                    v = datetime.datetime.fromisoformat(v)
-                case 'content':
-                    if "<span" in v:
-                        match = RegexPatterns.MESSAGE_EMOJI_ONLYEMOJI.value.fullmatch(v)
-                        if match:
-                            v = match.group(3)
-                        else:
-                            match = RegexPatterns.MESSAGE_EMOJI_ANYEMOJI.value.fullmatch(v)
-                            if match:
-                                v = match.group(1) + match.group(3) + match.group(5)
-            cleaned[camel_case_to_snake_case(k)] = v
-
-        return Message(**cleaned)
+        return cls.build(Message, translate_keys(raw, cls.MESSAGE_FIELDS))
 
     @classmethod
-    def conversation(cls, raw:dict[str, Any], user:User|None=None, messages:list[Message]=[]) -> Conversation:
-        cleaned = {}
-
-        for k, v in raw.items():
-            match k:
-                case "lastMessageDate":
-                    v = datetime.datetime.fromisoformat(v)
-
-            cleaned[camel_case_to_snake_case(k)] = v
-
+    def conversation(cls, raw:dict[str, Any], user:User|UserShort|None=None, messages:list[Message]=[]) -> Conversation:
+        cleaned = translate_keys(raw, cls.CONVERSATION_FIELDS)
         cleaned['user'] = user
         cleaned['messages'] = messages
 
-        return Conversation(**cleaned)
+        return cls.build(Conversation, cleaned)
 
     @classmethod
     def total_stats(cls, raw:dict[str, Any]) -> TotalStats:
-        cleaned = {}
+        cleaned = translate_keys(raw, cls.TOTAL_STATS_FIELDS)
+        return cls.build(TotalStats, {k : int(v) for k, v in cleaned.items()})
+
+@functools.cache
+def model_layout(model:type[BaseModel]) -> tuple[frozenset[str], dict[str, Any], dict[str, Any] | None]:
+    # field names, the defaults of optional fields and of private attributes, worked out once per model
+    defaults = {name : field.default for name, field in model.model_fields.items() if not field.is_required()}
+    private = {name : attr.get_default() for name, attr in model.__private_attributes__.items()} or None
+    return frozenset(model.model_fields), defaults, private
+
+def construct_trusted(model:type[M], data:dict[str, Any]) -> M:
+    """
+    Builds `model` from already converted values without validating them. Keys that aren't fields are dropped
+    and missing optional fields get their defaults. Faster than `model.model_construct`, which still copies
+    and checks every field in Python.
+    """
+    names, defaults, private = model_layout(model)
+    if data.keys() <= names:
+        values = {**defaults, **data}
+        fields_set = set(data)
+    else:
+        values = defaults.copy()
+        values.update((name, data[name]) for name in names if name in data)
+        fields_set = names & data.keys()
+
+    obj = model.__new__(model)
+    object.__setattr__(obj, '__dict__', values)
+    object.__setattr__(obj, '__pydantic_fields_set__', fields_set)
+    object.__setattr__(obj, '__pydantic_extra__', None)
+    object.__setattr__(obj, '__pydantic_private__', None if private is None else private.copy())
+    return obj
 
-        for k, v in raw.items():
-            match k:
-                case 'totalViews':
-                    v = v.replace(',', '')
-                case 'totalFavourite':
-                    k = 'totalFavorite'
+class TrustedModelInitializer(ModelInitializer):
 
-            cleaned[camel_case_to_snake_case(k)] = int(v)
+    """
+    Builds models from pages and API responses without validating them again, for bulk loads where
+    validation dominates. Values are kept as the field maps convert them: url fields hold plain `str`
+    instead of `HttpUrl`, so dump such models with `model_dump(warnings=False)`.
+    """
 
-        return TotalStats(**cleaned)
+    @classmethod
+    def build(cls, model:type[M], data:dict[str, Any]) -> M:
+        return construct_trusted(model, data)
+
+class LiteModelInitializer(TrustedModelInitializer):
 
-def extract_article_metadata(page_source:str) -> dict[str, Any]:
+    """
+    `TrustedModelInitializer` that builds previews as `__slots__` objects (`LitePublicArticlePreview`,
+    `LiteArticlePreview`) instead of models. `to_model()` turns one into the validated model.
+    """
+
+    @classmethod
+    def public_article_preview(cls, raw:dict[str, Any]) -> LitePublicArticlePreview: # type: ignore[override]
+        return LitePublicArticlePreview(translate_keys(raw, cls.PUBLIC_ARTICLE_PREVIEW_FIELDS))
+
+    @classmethod
+    def article_preview(cls, raw:dict[str, Any]) -> LiteArticlePreview: # type: ignore[override]
+        return LiteArticlePreview(translate_keys(raw, cls.ARTICLE_PREVIEW_FIELDS))
+
+MODEL_INITIALIZERS : dict[str, type[ModelInitializer]] = {
+    "validated" : ModelInitializer,
+    "trusted" : TrustedModelInitializer,
+    "lite" : LiteModelInitializer,
+}
+
+def extract_article_metadata(page_source:str|ParsedPage) -> dict[str, Any]:
     article_metadata = {}
-    article_metadata.update(json.loads(scrape_from_script_tags(RegexPatterns.ARTICLE.value, page_source, 1).group(1)))
-    article_metadata.update(json.loads(scrape_from_script_tags(RegexPatterns.BAR_OPTIONS.value, page_source, 1).group(1)))
+    for data in load_window_assignments(page_source, RegexPatterns.ARTICLE, RegexPatterns.BAR_OPTIONS):
+        article_metadata.update(data)
     return article_metadata
 
-def extract_article_content(page_source:str, article_id:int, dynamic_content:str|None=None) -> dict[str, Any]:
-    soup = BeautifulSoup(page_source, 'html.parser')
-    article_title_tag = soup.find('h1', {'class' : "articleFirstTitle"})
+def extract_article_content(page_source:str|ParsedPage, article_id:int, dynamic_content:str|None=None) -> dict[str, Any]:
+    from bs4 import NavigableString
+
+    page = parse_page(page_source)
+    article_title_tag = page.title_tag
     assert not (isinstance(article_title_tag, NavigableString))
 
     if article_title_tag:
@@ -285,7 +418,7 @@ def extract_article_content(page_source:str, article_id:int, dynamic_content:str
     if dynamic_content:
         article_content = dynamic_content
     else:
-        article_content_tag = soup.find('div', {'id' : "articleContent"})
+        article_content_tag = page.content_tag
         assert not (isinstance(article_content_tag, NavigableString))
 
         if article_content_tag:
@@ -296,13 +429,17 @@ def extract_article_content(page_source:str, article_id:int, dynamic_content:str
 
     return {'title':article_title, 'body':article_content}
 
-def extract_user_metadata(page_source:str) -> dict[str, Any]:
+def extract_user_metadata(page_source:str|ParsedPage) -> dict[str, Any]:
     raw = {}
-    raw.update(json.loads(scrape_from_script_tags(RegexPatterns.PAGE_PREMIUM_USER.value, page_source, 1).group(1)))
-    raw.update(json.loads(scrape_from_script_tags(RegexPatterns.SHOW_PREMIUM_USER.value, page_source, 1).group(1)))
+    for data in load_window_assignments(page_source, RegexPatterns.PAGE_PREMIUM_USER, RegexPatterns.SHOW_PREMIUM_USER):
+        raw.update(data)
     return raw
 
-def extract_article(url:str | HttpUrl, page_source:str, dynamic_content:str|None=None) -> Article | OwnArticle:
+def extract_pagination(page_source:str|ParsedPage) -> dict[str, Any]:
+    return load_window_assignment(page_source, RegexPatterns.PAGINATION)
+
+def extract_article(url:str | HttpUrl, page_source:str|ParsedPage, dynamic_content:str|None=None, initializer:type[ModelInitializer]=ModelInitializer) -> Article | OwnArticle:
+    page = parse_page(page_source)
     raw = {}
     if isinstance(url, str):
         raw['path'] = urlparse(url).path
@@ -310,29 +447,29 @@ def extract_article(url:str | HttpUrl, page_source:str, dynamic_content:str|None
         raw['path'] = url.path
     else:
         raise TypeError('URL should either be a string or support path extraction')
-    raw.update(extract_article_metadata(page_source))
+    raw.update(extract_article_metadata(page))
 
-    raw.update(extract_article_content(page_source, raw['id'], dynamic_content))
+    raw.update(extract_article_content(page, raw['id'], dynamic_content))
 
-    return ModelInitializer.article(raw)
+    return initializer.article(raw)
 
-def extract_public_article_previews(*page_sources:str) -> Generator[PublicArticlePreview, None, None]:
+def extract_public_article_previews(*page_sources:str|ParsedPage, initializer:type[ModelInitializer]=ModelInitializer) -> Generator[PublicArticlePreview, None, None]:
     for page_source in page_sources:
-        for article_raw in json.loads(scrape_from_script_tags(RegexPatterns.PUBLIC_ARTICLES_DATA.value, page_source, 1).group(1)):
-            yield ModelInitializer.public_article_preview(article_raw)
+        for article_raw in load_window_assignment(page_source, RegexPatterns.PUBLIC_ARTICLES_DATA):
+            yield initializer.public_article_preview(article_raw)
 
-def extract_article_previews(*page_sources:str) -> Generator[ArticlePreview, None, None]:
+def extract_article_previews(*page_sources:str|ParsedPage, initializer:type[ModelInitializer]=ModelInitializer) -> Generator[ArticlePreview, None, None]:
     for page_source in page_sources:
-        for article_raw in json.loads(scrape_from_script_tags(RegexPatterns.ARTICLES_DATA.value, page_source, 1).group(1)):
-            yield ModelInitializer.article_preview(article_raw)
+        for article_raw in load_window_assignment(page_source, RegexPatterns.ARTICLES_DATA):
+            yield initializer.article_preview(article_raw)
 
-def extract_user(page_source:str, public_articles:list[PublicArticlePreview]) -> User:
+def extract_user(page_source:str|ParsedPage, public_articles:list[PublicArticlePreview], initializer:type[ModelInitializer]=ModelInitializer) -> User:
     raw = {'public_articles':public_articles, **extract_user_metadata(page_source)}
-    return ModelInitializer.user(raw)
+    return initializer.user(raw)
 
-def extract_total_stats(page_source:str) -> TotalStats:
-    raw = json.loads(scrape_from_script_tags(RegexPatterns.ARTICLES_STATS_DATA.value, page_source, 5).group(1))
-    return ModelInitializer.total_stats(raw)
+def extract_total_stats(page_source:str|ParsedPage, initializer:type[ModelInitializer]=ModelInitializer) -> TotalStats:
+    raw = load_window_assignment(page_source, RegexPatterns.ARTICLES_STATS_DATA)
+    return initializer.total_stats(raw)
 
 SAVE_ARTICLE_CONSTRUCTOR_MAP = [
     ("article_id", "articleId"),
@@ -372,6 +509,32 @@ def _parse_existing_response(existing:dict[str, Any]) -> dict[str, Any]:
 
     return new
 
+def patch_article(article:OwnArticle, saved:SaveArticleData, url:str, loader:Callable[[], OwnArticle]|None=None) -> EditedArticle:
+    """
+    Applies a submitted `SaveArticleData` to a copy of `article`, without validating it again.
+    `loader` reloads the article once a field in `EditedArticle.SERVER_FIELDS` is read.
+    Without one, those fields keep their values from before the edit.
+    """
+    fields = dict(article.__dict__)
+    fields.update(
+        title=saved.title,
+        body=saved.content,
+        url=HttpUrl(url),
+        path=urlparse(url).path,
+        visibility_level=saved.visibilityLevel,
+        is_password_protected=bool(saved.password),
+        is_captcha_required=saved.articleViewRequiresCaptcha,
+    )
+    edited = EditedArticle.model_construct(article.model_fields_set | fields.keys(), **fields)
+    if 'qr_code_data' not in article.__dict__ and article._qr_code_raw is not None:
+        edited._defer_qr_code(article._qr_code_raw)
+    if loader is not None:
+        # drop them so the first read goes to the loader
+        for field in EditedArticle.SERVER_FIELDS:
+            edited.__dict__.pop(field, None)
+        edited._loader = loader
+    return edited
+
 def construct_save_json(article_id:int,
                    secure_code:str,
                    *,
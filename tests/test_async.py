@@ -0,0 +1,101 @@
+import os
+import sys
+import asyncio
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste
+from justpaste import FileSessionStore, PageCache, RequestScheduler, RateLimit, Priority, request_priority, RetryPolicy, ConnectionOptions
+from justpaste.consts import ROOT
+from justpaste.aio import AsyncMessageSync
+
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MockJustpaste(notes_pages=2, per_page=5, conversations=2, messages=3).__enter__()
+
+    async def asyncTearDown(self):
+        self.server.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    async def test_cached_article(self):
+        cache = PageCache(ttl=300)
+        async with self.server.async_client(cache=cache) as jp:
+            first = await jp.article_from_url("https://justpaste.it/bench1000")
+            second = await jp.article_from_url("https://justpaste.it/bench1000")
+        self.assertEqual(first, second)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    async def test_restored_session_and_relogin(self):
+        store = FileSessionStore(os.path.join(self.tmp.name, "sessions.json"))
+        async with self.server.async_client(session_store=store):
+            pass
+        self.assertIsNotNone(store.load("bench@example.com"))
+
+        async with self.server.async_client(session_store=store) as jp:
+            self.assertEqual(self.server.server.logins, 1)
+            self.server.expire_sessions()
+            previews = [preview async for preview in jp.get_own_article_previews()]
+            [preview async for preview in jp.get_own_article_previews()]
+        self.assertEqual(len(previews), 10)
+        self.assertEqual(self.server.server.logins, 2)
+
+    async def test_message_sync(self):
+        async with self.server.async_client() as jp:
+            sync = AsyncMessageSync(jp)
+            self.assertEqual(sorted((c.id, len(m)) for c, m in await sync.sync()), [(0, 3), (1, 3)])
+            self.assertEqual(await sync.sync(), [])
+            self.server.receive_messages(1)
+            self.assertEqual(sorted((c.id, [m.id for m in ms]) for c, ms in await sync.sync()), [(0, [3]), (1, [3])])
+        self.assertEqual(self.server.server.requests["messages"], 4)
+
+    async def test_listener(self):
+        async with self.server.async_client() as jp:
+            batches : asyncio.Queue = asyncio.Queue()
+            async def deliver(conversation, messages):
+                await batches.put((conversation.id, [m.id for m in messages]))
+
+            listener = jp.listen(deliver, min_interval=0.02, max_interval=0.05, coalesce=0, include_own=True)
+            while listener.stats.polls < 1:
+                await asyncio.sleep(0.01)
+            self.server.receive_messages(1)
+            delivered = sorted([await asyncio.wait_for(batches.get(), 5) for _ in range(2)])
+            await listener.stop()
+        self.assertEqual(delivered, [(0, [3]), (1, [3])])
+        self.assertEqual(listener.stats.as_dict()["delivered"], 2)
+
+    async def test_scheduler(self):
+        scheduler = RequestScheduler(site=RateLimit(100, burst=10))
+        async with self.server.async_client(scheduler=scheduler) as jp:
+            with request_priority(Priority.BULK):
+                previews = [preview async for preview in jp.get_own_article_previews()]
+        self.assertEqual(len(previews), 10)
+        self.assertEqual(scheduler.stats()[ROOT]["acquired"]["BULK"], 2)
+
+    async def test_retry(self):
+        policy = RetryPolicy(total=3, backoff=0)
+        async with self.server.async_client(retry=policy) as jp:
+            article = await jp.article_from_url("https://justpaste.it/own1000")
+            self.server.fail_next("manage")
+            self.server.fail_next("save_article")
+            previews = [preview async for preview in jp.get_own_article_previews()]
+            await jp.edit_article(article, title="Edited", refetch=False)
+        self.assertEqual(len(previews), 10)
+        self.assertEqual(policy.stats()["reasons"], {"503" : 2})
+        self.assertEqual(self.server.server.requests["save_article"], 2)
+
+    async def test_connection_options(self):
+        for keep_alive, opened in ((True, 0), (False, 5)):
+            async with self.server.async_client(connections=ConnectionOptions(keep_alive=keep_alive)) as jp:
+                await jp.article_from_url("https://justpaste.it/bench1000")
+                connections = self.server.server.connections
+                for _ in range(5):
+                    await jp.article_from_url("https://justpaste.it/bench1000")
+            self.assertEqual(self.server.server.connections - connections, opened)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste
+from justpaste import PageCache
+
+class TestPageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = PageCache(ttl=300)
+        self.server = MockJustpaste(profile_pages=1).__enter__()
+        self.jp = self.server.client(cache=self.cache)
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_invalidate_article_keeps_user_with_same_id(self):
+        article = self.jp.article_from_url("https://justpaste.it/bench1000")
+        user = self.jp.user_from_url("https://justpaste.it/u/bench")
+        self.cache.get(str(user.url)).models["user+previews"].id = article.id
+
+        self.cache.invalidate(article_id=article.id)
+        self.assertIsNone(self.cache.get("https://justpaste.it/bench1000"))
+        self.assertIsNotNone(self.cache.get(str(user.url)))
+
+    def test_counters_from_many_threads(self):
+        self.jp.article_from_url("https://justpaste.it/bench1000")
+        with ThreadPoolExecutor(8) as executor:
+            [*executor.map(lambda _: self.jp.article_from_url("https://justpaste.it/bench1000"), range(200))]
+        stats = self.cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 200)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import socket
+import unittest
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste, LocalRedirectAdapter
+from justpaste import ConnectionOptions
+from justpaste.consts import ROOT, MESSAGE_API_ROOT
+from justpaste.connections import PooledAdapter, DefaultTimeoutAdapter
+
+class TestConnectionOptions(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockJustpaste(conversations=1, messages=1).__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_pooled_adapter_per_host(self):
+        session = requests.Session()
+        ConnectionOptions(max_connections=4).install(session)
+        site, messages = session.get_adapter(ROOT), session.get_adapter(MESSAGE_API_ROOT)
+        self.assertIsInstance(site, PooledAdapter)
+        self.assertIsInstance(messages, PooledAdapter)
+        self.assertIsNot(site, messages)
+        self.assertEqual(site._pool_maxsize, 4)
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), site.poolmanager.connection_pool_kw["socket_options"])
+
+    def test_custom_adapter_kept(self):
+        jp = self.server.client(connections=ConnectionOptions(max_connections=3, timeout=(1, 5)))
+        adapter = jp.session.get_adapter(ROOT)
+        self.assertIsInstance(adapter, DefaultTimeoutAdapter)
+        self.assertIsInstance(adapter.adapter, LocalRedirectAdapter)
+        self.assertEqual(adapter.adapter._pool_maxsize, 3)
+
+    def test_keep_alive_reuses_connections(self):
+        jp = self.server.client(connections=ConnectionOptions())
+        connections = self.server.server.connections
+        for _ in range(5):
+            jp.article_from_url("https://justpaste.it/bench1000")
+        self.assertEqual(self.server.server.connections, connections)
+
+    def test_without_keep_alive(self):
+        jp = self.server.client(connections=ConnectionOptions(keep_alive=False))
+        connections = self.server.server.connections
+        for _ in range(5):
+            jp.article_from_url("https://justpaste.it/bench1000")
+        self.assertEqual(self.server.server.connections, connections + 5)
+
+    def test_default_timeout(self):
+        jp = self.server.client(connections=ConnectionOptions(timeout=0.1))
+        self.server.server.latency = 0.5
+        with self.assertRaises(requests.exceptions.Timeout):
+            jp.article_from_url("https://justpaste.it/bench1000")
+        # a timeout given with the request wins
+        self.assertTrue(jp.session.get("https://justpaste.it/bench1000", timeout=5).ok)
+
+if __name__ == "__main__":
+    unittest.main()
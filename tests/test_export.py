@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste
+from justpaste import ArticleExport
+
+def exported_ids(path:str) -> list[int]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line)["id"] for line in f]
+
+class TestArticleExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MockJustpaste(notes_pages=4, per_page=5).__enter__()
+        self.jp = self.server.client()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def path(self, name:str) -> str:
+        return os.path.join(self.tmp.name, name)
+
+    def full_run(self) -> list[int]:
+        checkpoint = self.jp.export_articles(self.path("full.jsonl"), trash=False).run()
+        self.assertTrue(checkpoint.finished)
+        return exported_ids(self.path("full.jsonl"))
+
+    def test_full_run(self):
+        ids = self.full_run()
+        self.assertEqual(len(ids), 20)
+        self.assertEqual(len(set(ids)), 20)
+
+    def test_resume_after_interrupt(self):
+        expected = sorted(self.full_run())
+        for stop_after in (1, 7, 13):
+            path = self.path(f"resumed{stop_after}.jsonl")
+            export = self.jp.export_articles(path, max_workers=3, trash=False)
+            for n, _ in enumerate(export, 1):
+                if n == stop_after:
+                    break
+            self.assertEqual(export.checkpoint.exported, stop_after)
+            # a line half written when the process died is cut off again
+            with open(path, 'ab') as f:
+                f.write(b'{"id": 99')
+
+            checkpoint = ArticleExport(self.jp, path, max_workers=3, trash=False).run()
+            self.assertTrue(checkpoint.finished)
+            self.assertEqual(sorted(exported_ids(path)), expected)
+
+    def test_finished_export_does_nothing(self):
+        path = self.path("done.jsonl")
+        self.jp.export_articles(path, trash=False).run()
+        size = os.path.getsize(path)
+        self.assertEqual([*self.jp.export_articles(path, trash=False)], [])
+        self.assertEqual(os.path.getsize(path), size)
+
+    def test_finished_export_picks_up_new_articles(self):
+        path = self.path("grown.jsonl")
+        before = self.jp.export_articles(path, trash=False).run().exported
+        self.server.server.fixtures.notes_pages += 1
+        checkpoint = self.jp.export_articles(path, trash=False).run()
+        self.assertTrue(checkpoint.finished)
+        self.assertEqual(checkpoint.exported, before + 5)
+        ids = exported_ids(path)
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(len(set(ids)), 25)
+
+    def test_failed_articles_are_retried(self):
+        server = MockJustpaste(error_rate=0.3, notes_pages=4, per_page=5).__enter__()
+        try:
+            jp = server.client()
+            path = self.path("flaky.jsonl")
+            for _ in range(30):
+                try:
+                    if jp.export_articles(path, trash=False).run().finished:
+                        break
+                except Exception:
+                    # a listing page failed, the next run starts from the checkpoint
+                    pass
+        finally:
+            server.__exit__(None, None, None)
+        self.assertEqual(sorted(exported_ids(path)), sorted(self.full_run()))
+
+if __name__ == "__main__":
+    unittest.main()
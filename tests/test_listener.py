@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import queue
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste
+
+class TestMessageListener(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockJustpaste(conversations=2, messages=3).__enter__()
+        self.jp = self.server.client()
+        self.batches : queue.Queue = queue.Queue()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def listen(self, callback=None, **options):
+        listener = self.jp.listen(callback or (lambda c, m: self.batches.put((c.id, [x.id for x in m]))),
+                                  min_interval=0.02, max_interval=0.05, coalesce=0, include_own=True, **options)
+        self.addCleanup(listener.stop, 5)
+        return listener
+
+    def wait_for_polls(self, listener, polls:int):
+        deadline = time.monotonic() + 5
+        while listener.stats.polls < polls:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_delivers_only_new_messages(self):
+        listener = self.listen()
+        self.wait_for_polls(listener, 2)
+        self.assertTrue(self.batches.empty())
+
+        self.server.receive_messages(2)
+        delivered = sorted(self.batches.get(timeout=5) for _ in range(2))
+        self.assertEqual(delivered, [(0, [3, 4]), (1, [3, 4])])
+
+        polls = listener.stats.polls
+        self.wait_for_polls(listener, polls + 2)
+        self.assertTrue(self.batches.empty())
+
+        stats = listener.stats.as_dict()
+        self.assertEqual((stats["changes"], stats["delivered"], stats["errors"]), (2, 4, 0))
+        self.assertEqual(set(stats["latency"]), {"last", "mean", "p50", "p95", "max"})
+
+    def test_history_delivered_without_since_start(self):
+        self.listen(since_start=False)
+        self.assertEqual(sorted(self.batches.get(timeout=5) for _ in range(2)), [(0, [0, 1, 2]), (1, [0, 1, 2])])
+
+    def test_callback_errors_counted(self):
+        def fail(conversation, messages):
+            raise RuntimeError
+        listener = self.listen(fail)
+        self.wait_for_polls(listener, 1)
+        self.server.receive_messages(1)
+
+        deadline = time.monotonic() + 5
+        while listener.stats.errors < 2:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.assertEqual(listener.stats.delivered, 2)
+
+if __name__ == "__main__":
+    unittest.main()
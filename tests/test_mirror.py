@@ -0,0 +1,84 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste
+from justpaste import ArticleMirror
+
+class TestArticleMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MockJustpaste(notes_pages=3, per_page=5).__enter__()
+        self.jp = self.server.client()
+        self.mirror = ArticleMirror(self.jp, os.path.join(self.tmp.name, "mirror.sqlite3"))
+
+    def tearDown(self):
+        self.mirror.close()
+        self.server.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def assertIndexIntact(self):
+        # compares the FTS index with the articles table, raises if they went out of step
+        with self.mirror._conn:
+            self.mirror._conn.execute("INSERT INTO articles_fts(articles_fts, rank) VALUES ('integrity-check', 1)")
+
+    def test_storing_again_replaces_indexed_terms(self):
+        article = self.jp.article_from_url("https://justpaste.it/bench1000")
+        self.mirror.save(article.model_copy(update={"body" : "<p>oldword</p>"}))
+        self.mirror.save(article.model_copy(update={"body" : "<p>newword</p>"}))
+
+        self.assertEqual(self.mirror.search("oldword"), [])
+        self.assertEqual([a.id for a in self.mirror.search("newword")], [1000])
+        self.assertEqual(len(self.mirror), 1)
+        self.assertIndexIntact()
+
+    def test_sync_fetches_only_changed_articles(self):
+        fetched = self.mirror.sync(trash=False)
+        self.assertEqual(len(fetched), 15)
+        self.assertEqual(len(self.mirror), 15)
+        self.assertEqual(self.mirror.sync(trash=False), [])
+
+        self.server.edit_article(2001, "Quarterly report", "Revenue went up")
+        fetched = self.mirror.sync(trash=False)
+        self.assertEqual([p.id for p, _ in fetched], [2001])
+        self.assertNotIsInstance(fetched[0][1], Exception)
+
+        self.assertEqual([a.id for a in self.mirror.search("revenue")], [2001])
+        self.assertEqual([a.id for a in self.mirror.search("title:quarterly")], [2001])
+        self.assertNotIn(2001, [a.id for a in self.mirror.search("lorem", limit=None)])
+        self.assertEqual(self.mirror.article(2001).title, "Quarterly report")
+        self.assertIndexIntact()
+
+    def test_relative_dates_dont_refetch(self):
+        self.server.server.fixtures.article_preview["created"] = "5h"
+        self.mirror.sync(trash=False)
+        requests = self.server.server.requests["article"]
+        self.assertEqual(self.mirror.sync(trash=False), [])
+        self.assertEqual(self.server.server.requests["article"], requests)
+
+    def test_view_counts_update_previews(self):
+        self.mirror.sync(trash=False)
+        requests = self.server.server.requests["article"]
+        self.server.server.fixtures.article_preview["uniqueViews"] = "2,000"
+        self.assertEqual(self.mirror.sync(trash=False), [])
+        self.assertEqual(self.server.server.requests["article"], requests)
+        self.assertEqual({p.unique_views for p in self.mirror.previews()}, {2000})
+
+    def test_unlisted_articles_are_pruned(self):
+        self.mirror.sync(trash=False)
+        other = self.jp.article_from_url("https://justpaste.it/bench9000")
+        self.mirror.save(other)
+        self.server.server.fixtures.notes_pages = 2
+
+        self.assertEqual(self.mirror.sync(trash=False), [])
+        self.assertEqual(len(self.mirror.previews()), 10)
+        self.assertIsNone(self.mirror.article(3000))
+        self.assertIsNotNone(self.mirror.article(9000))
+        self.assertIndexIntact()
+
+if __name__ == "__main__":
+    unittest.main()
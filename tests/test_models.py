@@ -0,0 +1,48 @@
+import os
+import sys
+import unittest
+
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste
+from justpaste.objects import User, OwnArticle, EditedArticle
+
+class Box(BaseModel):
+    user : User | None = None
+    articles : list[OwnArticle] = []
+
+class TestLazyFields(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockJustpaste(profile_pages=1).__enter__()
+        self.jp = self.server.client()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_nested_qr_code_is_serialized(self):
+        user = self.jp.user_from_url("https://justpaste.it/u/bench")
+        self.assertNotIn("qr_code_data", user.__dict__)
+        dumped = Box(user=user).model_dump()["user"]
+        self.assertTrue(dumped["qr_code_data"].startswith(b"\x89PNG"))
+        self.assertEqual(dumped, user.model_dump())
+
+    def test_dropped_qr_code_is_none(self):
+        jp = self.server.client(qr_codes="drop")
+        user = jp.user_from_url("https://justpaste.it/u/bench")
+        self.assertIsNone(Box(user=user).model_dump()["user"]["qr_code_data"])
+
+    def test_nested_edited_article_is_refreshed(self):
+        article = self.jp.article_from_url("https://justpaste.it/own1000")
+        edited = self.jp.edit_article(article, refetch=False, title="Edited")
+        self.assertIsInstance(edited, EditedArticle)
+        self.assertTrue(edited.is_stale)
+        dumped = Box(articles=[edited]).model_dump()["articles"][0]
+        self.assertFalse(edited.is_stale)
+        self.assertEqual(dumped["title"], "Edited")
+        self.assertEqual(dumped["modified_at"], edited.modified_at)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from justpaste.paging import PagedSequence
+
+def paged(sizes:list[int]) -> tuple[PagedSequence[int], list[int], list[int]]:
+    # a sequence over pages of `sizes` items, the flat list of them and the page numbers loaded
+    pages, flat = [], []
+    for size in sizes:
+        pages.append([len(flat) + i for i in range(size)])
+        flat.extend(pages[-1])
+    loads = []
+
+    def load_page(number:int) -> list[int]:
+        loads.append(number)
+        return pages[number - 1]
+
+    return PagedSequence(pages[0], len(pages), load_page), flat, loads
+
+class TestPagedSequence(unittest.TestCase):
+
+    def assertMatches(self, sizes:list[int]):
+        seq, flat, _ = paged(sizes)
+        self.assertEqual(len(seq), len(flat))
+        for i in range(-len(flat), len(flat)):
+            self.assertEqual(seq[i], flat[i], (sizes, i))
+        for i in (len(flat), len(flat) + 7, -len(flat) - 1):
+            with self.assertRaises(IndexError):
+                seq[i]
+        self.assertEqual(seq[1:len(flat):3], flat[1::3])
+        self.assertEqual([*seq], flat)
+
+    def test_uniform_pages(self):
+        self.assertMatches([5, 5, 5, 3])
+        self.assertMatches([5])
+        self.assertMatches([5, 2])
+
+    def test_first_page_longer_or_shorter(self):
+        # pinned articles are listed on the first page as well
+        self.assertMatches([7, 5, 5, 5, 3])
+        self.assertMatches([3, 5, 5, 5, 5])
+        self.assertMatches([7, 5])
+
+    def test_uneven_pages(self):
+        # lookups notice the pages in between differ once they load two of them, and count every page from then on
+        seq, flat, _ = paged([5, 4, 6, 5, 2])
+        for i in range(len(flat)):
+            self.assertEqual(seq[i], flat[i])
+        self.assertEqual(len(seq), len(flat))
+        self.assertEqual(seq[-1], flat[-1])
+
+    def test_len_loads_few_pages(self):
+        seq, flat, loads = paged([7, 5, 5, 5, 5, 5, 5, 5, 3])
+        self.assertEqual(len(seq), len(flat))
+        self.assertEqual(sorted(loads), [2, 9])
+        self.assertEqual(seq[30], flat[30])
+        self.assertEqual(sorted(loads), [2, 6, 9])
+
+    def test_len_kept_until_another_page_loads(self):
+        seq, flat, loads = paged([7, 5, 4, 5, 3])
+        # worked out from page 2, page 3 being shorter isn't known yet
+        self.assertEqual(len(seq), len(flat) + 1)
+
+        counted = []
+        page_size = seq._page_size
+        seq._page_size = lambda: counted.append(1) or page_size()
+        for _ in range(3):
+            len(seq)
+        seq[0:3]
+        self.assertEqual(counted, [])
+
+        seq.page(3)
+        self.assertEqual(len(seq), len(flat))
+        self.assertEqual(sorted(loads), [2, 3, 4, 5])
+
+    def test_eq_does_not_load(self):
+        a, _, loads_a = paged([5, 5, 5])
+        b, _, loads_b = paged([5, 5, 5])
+        self.assertEqual(a, b)
+        a.page(2)
+        self.assertNotEqual(a, b)
+        self.assertEqual((loads_a, loads_b), ([2], []))
+        self.assertNotEqual(a, [*range(15)])
+        self.assertEqual(b.load_all(), [*range(15)])
+
+if __name__ == "__main__":
+    unittest.main()
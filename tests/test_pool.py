@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import unittest
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste
+from justpaste import ClientPool
+from justpaste.exceptions import APIError, ArticleError, CaptchaRequired, NoClientAvailable
+from justpaste.pool import is_client_failure
+
+def response(status:int) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = b""
+    return resp
+
+class TestClientPool(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = [MockJustpaste(notes_pages=1, per_page=4).__enter__() for _ in range(2)]
+        self.pool = ClientPool([s.client() for s in self.servers], strategy='round_robin', max_failures=2, quarantine=60)
+
+    def tearDown(self):
+        for server in self.servers:
+            server.__exit__(None, None, None)
+
+    def requests(self, route:str) -> list[int]:
+        return [s.server.requests[route] for s in self.servers]
+
+    def test_client_failures(self):
+        self.assertTrue(is_client_failure(CaptchaRequired("captcha")))
+        self.assertTrue(is_client_failure(requests.ConnectionError()))
+        self.assertTrue(is_client_failure(APIError("blocked", response=response(403))))
+        self.assertTrue(is_client_failure(APIError("down", response=response(503))))
+        self.assertFalse(is_client_failure(ArticleError("missing", response=response(404))))
+        self.assertFalse(is_client_failure(ValueError()))
+
+    def test_round_robin(self):
+        for _ in range(4):
+            self.pool.article_from_url("https://justpaste.it/bench1000")
+        self.assertEqual(self.requests("article"), [2, 2])
+
+    def test_failed_call_moves_to_next_client(self):
+        self.servers[0].fail_next("article", 10)
+        for _ in range(4):
+            self.assertEqual(self.pool.article_from_url("https://justpaste.it/bench1000").id, 1000)
+
+        first, second = self.pool.members
+        self.assertEqual((first.failures, second.served), (2, 4))
+        self.assertFalse(first.available(time.monotonic()))
+        # quarantined, so it gets nothing more
+        self.pool.article_from_url("https://justpaste.it/bench1000")
+        self.assertEqual(self.requests("article"), [2, 5])
+
+    def test_captcha_quarantines_at_once(self):
+        first = self.pool.members[0]
+        def publish(client):
+            if client is first.client:
+                raise CaptchaRequired("captcha")
+            return client.email
+        self.assertEqual(self.pool.call(publish), "bench@example.com")
+        self.assertEqual(first.captchas, 1)
+        self.assertFalse(first.available(time.monotonic()))
+
+    def test_request_errors_not_held_against_client(self):
+        for _ in range(3):
+            with self.assertRaises(KeyError):
+                self.pool.call(lambda client: {}["missing"])
+        self.assertTrue(all(m.available(time.monotonic()) and m.failures == 0 for m in self.pool.members))
+
+    def test_all_quarantined(self):
+        for member in self.pool.members:
+            member.quarantined_until = time.monotonic() + 60
+        with self.assertRaises(NoClientAvailable):
+            self.pool.article_from_url("https://justpaste.it/bench1000")
+
+    def test_quarantine_expires(self):
+        self.pool.quarantine = 0.3
+        self.servers[0].fail_next("article", 2)
+        first = self.pool.members[0]
+        while first.failures < 2:
+            self.pool.article_from_url("https://justpaste.it/bench1000")
+        self.assertFalse(first.available(time.monotonic()))
+        time.sleep(0.35)
+        self.assertTrue(first.available(time.monotonic()))
+        self.pool.article_from_url("https://justpaste.it/bench1000")
+        self.pool.article_from_url("https://justpaste.it/bench1000")
+        self.assertEqual(first.served, 1)
+
+    def test_load_articles_spread_over_pool(self):
+        previews = [*self.pool.members[0].client.get_own_article_previews()]
+        loaded = [*self.pool.load_articles_from_previews(previews, max_workers=2)]
+        self.assertEqual(sorted(a.id for _, a in loaded), [p.id for p in previews])
+        self.assertEqual(sum(self.requests("article")), 4)
+        self.assertEqual(sum(m.served for m in self.pool.members), 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste
+from justpaste import RequestScheduler, RateLimit, Priority, request_priority
+from justpaste.consts import ROOT, MESSAGE_API_ROOT
+from justpaste.ratelimit import TokenBucket
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(RateLimit(50, burst=5))
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+
+        for _ in range(10):
+            bucket.acquire()
+        self.assertGreater(time.monotonic() - start, 0.15)
+        self.assertEqual(bucket.stats()["acquired"]["INTERACTIVE"], 15)
+
+    def test_priority_order(self):
+        bucket = TokenBucket(RateLimit(20, burst=1))
+        bucket.acquire()
+        order = []
+
+        def take(priority:Priority):
+            bucket.acquire(priority)
+            order.append(priority)
+
+        threads = [threading.Thread(target=take, args=(Priority.BULK,)) for _ in range(3)]
+        for t in threads:
+            t.start()
+        time.sleep(0.01)
+        threads.append(threading.Thread(target=take, args=(Priority.INTERACTIVE,)))
+        threads[-1].start()
+        for t in threads:
+            t.join()
+
+        # the first bulk request may already hold the next token, the interactive one goes right after at the latest
+        self.assertIn(Priority.INTERACTIVE, order[:2])
+        self.assertEqual(bucket.stats()["max_queue_depth"], 4)
+
+class TestRequestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockJustpaste(conversations=2, messages=2).__enter__()
+        self.scheduler = RequestScheduler(site=RateLimit(100, burst=10), messages=RateLimit(100, burst=10))
+        self.jp = self.server.client(scheduler=self.scheduler)
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_requests_counted_per_host_and_priority(self):
+        site_before = sum(self.scheduler.stats()[ROOT]["acquired"].values())
+        with request_priority(Priority.BULK):
+            self.jp.article_from_url("https://justpaste.it/bench1000")
+        self.jp.list_conversations(hydrate_users=False)
+
+        stats = self.scheduler.stats()
+        self.assertEqual(stats[ROOT]["acquired"]["BULK"], 1)
+        self.assertEqual(sum(stats[ROOT]["acquired"].values()), site_before + 1)
+        self.assertEqual(stats[MESSAGE_API_ROOT]["acquired"], {"INTERACTIVE" : 1, "NORMAL" : 0, "BULK" : 0})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste
+from justpaste import RetryPolicy, retry_safe
+from justpaste.consts import APIEndpoints
+from justpaste.exceptions import ArticleError
+from justpaste.retry import parse_retry_after
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_idempotent_requests(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_idempotent('GET', "https://justpaste.it/own1000"))
+        self.assertTrue(policy.is_idempotent('POST', APIEndpoints.EXISTING_ARTICLE.value))
+        self.assertFalse(policy.is_idempotent('POST', APIEndpoints.NEW_ARTICLE.value))
+        self.assertFalse(policy.is_idempotent('POST', APIEndpoints.SAVE_ARTICLE.value))
+        with retry_safe():
+            self.assertTrue(policy.is_idempotent('POST', APIEndpoints.SAVE_ARTICLE.value))
+        self.assertFalse(policy.is_idempotent('POST', APIEndpoints.SAVE_ARTICLE.value))
+
+    def test_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        policy = RetryPolicy(max_retry_after=10)
+        self.assertFalse(policy.should_retry_status(503, True, 60))
+        self.assertTrue(policy.should_retry_status(429, False, None))
+        self.assertFalse(policy.should_retry_status(503, False, None))
+
+class TestRetryingClient(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockJustpaste(notes_pages=3, per_page=5).__enter__()
+        self.policy = RetryPolicy(total=3, backoff=0)
+        self.jp = self.server.client(retry=self.policy)
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def test_page_loads_retried(self):
+        self.server.fail_next("manage", 2)
+        previews = [*self.jp.get_own_article_previews()]
+        self.assertEqual(len(previews), 15)
+        self.assertEqual(self.policy.stats()["reasons"], {"503" : 2})
+
+    def test_edit_save_retried(self):
+        article = self.jp.article_from_url("https://justpaste.it/own1000")
+        self.server.fail_next("save_article")
+        self.jp.edit_article(article, title="Edited", refetch=False)
+        self.assertEqual(self.server.server.requests["save_article"], 2)
+        self.assertEqual(self.policy.stats()["reasons"], {"503" : 1})
+
+    def test_new_article_save_not_retried(self):
+        self.server.fail_next("save_article")
+        # the empty 503 body fails to parse before its status is checked
+        with self.assertRaises(ValueError):
+            self.jp.new_article(title="New", body="<p>New</p>", privacy="hidden")
+        self.assertEqual(self.server.server.requests["save_article"], 1)
+        self.assertEqual(self.policy.stats()["retries"], 0)
+
+    def test_too_many_requests_retried_for_any_request(self):
+        self.server.fail_next("new_article", status=429)
+        self.server.fail_next("save_article", status=429)
+        article = self.jp.new_article(title="New", body="<p>New</p>", privacy="hidden")
+        self.assertTrue(article.id)
+        self.assertEqual(self.policy.stats()["reasons"], {"429" : 2})
+
+    def test_gives_up(self):
+        self.server.fail_next("article", 4)
+        with self.assertRaises(ArticleError):
+            self.jp.article_from_url("https://justpaste.it/own1000")
+        stats = self.policy.stats()
+        self.assertEqual((stats["retries"], stats["gave_up"]), (3, 1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste
+from justpaste import FileSessionStore, SessionStore
+from justpaste.objects import ArticlePreview
+
+class TestRelogin(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MockJustpaste(notes_pages=2, per_page=5).__enter__()
+        self.jp = self.server.client(session_store=FileSessionStore(os.path.join(self.tmp.name, "sessions.json")))
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def test_redirect_to_login_page(self):
+        self.server.expire_sessions()
+        previews = [*self.jp.get_own_article_previews()]
+        self.assertEqual(len(previews), 10)
+        self.assertTrue(all(isinstance(p, ArticlePreview) for p in previews))
+        self.assertEqual(self.server.server.logins, 2)
+
+    def test_unauthorized_api_response(self):
+        self.server.expire_sessions()
+        article = self.jp.new_article(title="Relogin", body="<p>Relogin</p>", privacy="hidden")
+        self.assertTrue(article.id)
+        self.assertEqual(self.server.server.logins, 2)
+
+    def test_article_page(self):
+        self.server.expire_sessions()
+        article = self.jp.article_from_url("https://justpaste.it/own1000")
+        self.assertEqual(article.id, 1000)
+        self.assertEqual(self.server.server.logins, 2)
+
+    def test_logged_in_once_per_expiry(self):
+        self.server.expire_sessions()
+        [*self.jp.get_own_article_previews()]
+        [*self.jp.get_own_article_previews()]
+        self.assertEqual(self.server.server.logins, 2)
+
+    def test_request_sent_before_relogin(self):
+        # another request logs in again while this one is in flight, it only needs the new cookies
+        def relogin_elsewhere(resp, *args, **kwargs):
+            self.jp.session.hooks['response'].remove(relogin_elsewhere)
+            self.jp.article_from_url("https://justpaste.it/own1001")
+
+        self.jp.session.hooks['response'].insert(0, relogin_elsewhere)
+        self.server.expire_sessions()
+        article = self.jp.article_from_url("https://justpaste.it/own1000")
+        self.assertEqual(article.id, 1000)
+        self.assertEqual(self.server.server.logins, 2)
+
+    def test_custom_store_must_implement_all_methods(self):
+        class LoadOnly(SessionStore):
+            def load(self, key):
+                return None
+        with self.assertRaises(TypeError):
+            LoadOnly()
+
+if __name__ == "__main__":
+    unittest.main()
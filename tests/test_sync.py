@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import MockJustpaste
+from justpaste import MessageSync, MessageStore, JsonlMessageStore
+
+class TestMessageSync(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MockJustpaste(conversations=3, messages=5).__enter__()
+        self.jp = self.server.client()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def test_only_changed_conversations_fetched(self):
+        sync = MessageSync(self.jp)
+        synced = sync.sync()
+        self.assertEqual(sorted((c.id, len(m)) for c, m in synced), [(0, 5), (1, 5), (2, 5)])
+        self.assertEqual(sync.sync(), [])
+        self.assertEqual(self.server.server.requests["messages"], 3)
+
+        self.server.receive_messages(2)
+        synced = sync.sync()
+        self.assertEqual(sorted((c.id, [m.id for m in ms]) for c, ms in synced), [(0, [5, 6]), (1, [5, 6]), (2, [5, 6])])
+        self.assertEqual([m.id for m in sync.store.messages(0)], [*range(7)])
+
+    def test_jsonl_store_resumes(self):
+        MessageSync(self.jp, JsonlMessageStore(self.tmp.name)).sync()
+        self.server.receive_messages(1)
+
+        store = JsonlMessageStore(self.tmp.name)
+        synced = MessageSync(self.jp, store).sync()
+        self.assertEqual(sorted((c.id, [m.id for m in ms]) for c, ms in synced), [(0, [5]), (1, [5]), (2, [5])])
+        self.assertEqual([m.id for m in store.messages(2)], [*range(6)])
+
+    def test_seed_skips_history(self):
+        sync = MessageSync(self.jp)
+        sync.seed(self.jp.list_conversations(hydrate_users=False))
+        self.assertEqual(sync.sync(), [])
+
+        self.server.receive_messages(1)
+        self.assertEqual(sorted((c.id, [m.id for m in ms]) for c, ms in sync.sync()), [(0, [5]), (1, [5]), (2, [5])])
+
+    def test_custom_store_must_implement_all_methods(self):
+        class WatermarkOnly(MessageStore):
+            def watermark(self, conversation_id):
+                return None
+        with self.assertRaises(TypeError):
+            WatermarkOnly()
+
+if __name__ == "__main__":
+    unittest.main()
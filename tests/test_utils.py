@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import Fixtures
+from justpaste.consts import RegexPatterns
+from justpaste.utils import (ParsedPage, ModelInitializer, TrustedModelInitializer, LiteModelInitializer, WINDOW_ASSIGNMENT_PATTERNS,
+                             scan_window_assignment, load_window_assignments, translate_keys, camel_case_to_snake_case,
+                             extract_article, extract_article_previews, extract_pagination)
+
+class TestWindowAssignments(unittest.TestCase):
+
+    def setUp(self):
+        self.fixtures = Fixtures(per_page=3)
+        self.pages = [self.fixtures.article_page(1000, True), self.fixtures.profile_page("bench", 1), self.fixtures.manage_page(2)]
+
+    def test_scanner_matches_html_parser(self):
+        for page in self.pages:
+            parsed = ParsedPage(page)
+            self.assertTrue(parsed.assignments)
+            for pattern in parsed.assignments:
+                self.assertEqual(scan_window_assignment(pattern, page), parsed.load(pattern))
+
+    def test_semicolons_inside_values(self):
+        page = '<script>window.articlesData = [{"title": "a; b", "x": "};"}]; window.pagination = {"currentPage": 2, "totalPages": 3};</script>'
+        previews, pagination = load_window_assignments(page, RegexPatterns.ARTICLES_DATA, RegexPatterns.PAGINATION)
+        self.assertEqual(previews, [{"title": "a; b", "x": "};"}])
+        self.assertEqual(pagination, {"currentPage": 2, "totalPages": 3})
+
+    def test_missing_assignment(self):
+        with self.assertRaises(ValueError):
+            scan_window_assignment(RegexPatterns.PAGINATION, "<script>window.article = {};</script>")
+        # the HTML parser gets a go before giving up
+        with self.assertRaises(RuntimeError):
+            load_window_assignments("<script>window.article = {};</script>", RegexPatterns.PAGINATION)
+
+    def test_only_window_patterns_scanned(self):
+        self.assertIn(RegexPatterns.ARTICLE, WINDOW_ASSIGNMENT_PATTERNS)
+        self.assertTrue(all(p.value.pattern.startswith(r"window\.") for p in WINDOW_ASSIGNMENT_PATTERNS))
+
+    def test_pagination(self):
+        self.assertEqual(extract_pagination(self.pages[2]), {"currentPage": 2, "totalPages": 10})
+
+class TestFieldMaps(unittest.TestCase):
+
+    def setUp(self):
+        self.fixtures = Fixtures(per_page=3)
+
+    def test_camel_case(self):
+        self.assertEqual(camel_case_to_snake_case("lastMessageDate"), "last_message_date")
+        self.assertEqual(camel_case_to_snake_case("id"), "id")
+
+    def test_unknown_keys_remembered(self):
+        field_map = {'uniqueViews' : ('unique_views', int)}
+        self.assertEqual(translate_keys({'uniqueViews' : '3', 'isPublic' : True}, field_map), {'unique_views' : 3, 'is_public' : True})
+        self.assertEqual(field_map['isPublic'], ('is_public', None))
+
+    def test_article_fields(self):
+        article = extract_article("https://justpaste.it/own1000", self.fixtures.article_page(1000, True))
+        self.assertEqual(article.id, 1000)
+        self.assertTrue(article.is_owner)
+        # 'onlineText' fills `online`
+        self.assertEqual(article.online, 3)
+
+    def test_initializers_agree(self):
+        page = self.fixtures.manage_page(1)
+        validated = [*extract_article_previews(page, initializer=ModelInitializer)]
+        trusted = [*extract_article_previews(page, initializer=TrustedModelInitializer)]
+        lite = [*extract_article_previews(page, initializer=LiteModelInitializer)]
+        self.assertEqual([p.id for p in validated], [1000, 1001, 1002])
+        self.assertEqual([p.model_dump(mode='json') for p in validated], [p.model_dump(mode='json', warnings=False) for p in trusted])
+        self.assertEqual(validated, [p.to_model() for p in lite])
+
+if __name__ == "__main__":
+    unittest.main()